@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_migrate, post_save
 
 
 class CatalogConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "books"
+
+    def ready(self):
+        from books.models import Book
+        from books.signals import invalidate_book_cache, repair_search_index
+
+        post_migrate.connect(repair_search_index, sender=self)
+        post_save.connect(invalidate_book_cache, sender=Book)
+        post_delete.connect(invalidate_book_cache, sender=Book)
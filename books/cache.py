@@ -0,0 +1,94 @@
+"""
+Object cache for catalog reads.
+
+Book details are cached per book; list pages are cached per full
+request URL under a catalog-wide version. Entries are stored as
+`(version, data)` so conditional requests can be answered
+from cache too. A single write only has to drop its own detail entry
+and bump the version to retire every list page that might contain it.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+LIST_VERSION_KEY = "books:list:version"
+
+
+def get_cache():
+    return caches[settings.BOOK_CACHE_ALIAS]
+
+
+def detail_key(book_id: int) -> str:
+    return f"books:detail:{book_id}"
+
+
+def list_key(url: str) -> str:
+    version = get_cache().get_or_set(LIST_VERSION_KEY, time.time_ns, timeout=None)
+    return versioned_list_key(version, url)
+
+
+async def alist_key(url: str) -> str:
+    version = await get_cache().aget_or_set(
+        LIST_VERSION_KEY, time.time_ns, timeout=None
+    )
+    return versioned_list_key(version, url)
+
+
+def versioned_list_key(version: int, url: str) -> str:
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return f"books:list:{version}:{digest}"
+
+
+def get_detail(book_id: int):
+    return get_cache().get(detail_key(book_id))
+
+
+def set_detail(book_id: int, entry: tuple) -> None:
+    get_cache().set(detail_key(book_id), entry, settings.BOOK_CACHE_TIMEOUT)
+
+
+async def aget_detail(book_id: int):
+    return await get_cache().aget(detail_key(book_id))
+
+
+async def aset_detail(book_id: int, entry: tuple) -> None:
+    await get_cache().aset(detail_key(book_id), entry, settings.BOOK_CACHE_TIMEOUT)
+
+
+def get_list(url: str):
+    return get_cache().get(list_key(url))
+
+
+def set_list(url: str, entry: tuple) -> None:
+    get_cache().set(list_key(url), entry, settings.BOOK_CACHE_TIMEOUT)
+
+
+async def aget_list(url: str):
+    return await get_cache().aget(await alist_key(url))
+
+
+async def aset_list(url: str, entry: tuple) -> None:
+    await get_cache().aset(
+        await alist_key(url), entry, settings.BOOK_CACHE_TIMEOUT
+    )
+
+
+def _drop(book_ids) -> None:
+    cache = get_cache()
+    cache.delete_many([detail_key(book_id) for book_id in book_ids])
+    cache.set(LIST_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def invalidate_books(*book_ids: int) -> None:
+    """
+    Drop cached entries for the given books and every cached list page.
+
+    Entries are dropped right away and again once the surrounding
+    transaction commits, so a concurrent reader can't re-cache the
+    pre-commit row in between.
+    """
+    _drop(book_ids)
+    transaction.on_commit(lambda: _drop(book_ids))
@@ -0,0 +1,108 @@
+"""
+Rebuild of the denormalized borrowing counters on `Book`.
+
+The counters are maintained incrementally on checkout and return; this
+recomputes them from the borrowings (live and archived, through the
+`BorrowingHistory` view) to repair any drift. Migration 0005 of the
+books app backfilled the counters with a frozen copy of it: a change
+made here doesn't apply to that migration.
+"""
+from datetime import datetime, time
+
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def rebuild_counters(
+    book_model,
+    borrowing_model,
+    batch_size=DEFAULT_BATCH_SIZE,
+    on_repaired=None,
+) -> int:
+    """
+    Recompute counters for all books, `batch_size` books per transaction.
+
+    `last_borrowed_at` is only known to the day from `borrow_date`, so it
+    is kept as is when it falls on the right day. `on_repaired` is called
+    with the ids of the corrected books of each batch. Returns the number
+    of books whose counters were corrected.
+    """
+    repaired = 0
+    last_id = 0
+
+    while True:
+        with transaction.atomic():
+            books = list(
+                book_model.objects.select_for_update()
+                .filter(pk__gt=last_id)
+                .order_by("pk")
+                .only(
+                    "pk",
+                    "active_borrowings",
+                    "total_borrowings",
+                    "last_borrowed_at",
+                )[:batch_size]
+            )
+            if not books:
+                return repaired
+            last_id = books[-1].pk
+
+            stats = {
+                row["book_id"]: row
+                for row in borrowing_model.objects.filter(
+                    book_id__in=[book.pk for book in books]
+                )
+                .order_by()
+                .values("book_id")
+                .annotate(
+                    active=Count("pk", filter=Q(actual_return_date__isnull=True)),
+                    total=Count("pk"),
+                    last_borrow_date=Max("borrow_date"),
+                )
+            }
+
+            changed = [
+                book for book in books
+                if apply_stats(book, stats.get(book.pk))
+            ]
+            now = timezone.now()
+            for book in changed:
+                book.updated_at = now
+            book_model.objects.bulk_update(
+                changed,
+                [
+                    "active_borrowings",
+                    "total_borrowings",
+                    "last_borrowed_at",
+                    "updated_at",
+                ],
+            )
+            repaired += len(changed)
+            if changed and on_repaired is not None:
+                on_repaired([book.pk for book in changed])
+
+
+def apply_stats(book, stats) -> bool:
+    """Set the book's counters from `stats`, return True if any changed."""
+    active = stats["active"] if stats else 0
+    total = stats["total"] if stats else 0
+    last_date = stats["last_borrow_date"] if stats else None
+
+    last_borrowed_at = book.last_borrowed_at
+    if last_date is None:
+        last_borrowed_at = None
+    elif last_borrowed_at is None or timezone.localdate(last_borrowed_at) != last_date:
+        last_borrowed_at = timezone.make_aware(datetime.combine(last_date, time.min))
+
+    changed = (
+        book.active_borrowings != active
+        or book.total_borrowings != total
+        or book.last_borrowed_at != last_borrowed_at
+    )
+    book.active_borrowings = active
+    book.total_borrowings = total
+    book.last_borrowed_at = last_borrowed_at
+    return changed
@@ -0,0 +1,113 @@
+"""
+Catalog filters and facet counts.
+
+Each filter becomes a named `Q` condition. The list applies all of
+them; facets are counted in a single aggregate query in which every
+facet ignores its own filter (but honours the others), so clients can
+see how many results picking another value of that facet would give.
+"""
+from decimal import Decimal
+
+from django.db.models import Count, Q
+
+from books.models import Book
+
+# Half-open [low, high) daily fee buckets, `None` meaning unbounded.
+FEE_BUCKETS = (
+    (None, Decimal("1.00")),
+    (Decimal("1.00"), Decimal("2.00")),
+    (Decimal("2.00"), Decimal("5.00")),
+    (Decimal("5.00"), None),
+)
+
+
+def filter_conditions(params: dict) -> dict:
+    """Map validated filter params to `{facet: Q}` conditions."""
+    conditions = {}
+
+    if params.get("cover"):
+        conditions["cover"] = Q(cover=params["cover"])
+    if params.get("author"):
+        conditions["author"] = Q(author=params["author"])
+
+    fee = Q()
+    if params.get("min_fee") is not None:
+        fee &= Q(daily_fee__gte=params["min_fee"])
+    if params.get("max_fee") is not None:
+        fee &= Q(daily_fee__lte=params["max_fee"])
+    if fee:
+        conditions["daily_fee"] = fee
+
+    if params.get("available") is not None:
+        conditions["available"] = available_condition(params["available"])
+
+    return conditions
+
+
+def available_condition(available: bool) -> Q:
+    return Q(inventory__gt=0) if available else Q(inventory=0)
+
+
+def fee_bucket_condition(low, high) -> Q:
+    condition = Q()
+    if low is not None:
+        condition &= Q(daily_fee__gte=low)
+    if high is not None:
+        condition &= Q(daily_fee__lt=high)
+    return condition
+
+
+def fee_bucket_label(low, high) -> str:
+    if high is None:
+        return f"{low}+"
+    return f"{low or Decimal('0.00')}-{high}"
+
+
+def facet_aggregates(conditions: dict) -> dict:
+    """
+    `aggregate()` keyword arguments counting every facet value.
+
+    Each count is filtered by the conditions of all the *other*
+    facets plus its own value.
+    """
+    def count(facet: str, condition: Q) -> Count:
+        others = [q for name, q in conditions.items() if name != facet]
+        return Count("pk", filter=Q(condition, *others))
+
+    aggregates = {
+        "total": Count("pk", filter=Q(*conditions.values())),
+    }
+    for value, _ in Book.COVER_CHOICES:
+        aggregates[f"cover_{value}"] = count("cover", Q(cover=value))
+    for index, (low, high) in enumerate(FEE_BUCKETS):
+        aggregates[f"fee_{index}"] = count(
+            "daily_fee", fee_bucket_condition(low, high)
+        )
+    for available in (True, False):
+        aggregates[f"available_{available}"] = count(
+            "available", available_condition(available)
+        )
+    return aggregates
+
+
+def facet_data(stats: dict) -> dict:
+    """Shape the result of `facet_aggregates` for the API."""
+    return {
+        "total": stats["total"],
+        "cover": {
+            value: stats[f"cover_{value}"] for value, _ in Book.COVER_CHOICES
+        },
+        "daily_fee": [
+            {
+                "bucket": fee_bucket_label(low, high),
+                "min_fee": low,
+                "max_fee": high,
+                "count": stats[f"fee_{index}"],
+            }
+            for index, (low, high) in enumerate(FEE_BUCKETS)
+        ],
+        "available": {
+            "true": stats["available_True"],
+            "false": stats["available_False"],
+        },
+    }
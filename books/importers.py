@@ -0,0 +1,162 @@
+"""
+Streaming bulk import of the book catalog.
+
+Rows are read one at a time from a CSV or JSON Lines file, validated
+with the `Book` model field rules and written with `bulk_create` in
+batches, so memory use depends on the batch size, not the file size.
+Rows carrying an `id` are upserted, the rest are inserted.
+"""
+import csv
+import io
+import json
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Optional
+
+from django.core.exceptions import ValidationError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from books import cache
+from books.models import Book
+
+IMPORT_FIELDS = ("title", "author", "cover", "inventory", "daily_fee")
+FORMATS = ("csv", "jsonl")
+DEFAULT_BATCH_SIZE = 1000
+
+
+@dataclass
+class RowError:
+    line: int
+    errors: dict
+
+
+@dataclass
+class ImportResult:
+    imported: int = 0
+    failed: int = 0
+
+
+def guess_format(filename: str) -> Optional[str]:
+    extension = filename.rsplit(".", 1)[-1].lower()
+    if extension == "csv":
+        return "csv"
+    if extension in ("jsonl", "ndjson"):
+        return "jsonl"
+    return None
+
+
+def read_rows(stream: io.TextIOBase, file_format: str) -> Iterator[tuple]:
+    """Yield `(line_number, row)` pairs; JSON errors are yielded as rows too."""
+    if file_format == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif file_format == "jsonl":
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as error:
+                row = ValidationError({"__all__": [f"Invalid JSON: {error}"]})
+            else:
+                if not isinstance(row, dict):
+                    row = ValidationError({"__all__": ["Expected a JSON object."]})
+            yield line_number, row
+    else:
+        raise ValueError(f"Unsupported format: {file_format}")
+
+
+def clean_row(row: dict) -> Book:
+    """Build an unsaved `Book` from a raw row, validating every field."""
+    errors = {}
+    values = {}
+
+    for name in ("id", *IMPORT_FIELDS):
+        model_field = Book._meta.get_field(name)
+        raw = row.get(name)
+        if raw in (None, ""):
+            if name == "id":
+                continue
+            if model_field.has_default():
+                values[name] = model_field.get_default()
+                continue
+        try:
+            values[name] = model_field.clean(raw, None)
+        except ValidationError as error:
+            errors[name] = error.messages
+
+    if errors:
+        raise ValidationError(errors)
+    return Book(**values)
+
+
+def import_books(
+    rows: Iterable[tuple],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    on_error: Optional[Callable[[RowError], None]] = None,
+) -> ImportResult:
+    """
+    Validate and write `(line_number, row)` pairs in batches.
+
+    Invalid rows are skipped and reported through `on_error` as soon as
+    they are seen; valid rows of a batch are written in one transaction.
+    """
+    result = ImportResult()
+    batch = []
+
+    for line_number, row in rows:
+        try:
+            if isinstance(row, ValidationError):
+                raise row
+            batch.append(clean_row(row))
+        except ValidationError as error:
+            result.failed += 1
+            if on_error is not None:
+                on_error(RowError(line_number, error.message_dict))
+            continue
+
+        if len(batch) >= batch_size:
+            result.imported += write_batch(batch)
+            batch = []
+
+    if batch:
+        result.imported += write_batch(batch)
+    return result
+
+
+def write_batch(books: list) -> int:
+    inserts = [book for book in books if book.pk is None]
+    # A row can only be upserted once per statement, the last one wins.
+    upserts = list(
+        {book.pk: book for book in books if book.pk is not None}.values()
+    )
+
+    with transaction.atomic():
+        if inserts:
+            Book.objects.bulk_create(inserts)
+        if upserts:
+            Book.objects.bulk_create(
+                upserts,
+                update_conflicts=True,
+                unique_fields=["id"],
+                update_fields=[*IMPORT_FIELDS, "updated_at"],
+            )
+            reset_id_sequence()
+        cache.invalidate_books(*(book.pk for book in upserts))
+
+    return len(books)
+
+
+def reset_id_sequence() -> None:
+    """
+    Move the id sequence past the largest id: upserts may insert rows
+    with explicit ids, which don't advance it (PostgreSQL), and later
+    inserts would collide with them. A no-op where ids don't come from
+    a sequence (SQLite).
+    """
+    statements = connection.ops.sequence_reset_sql(no_style(), [Book])
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
@@ -0,0 +1,70 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from books.views import BookViewSet
+
+MIDDLEWARE = "library_service_project.metrics.MetricsMiddleware"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the per-request overhead of MetricsMiddleware. The books "
+        "list is requested in-process by two clients, one with and one "
+        "without the middleware, taking turns request by request, once "
+        "from the catalog cache and once with the cache cleared before "
+        "every request (so its queries run). Reports median latencies."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1:
+            raise CommandError("--requests must be positive.")
+        if MIDDLEWARE not in settings.MIDDLEWARE:
+            raise CommandError(f"{MIDDLEWARE} is not in MIDDLEWARE.")
+        without = [name for name in settings.MIDDLEWARE if name != MIDDLEWARE]
+        url = reverse("books:book-list")
+        cache = caches[settings.BOOK_CACHE_ALIAS]
+
+        # Throttling would reject most requests of one anonymous client.
+        throttle_classes = BookViewSet.throttle_classes
+        BookViewSet.throttle_classes = ()
+        try:
+            with override_settings(DEBUG=False, ALLOWED_HOSTS=["testserver"]):
+                # A client's middleware chain is built on its first request.
+                clients = {}
+                for label, middleware in (
+                    ("without", without), ("with", settings.MIDDLEWARE)
+                ):
+                    with override_settings(MIDDLEWARE=middleware):
+                        clients[label] = Client()
+                        clients[label].get(url)
+
+                for label, cached in (("cached", True), ("uncached", False)):
+                    timings = {variant: [] for variant in clients}
+                    for _ in range(options["requests"]):
+                        for variant, client in clients.items():
+                            if not cached:
+                                cache.clear()
+                            began = time.perf_counter()
+                            client.get(url)
+                            timings[variant].append(time.perf_counter() - began)
+                    median = {
+                        variant: statistics.median(values) * 1e6
+                        for variant, values in timings.items()
+                    }
+                    self.stdout.write(
+                        f"books list, {label:<9} without {median['without']:7.1f} us   "
+                        f"with {median['with']:7.1f} us   "
+                        f"overhead {median['with'] - median['without']:5.1f} us"
+                    )
+        finally:
+            BookViewSet.throttle_classes = throttle_classes
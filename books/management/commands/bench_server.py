@@ -0,0 +1,86 @@
+import http.client
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Load a running server with concurrent keep-alive GET requests "
+        "(the books list by default) and report req/s and latencies. "
+        "Used to compare serving setups, e.g. runserver against gunicorn."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url", default="http://127.0.0.1:8000/api/books/"
+        )
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument("--requests", type=int, default=5000)
+        parser.add_argument(
+            "--header",
+            action="append",
+            default=[],
+            help="Extra request header, as `Name: value`.",
+        )
+
+    def handle(self, *args, **options):
+        concurrency, total = options["concurrency"], options["requests"]
+        if concurrency < 1 or total < concurrency:
+            raise CommandError("Need 1 <= --concurrency <= --requests.")
+        url = urlsplit(options["url"])
+        if url.scheme != "http":
+            raise CommandError("Only http:// URLs are supported.")
+        headers = dict(
+            header.split(":", 1) for header in options["header"]
+        )
+        headers = {name.strip(): value.strip() for name, value in headers.items()}
+
+        path = url.path + (f"?{url.query}" if url.query else "")
+        latencies, failures = [], []
+        lock = threading.Lock()
+
+        def client(count):
+            connection = http.client.HTTPConnection(url.hostname, url.port or 80)
+            timings, failed = [], 0
+            for _ in range(count):
+                began = time.perf_counter()
+                try:
+                    connection.request("GET", path, headers=headers)
+                    response = connection.getresponse()
+                    response.read()
+                    if response.status != 200:
+                        failed += 1
+                except (OSError, http.client.HTTPException):
+                    failed += 1
+                    connection.close()
+                    connection = http.client.HTTPConnection(
+                        url.hostname, url.port or 80
+                    )
+                timings.append((time.perf_counter() - began) * 1000)
+            connection.close()
+            with lock:
+                latencies.extend(timings)
+                failures.append(failed)
+
+        workers = [
+            threading.Thread(target=client, args=(total // concurrency,))
+            for _ in range(concurrency)
+        ]
+        began = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - began
+
+        latencies.sort()
+        self.stdout.write(
+            f"{len(latencies) / elapsed:8.0f} req/s   "
+            f"p50 {statistics.median(latencies):7.1f} ms   "
+            f"p99 {latencies[int(len(latencies) * 0.99) - 1]:7.1f} ms   "
+            f"{sum(failures)} failed"
+        )
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from books.importers import (
+    DEFAULT_BATCH_SIZE,
+    FORMATS,
+    guess_format,
+    import_books,
+    read_rows,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream books from a CSV or JSON Lines file into the catalog. "
+        "Rows with an `id` update the existing book."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import.")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Input format, guessed from the file extension by default.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Rows written per INSERT batch.",
+        )
+
+    def handle(self, *args, **options):
+        file_format = options["format"] or guess_format(options["path"])
+        if file_format is None:
+            raise CommandError("Cannot guess the file format, pass --format.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+
+        def report(error):
+            for field, messages in error.errors.items():
+                self.stderr.write(
+                    f"line {error.line}: {field}: {' '.join(messages)}"
+                )
+
+        try:
+            with open(options["path"], encoding="utf-8-sig", newline="") as stream:
+                result = import_books(
+                    read_rows(stream, file_format),
+                    batch_size=options["batch_size"],
+                    on_error=report,
+                )
+        except OSError as error:
+            raise CommandError(error)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result.imported} books, {result.failed} rows failed."
+            )
+        )
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from books import cache
+from books.counters import DEFAULT_BATCH_SIZE, rebuild_counters
+from books.models import Book
+from borrowings.models import BorrowingHistory
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Book.active_borrowings, total_borrowings and "
+        "last_borrowed_at from the live and archived borrowings, in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Books recomputed per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+
+        repaired = rebuild_counters(
+            Book,
+            BorrowingHistory,
+            options["batch_size"],
+            on_repaired=lambda book_ids: cache.invalidate_books(*book_ids),
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Repaired counters of {repaired} books.")
+        )
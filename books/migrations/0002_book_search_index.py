@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from books.search import install_search_index, uninstall_search_index
+
+
+def create_search_index(apps, schema_editor):
+    install_search_index(schema_editor, apps.get_model("books", "Book"))
+
+
+def drop_search_index(apps, schema_editor):
+    uninstall_search_index(schema_editor, apps.get_model("books", "Book"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.5 on 2026-10-18 01:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0002_book_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['title', 'author', 'id'], name='book_title_author_id_idx'),
+        ),
+    ]
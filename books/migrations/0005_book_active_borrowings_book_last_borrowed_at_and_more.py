@@ -0,0 +1,87 @@
+# Generated by Django 5.1.5 on 2026-10-18 01:49
+
+from datetime import datetime, time
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+BATCH_SIZE = 1000
+
+
+def backfill_counters(apps, schema_editor):
+    """
+    Count the borrowings of every book, `BATCH_SIZE` books at a time.
+    A frozen copy of `books.counters.rebuild_counters` as of this
+    migration: the new fields all start at their defaults.
+    """
+    Book = apps.get_model("books", "Book")
+    Borrowing = apps.get_model("borrowings", "Borrowing")
+    last_id = 0
+
+    while True:
+        books = list(
+            Book.objects.filter(pk__gt=last_id).order_by("pk").only("pk")[:BATCH_SIZE]
+        )
+        if not books:
+            return
+        last_id = books[-1].pk
+
+        stats = {
+            row["book_id"]: row
+            for row in Borrowing.objects.filter(
+                book_id__in=[book.pk for book in books]
+            )
+            .order_by()
+            .values("book_id")
+            .annotate(
+                active=Count("pk", filter=Q(actual_return_date__isnull=True)),
+                total=Count("pk"),
+                last_borrow_date=Max("borrow_date"),
+            )
+        }
+
+        now = timezone.now()
+        counted = []
+        for book in books:
+            row = stats.get(book.pk)
+            if row is None:
+                continue
+            book.active_borrowings = row["active"]
+            book.total_borrowings = row["total"]
+            book.last_borrowed_at = timezone.make_aware(
+                datetime.combine(row["last_borrow_date"], time.min)
+            )
+            book.updated_at = now
+            counted.append(book)
+        Book.objects.bulk_update(
+            counted,
+            ["active_borrowings", "total_borrowings", "last_borrowed_at", "updated_at"],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0004_book_updated_at"),
+        ("borrowings", "0007_borrowing_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="book",
+            name="active_borrowings",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="book",
+            name="last_borrowed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="book",
+            name="total_borrowings",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
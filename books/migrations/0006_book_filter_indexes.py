@@ -0,0 +1,37 @@
+# Generated by Django 5.1.5 on 2026-10-18 01:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0005_book_active_borrowings_book_last_borrowed_at_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(
+                fields=["cover", "title", "author", "id"], name="book_cover_title_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(
+                fields=["author", "title", "id"], name="book_author_title_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(fields=["daily_fee"], name="book_daily_fee_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(
+                condition=models.Q(("inventory__gt", 0)),
+                fields=["title", "author", "id"],
+                name="book_available_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.5 on 2026-10-18 04:41
+
+import books.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0006_book_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BookSearchIndex",
+            fields=[
+                (
+                    "book",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="search_index",
+                        serialize=False,
+                        to="books.book",
+                    ),
+                ),
+                ("document", books.search.FullTextField(db_column="books_book_fts")),
+            ],
+            options={
+                "db_table": "books_book_fts",
+                "managed": False,
+            },
+        ),
+    ]
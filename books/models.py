@@ -1,4 +1,81 @@
+from collections import Counter
+
 from django.db import models
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from books import cache
+from books.search import FTS_TABLE, FullTextField
+
+
+class BookQuerySet(models.QuerySet):
+    def check_out(self, *book_ids: int) -> int:
+        """
+        Take one copy of each given book and record the borrowing in
+        its counters, in a single UPDATE.
+
+        Only books with a copy left are updated (`WHERE inventory > 0`),
+        so concurrent checkouts can't oversell; the number of books
+        actually taken is returned.
+        """
+        return self.check_out_many(Counter(book_ids))
+
+    def check_out_many(self, counts: dict) -> int:
+        """
+        Take `counts[book_id]` copies of each book in a single UPDATE.
+
+        A book is only updated if it has enough copies left; returns
+        the number of books updated.
+        """
+        if not counts:
+            return 0
+        taken = copies_expression(counts)
+
+        now = timezone.now()
+        updated = self.filter(pk__in=counts, inventory__gte=taken).update(
+            inventory=F("inventory") - taken,
+            active_borrowings=F("active_borrowings") + taken,
+            total_borrowings=F("total_borrowings") + taken,
+            last_borrowed_at=now,
+            updated_at=now,
+        )
+        if updated:
+            cache.invalidate_books(*counts)
+        return updated
+
+    def check_in(self, *book_ids: int) -> int:
+        """Put one copy of each given book back, in a single UPDATE."""
+        return self.check_in_many(Counter(book_ids))
+
+    def check_in_many(self, counts: dict) -> int:
+        """
+        Put `counts[book_id]` copies of each book back, in a single UPDATE.
+
+        Borrowings created outside `check_out` (admin, fixtures) were
+        never counted, so the active counter is kept from going below
+        zero; `rebuild_book_counters` repairs such drift.
+        """
+        if not counts:
+            return 0
+        returned = copies_expression(counts)
+        updated = self.filter(pk__in=counts).update(
+            inventory=F("inventory") + returned,
+            active_borrowings=Greatest(F("active_borrowings") - returned, 0),
+            updated_at=timezone.now(),
+        )
+        cache.invalidate_books(*counts)
+        return updated
+
+
+def copies_expression(counts: dict):
+    """The per-book number of copies, as a constant or a `CASE` on the pk."""
+    if len(set(counts.values())) == 1:
+        return Value(next(iter(counts.values())))
+    return Case(
+        *(When(pk=pk, then=Value(count)) for pk, count in counts.items()),
+        output_field=models.PositiveIntegerField(),
+    )
 
 
 class Book(models.Model):
@@ -16,9 +93,58 @@ class Book(models.Model):
     )
     inventory = models.PositiveIntegerField()
     daily_fee = models.DecimalField(max_digits=5, decimal_places=2)
+    active_borrowings = models.PositiveIntegerField(default=0)
+    total_borrowings = models.PositiveIntegerField(default=0)
+    last_borrowed_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = BookQuerySet.as_manager()
 
     class Meta:
         ordering = ["title", "author"]
+        indexes = [
+            models.Index(
+                fields=["title", "author", "id"],
+                name="book_title_author_id_idx",
+            ),
+            # Filtered catalog pages: equality/range filter first, then
+            # the (title, author, id) keyset order.
+            models.Index(
+                fields=["cover", "title", "author", "id"],
+                name="book_cover_title_idx",
+            ),
+            models.Index(
+                fields=["author", "title", "id"],
+                name="book_author_title_idx",
+            ),
+            models.Index(fields=["daily_fee"], name="book_daily_fee_idx"),
+            models.Index(
+                fields=["title", "author", "id"],
+                condition=models.Q(inventory__gt=0),
+                name="book_available_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} by {self.author}"
+
+
+class BookSearchIndex(models.Model):
+    """
+    The SQLite full-text index of the catalog (see `books.search`),
+    mapped so that searches can join it. Triggers maintain its rows.
+    """
+
+    book = models.OneToOneField(
+        Book,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column="rowid",
+        db_constraint=False,
+        related_name="search_index",
+    )
+    document = FullTextField(db_column=FTS_TABLE)
+
+    class Meta:
+        managed = False
+        db_table = FTS_TABLE
@@ -0,0 +1,15 @@
+from library_service_project.pagination import KeysetPagination
+
+
+class BookPagination(KeysetPagination):
+    """
+    Pages the catalog in `Book.Meta.ordering` order with `id` as a
+    tiebreaker; search results are paged by relevance instead.
+    """
+
+    ordering = ("title", "author", "id")
+
+    def get_ordering(self, request, queryset, view) -> tuple:
+        if "search_rank" in queryset.query.annotations:
+            return ("-search_rank", "id")
+        return super().get_ordering(request, queryset, view)
@@ -0,0 +1,206 @@
+"""
+Full-text search over the book catalog.
+
+SQLite (dev and tests) keeps an FTS5 external-content index of
+``title``/``author`` in sync with ``books_book`` through triggers.
+PostgreSQL uses a GIN index over the same ``tsvector`` expression
+that search queries filter on, so the planner can serve a search
+from the index instead of scanning the table.
+"""
+import re
+
+from django.db import connections
+from django.db.models import F, FloatField, Func, Lookup, Q, QuerySet, TextField, Value
+from django.db.models.functions import Cast
+
+FTS_TABLE = "books_book_fts"
+POSTGRES_CONFIG = "english"
+POSTGRES_INDEX_NAME = "books_book_search_gin"
+
+# bm25() weights for the (title, author) columns - a match in the
+# title ranks higher than the same match in the author.
+SQLITE_RANK_WEIGHTS = (10.0, 5.0)
+
+SQLITE_TRIGGERS = {
+    f"{FTS_TABLE}_ai": (
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai "
+        f"AFTER INSERT ON books_book BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, title, author) "
+        f"VALUES (new.id, new.title, new.author); END"
+    ),
+    f"{FTS_TABLE}_ad": (
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad "
+        f"AFTER DELETE ON books_book BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, author) "
+        f"VALUES ('delete', old.id, old.title, old.author); END"
+    ),
+    f"{FTS_TABLE}_au": (
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au "
+        f"AFTER UPDATE OF title, author ON books_book BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, author) "
+        f"VALUES ('delete', old.id, old.title, old.author); "
+        f"INSERT INTO {FTS_TABLE}(rowid, title, author) "
+        f"VALUES (new.id, new.title, new.author); END"
+    ),
+}
+
+TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class FullTextField(TextField):
+    """
+    The hidden column of an FTS5 table named after the table itself,
+    which MATCH queries and ranking functions take.
+    """
+
+
+@FullTextField.register_lookup
+class Match(Lookup):
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", [*lhs_params, *rhs_params]
+
+
+class BM25Rank(Func):
+    """`-bm25()` of an FTS5 match: higher is more relevant."""
+
+    function = "bm25"
+    template = "-%(function)s(%(expressions)s)"
+    output_field = FloatField()
+
+    def __init__(self, document, weights):
+        super().__init__(document, *(Value(weight) for weight in weights))
+
+
+def postgres_search_vector():
+    """Weighted tsvector shared by the GIN index and search queries."""
+    from django.contrib.postgres.search import SearchVector
+
+    return (
+        SearchVector("title", weight="A", config=POSTGRES_CONFIG)
+        + SearchVector("author", weight="B", config=POSTGRES_CONFIG)
+    )
+
+
+def postgres_search_index():
+    from django.contrib.postgres.indexes import GinIndex
+
+    return GinIndex(postgres_search_vector(), name=POSTGRES_INDEX_NAME)
+
+
+def install_search_index(schema_editor, model) -> None:
+    """Create the full-text index for the current database backend."""
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "sqlite":
+        install_sqlite_index(schema_editor.connection)
+    elif vendor == "postgresql":
+        schema_editor.add_index(model, postgres_search_index())
+
+
+def uninstall_search_index(schema_editor, model) -> None:
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "sqlite":
+        with schema_editor.connection.cursor() as cursor:
+            for trigger in SQLITE_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif vendor == "postgresql":
+        schema_editor.remove_index(model, postgres_search_index())
+
+
+def install_sqlite_index(db_connection) -> None:
+    """
+    Idempotently create the FTS5 table and its sync triggers.
+
+    SQLite migrations that rebuild ``books_book`` drop the triggers
+    along with the old table, so this also runs after every migrate;
+    if any trigger was missing the index is rebuilt from the table.
+    """
+    with db_connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' "
+            "AND name IN ('books_book', %s)",
+            [FTS_TABLE],
+        )
+        tables = {row[0] for row in cursor.fetchall()}
+        if "books_book" not in tables:
+            return
+
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+            "AND tbl_name = 'books_book'"
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        if FTS_TABLE in tables and existing.issuperset(SQLITE_TRIGGERS):
+            return
+
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            f"title, author, content='books_book', content_rowid='id', "
+            f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        for sql in SQLITE_TRIGGERS.values():
+            cursor.execute(sql)
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+        )
+
+
+def sqlite_match_expression(query: str) -> str:
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+
+    Every word is quoted so FTS5 operators in user input are treated
+    as plain text; the last word is a prefix match to support
+    search-as-you-type.
+    """
+    terms = TERM_RE.findall(query)
+    if not terms:
+        return ""
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def search_books(queryset: QuerySet, query: str) -> QuerySet:
+    """
+    Filter ``queryset`` to books matching ``query``, annotated with
+    ``search_rank`` (higher is more relevant) and ordered by it.
+    """
+    vendor = connections[queryset.db].vendor
+
+    if vendor == "postgresql":
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        search_query = SearchQuery(
+            query, search_type="websearch", config=POSTGRES_CONFIG
+        )
+        vector = postgres_search_vector()
+        queryset = queryset.annotate(
+            search_vector=vector,
+            # ts_rank() is a float4, whose text form is rounded: as a
+            # float8 the rank survives the page cursor exactly, so the
+            # keyset comparison finds the boundary row and its ties.
+            search_rank=Cast(SearchRank(vector, search_query), FloatField()),
+        ).filter(search_vector=search_query)
+    elif vendor == "sqlite":
+        match = sqlite_match_expression(query)
+        if not match:
+            return queryset.none()
+        # Join the index, so the MATCH runs once and bm25() ranks the
+        # matched rows in the same scan.
+        queryset = queryset.filter(search_index__document__match=match).annotate(
+            search_rank=BM25Rank(F("search_index__document"), SQLITE_RANK_WEIGHTS)
+        )
+    else:
+        # No full-text index on this backend: fall back to a scan.
+        queryset = queryset.annotate(
+            search_rank=Value(0.0, output_field=FloatField())
+        ).filter(Q(title__icontains=query) | Q(author__icontains=query))
+
+    return queryset.order_by("-search_rank", "id")
@@ -1,5 +1,8 @@
+from decimal import Decimal
+
 from rest_framework import serializers
 
+from books.importers import DEFAULT_BATCH_SIZE, FORMATS, guess_format
 from books.models import Book
 
 
@@ -11,4 +14,71 @@ class BookSerializer(serializers.ModelSerializer):
                   "author",
                   "cover",
                   "inventory",
-                  "daily_fee")
+                  "daily_fee",
+                  "active_borrowings",
+                  "total_borrowings",
+                  "last_borrowed_at")
+        read_only_fields = ("active_borrowings",
+                            "total_borrowings",
+                            "last_borrowed_at")
+
+
+class BookFilterSerializer(serializers.Serializer):
+    """Query parameters filtering the catalog list and its facets."""
+
+    cover = serializers.ChoiceField(choices=Book.COVER_CHOICES, required=False)
+    author = serializers.CharField(required=False)
+    min_fee = serializers.DecimalField(
+        max_digits=5, decimal_places=2, min_value=Decimal("0"), required=False
+    )
+    max_fee = serializers.DecimalField(
+        max_digits=5, decimal_places=2, min_value=Decimal("0"), required=False
+    )
+    available = serializers.BooleanField(required=False, allow_null=True, default=None)
+
+    def validate(self, data):
+        min_fee, max_fee = data.get("min_fee"), data.get("max_fee")
+        if min_fee is not None and max_fee is not None and min_fee > max_fee:
+            raise serializers.ValidationError(
+                {"min_fee": "Must not be greater than max_fee."}
+            )
+        return data
+
+
+class BookFacetBucketSerializer(serializers.Serializer):
+    bucket = serializers.CharField()
+    min_fee = serializers.DecimalField(max_digits=5, decimal_places=2, allow_null=True)
+    max_fee = serializers.DecimalField(max_digits=5, decimal_places=2, allow_null=True)
+    count = serializers.IntegerField()
+
+
+class BookFacetsSerializer(serializers.Serializer):
+    total = serializers.IntegerField()
+    cover = serializers.DictField(child=serializers.IntegerField())
+    daily_fee = BookFacetBucketSerializer(many=True)
+    available = serializers.DictField(child=serializers.IntegerField())
+
+
+class BookImportSerializer(serializers.Serializer):
+    """Upload for the bulk catalog import."""
+
+    file = serializers.FileField()
+    format = serializers.ChoiceField(choices=FORMATS, required=False)
+    batch_size = serializers.IntegerField(
+        min_value=1, max_value=10000, default=DEFAULT_BATCH_SIZE
+    )
+
+    def validate(self, data):
+        data.setdefault("format", guess_format(data["file"].name))
+        if data["format"] is None:
+            raise serializers.ValidationError(
+                {"format": "Cannot guess the file format from its name."}
+            )
+        return data
+
+
+class BookImportResultSerializer(serializers.Serializer):
+    imported = serializers.IntegerField()
+    failed = serializers.IntegerField()
+    errors = serializers.ListField(child=serializers.DictField())
+    errors_truncated = serializers.BooleanField()
@@ -0,0 +1,19 @@
+from django.db import connections
+
+from books import cache
+from books.search import install_sqlite_index
+
+
+def repair_search_index(sender, using="default", **kwargs) -> None:
+    """Restore FTS triggers dropped by SQLite table rebuilds."""
+    connection = connections[using]
+    if connection.vendor == "sqlite":
+        install_sqlite_index(connection)
+
+
+def invalidate_book_cache(sender, instance, **kwargs) -> None:
+    """
+    Keep catalog cache in sync with every `Book.save()`/`delete()`,
+    including the inventory changes made by borrowing and returning.
+    """
+    cache.invalidate_books(instance.pk)
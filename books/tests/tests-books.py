@@ -46,7 +46,7 @@ class PublicBookTests(TestCase):
         books = Book.objects.all().order_by("title")
         serializer = BookSerializer(books, many=True)
 
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_create_book_unauthorized(self):
         payload = {
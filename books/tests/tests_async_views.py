@@ -0,0 +1,97 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+
+from books.models import Book
+
+ASYNC_BOOKS_URL = reverse("books:book-async-list")
+
+
+class BookAsyncViewTests(TestCase):
+    """The async catalog endpoints must answer like the sync ones."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        Book.objects.bulk_create(
+            Book(
+                title=f"Book {i:02}",
+                author="Author",
+                cover="SOFT" if i % 2 else "HARD",
+                inventory=i % 3,
+                daily_fee=Decimal("1.25"),
+            )
+            for i in range(25)
+        )
+
+    def test_list_matches_sync_list(self):
+        for params in ({}, {"cover": "SOFT"}, {"available": "true", "page_size": 5}):
+            with self.subTest(params=params):
+                sync = self.client.get(reverse("books:book-list"), params).json()
+                res = self.client.get(ASYNC_BOOKS_URL, params)
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+                self.assertEqual(
+                    res.json()["results"], sync["results"]
+                )
+
+    def test_list_follows_cursor(self):
+        first = self.client.get(ASYNC_BOOKS_URL, {"page_size": 20}).json()
+        second = self.client.get(first["next"]).json()
+        self.assertEqual(len(second["results"]), 5)
+        self.assertIsNone(second["next"])
+
+    def test_retrieve(self):
+        book = Book.objects.get(title="Book 03")
+        res = self.client.get(reverse("books:book-async-detail", args=[book.id]))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.json(),
+            self.client.get(reverse("books:book-detail", args=[book.id])).json(),
+        )
+
+    def test_errors(self):
+        res = self.client.get(reverse("books:book-async-detail", args=[999999]))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        res = self.client.get(ASYNC_BOOKS_URL, {"cover": "LEATHER"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("cover", res.json())
+
+    def test_throttled_like_the_sync_list(self):
+        for _ in range(30):
+            self.assertEqual(
+                self.client.get(ASYNC_BOOKS_URL).status_code, status.HTTP_200_OK
+            )
+        res = self.client.get(ASYNC_BOOKS_URL)
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", res)
+        # Both endpoints count against the same limit.
+        res = self.client.get(reverse("books:book-list"))
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_served_from_the_catalog_cache(self):
+        self.client.get(ASYNC_BOOKS_URL, {"page_size": 5})
+        with self.assertNumQueries(0):
+            res = self.client.get(ASYNC_BOOKS_URL, {"page_size": 5})
+        self.assertEqual(len(res.json()["results"]), 5)
+
+        book = Book.objects.get(title="Book 03")
+        url = reverse("books:book-async-detail", args=[book.id])
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url).json()["id"], book.id)
+
+    def test_conditional_get(self):
+        book = Book.objects.get(title="Book 03")
+        for url in (ASYNC_BOOKS_URL, reverse("books:book-async-detail", args=[book.id])):
+            with self.subTest(url=url):
+                res = self.client.get(url)
+                self.assertIn("ETag", res)
+                res = self.client.get(url, HTTP_IF_NONE_MATCH=res["ETag"])
+                self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+                self.assertEqual(res.content, b"")
+
+    def test_writes_are_not_served(self):
+        res = self.client.post(ASYNC_BOOKS_URL, {})
+        self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
@@ -0,0 +1,93 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.models import Borrowing
+
+BOOKS_URL = reverse("books:book-list")
+
+
+def detail_url(book_id: int) -> str:
+    return reverse("books:book-detail", args=[book_id])
+
+
+class BookCacheTests(TestCase):
+    """Tests for cached catalog reads and their invalidation."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_superuser(
+            email="admin@example.com", password="password123"
+        )
+        self.book = Book.objects.create(
+            title="Cached Book",
+            author="Author",
+            inventory=2,
+            daily_fee=Decimal("1.00"),
+        )
+
+    def test_repeated_reads_skip_the_database(self):
+        self.client.get(BOOKS_URL)
+        self.client.get(detail_url(self.book.id))
+
+        with self.assertNumQueries(0):
+            res = self.client.get(BOOKS_URL)
+            self.assertEqual(res.data["results"][0]["title"], "Cached Book")
+            res = self.client.get(detail_url(self.book.id))
+            self.assertEqual(res.data["title"], "Cached Book")
+
+    def test_update_through_viewset_invalidates(self):
+        self.client.get(BOOKS_URL)
+        self.client.get(detail_url(self.book.id))
+
+        self.client.force_authenticate(self.admin)
+        res = self.client.patch(detail_url(self.book.id), {"title": "Renamed"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.client.force_authenticate(None)
+
+        self.assertEqual(
+            self.client.get(detail_url(self.book.id)).data["title"], "Renamed"
+        )
+        self.assertEqual(
+            self.client.get(BOOKS_URL).data["results"][0]["title"], "Renamed"
+        )
+
+    def test_delete_through_viewset_invalidates(self):
+        self.client.get(detail_url(self.book.id))
+
+        self.client.force_authenticate(self.admin)
+        self.client.delete(detail_url(self.book.id))
+        self.client.force_authenticate(None)
+
+        res = self.client.get(detail_url(self.book.id))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(BOOKS_URL).data["results"], [])
+
+    def test_borrow_and_return_invalidate_inventory(self):
+        self.client.get(detail_url(self.book.id))
+
+        self.client.force_authenticate(self.admin)
+        res = self.client.post(
+            reverse("borrowings:borrowings-list"),
+            {
+                "book": self.book.id,
+                "expected_return_date": date.today() + timedelta(days=7),
+            },
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            self.client.get(detail_url(self.book.id)).data["inventory"], 1
+        )
+
+        Borrowing.objects.get(id=res.data["id"]).return_book()
+        self.assertEqual(
+            self.client.get(detail_url(self.book.id)).data["inventory"], 2
+        )
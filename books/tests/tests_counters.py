@@ -0,0 +1,116 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.models import Borrowing
+
+
+class BookCounterTests(TestCase):
+    """Tests for the denormalized borrowing counters on `Book`."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_superuser(
+            email="admin@example.com", password="password123"
+        )
+        self.client.force_authenticate(self.user)
+        self.book = Book.objects.create(
+            title="Counted Book",
+            author="Author",
+            inventory=3,
+            daily_fee=Decimal("1.00"),
+        )
+
+    def borrow(self) -> int:
+        res = self.client.post(
+            reverse("borrowings:borrowings-list"),
+            {
+                "book": self.book.id,
+                "expected_return_date": timezone.now().date() + timedelta(days=3),
+            },
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        return res.data["id"]
+
+    def test_checkout_and_return_update_counters(self):
+        first = self.borrow()
+        self.borrow()
+
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 1)
+        self.assertEqual(self.book.active_borrowings, 2)
+        self.assertEqual(self.book.total_borrowings, 2)
+        self.assertIsNotNone(self.book.last_borrowed_at)
+
+        res = self.client.post(
+            reverse("borrowings:borrowings-return-borrowing", args=[first])
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 2)
+        self.assertEqual(self.book.active_borrowings, 1)
+        self.assertEqual(self.book.total_borrowings, 2)
+
+    def test_counters_are_served_by_the_api(self):
+        self.borrow()
+        res = self.client.get(reverse("books:book-detail", args=[self.book.id]))
+        self.assertEqual(res.data["active_borrowings"], 1)
+        self.assertEqual(res.data["total_borrowings"], 1)
+
+    def test_counters_are_read_only(self):
+        res = self.client.patch(
+            reverse("books:book-detail", args=[self.book.id]),
+            {"active_borrowings": 10, "total_borrowings": 10},
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.active_borrowings, 0)
+        self.assertEqual(self.book.total_borrowings, 0)
+
+    def test_rebuild_repairs_drift(self):
+        due = timezone.now().date() + timedelta(days=3)
+        active = Borrowing.objects.create(
+            book=self.book, user=self.user, expected_return_date=due
+        )
+        Borrowing.objects.create(
+            book=self.book,
+            user=self.user,
+            expected_return_date=due,
+            actual_return_date=due,
+        )
+        untouched = Book.objects.create(
+            title="Never Borrowed",
+            author="Author",
+            inventory=1,
+            daily_fee=Decimal("1.00"),
+        )
+
+        out = StringIO()
+        call_command("rebuild_book_counters", "--batch-size", "1", stdout=out)
+        self.assertIn("Repaired counters of 1 books.", out.getvalue())
+
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.active_borrowings, 1)
+        self.assertEqual(self.book.total_borrowings, 2)
+        self.assertEqual(
+            timezone.localdate(self.book.last_borrowed_at), active.borrow_date
+        )
+        untouched.refresh_from_db()
+        self.assertEqual(untouched.total_borrowings, 0)
+        self.assertIsNone(untouched.last_borrowed_at)
+
+        out = StringIO()
+        call_command("rebuild_book_counters", stdout=out)
+        self.assertIn("Repaired counters of 0 books.", out.getvalue())
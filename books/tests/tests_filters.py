@@ -0,0 +1,102 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+
+BOOKS_URL = reverse("books:book-list")
+FACETS_URL = reverse("books:book-facets")
+
+
+class BookFilterTests(TestCase):
+    """Tests for catalog filters and facet counts."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        for title, author, cover, inventory, fee in (
+            ("Dune", "Herbert", "HARD", 2, "0.50"),
+            ("Dune Messiah", "Herbert", "SOFT", 0, "1.50"),
+            ("Emma", "Austen", "SOFT", 1, "2.00"),
+            ("Persuasion", "Austen", "HARD", 0, "7.25"),
+        ):
+            Book.objects.create(
+                title=title,
+                author=author,
+                cover=cover,
+                inventory=inventory,
+                daily_fee=Decimal(fee),
+            )
+
+    def titles(self, params: dict) -> list:
+        res = self.client.get(BOOKS_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [book["title"] for book in res.data["results"]]
+
+    def test_filters(self):
+        self.assertEqual(self.titles({"cover": "SOFT"}), ["Dune Messiah", "Emma"])
+        self.assertEqual(self.titles({"author": "Austen"}), ["Emma", "Persuasion"])
+        self.assertEqual(
+            self.titles({"min_fee": "1.50", "max_fee": "2.00"}),
+            ["Dune Messiah", "Emma"],
+        )
+        self.assertEqual(self.titles({"available": "true"}), ["Dune", "Emma"])
+        self.assertEqual(
+            self.titles({"available": "false"}), ["Dune Messiah", "Persuasion"]
+        )
+        self.assertEqual(
+            self.titles({"author": "Herbert", "available": "true"}), ["Dune"]
+        )
+
+    def test_filters_combine_with_search(self):
+        self.assertEqual(self.titles({"q": "dune", "cover": "SOFT"}), ["Dune Messiah"])
+
+    def test_invalid_filters_are_rejected(self):
+        for params in (
+            {"cover": "LEATHER"},
+            {"min_fee": "cheap"},
+            {"available": "maybe"},
+            {"min_fee": "5", "max_fee": "1"},
+        ):
+            with self.subTest(params=params):
+                res = self.client.get(BOOKS_URL, params)
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+                res = self.client.get(FACETS_URL, params)
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_facets(self):
+        res = self.client.get(FACETS_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["total"], 4)
+        self.assertEqual(res.data["cover"], {"HARD": 2, "SOFT": 2})
+        self.assertEqual(
+            [(bucket["bucket"], bucket["count"]) for bucket in res.data["daily_fee"]],
+            [("0.00-1.00", 1), ("1.00-2.00", 1), ("2.00-5.00", 1), ("5.00+", 1)],
+        )
+        self.assertEqual(res.data["available"], {"true": 2, "false": 2})
+
+    def test_facets_ignore_their_own_filter(self):
+        res = self.client.get(FACETS_URL, {"cover": "SOFT", "available": "true"})
+        self.assertEqual(res.data["total"], 1)
+        # Covers among available books, availability among soft covers.
+        self.assertEqual(res.data["cover"], {"HARD": 1, "SOFT": 1})
+        self.assertEqual(res.data["available"], {"true": 1, "false": 1})
+        self.assertEqual(
+            [bucket["count"] for bucket in res.data["daily_fee"]], [0, 0, 1, 0]
+        )
+
+    def test_facets_run_one_query(self):
+        with self.assertNumQueries(1):
+            self.client.get(
+                FACETS_URL, {"q": "dune", "author": "Herbert", "min_fee": "1"}
+            )
+
+    def test_facets_follow_writes(self):
+        self.client.get(FACETS_URL)
+        Book.objects.filter(title="Dune").get().delete()
+        res = self.client.get(FACETS_URL)
+        self.assertEqual(res.data["total"], 3)
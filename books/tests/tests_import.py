@@ -0,0 +1,130 @@
+import os
+import tempfile
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+
+IMPORT_URL = reverse("books:book-import-books")
+
+CSV_CONTENT = (
+    "title,author,cover,inventory,daily_fee\n"
+    "Dune,Frank Herbert,SOFT,3,1.50\n"
+    "Bad Cover,Someone,PAPER,1,1.00\n"
+    "Too Precise,Someone,HARD,1,1.005\n"
+    "Negative,Someone,HARD,-2,1.00\n"
+    "Emma,Jane Austen,,2,0.75\n"
+)
+
+
+class ImportBooksCommandTests(TestCase):
+    """Tests for the `import_books` management command."""
+
+    def run_import(self, content: str, suffix: str, *args) -> tuple:
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=suffix, delete=False, encoding="utf-8"
+        ) as file:
+            file.write(content)
+        self.addCleanup(os.remove, file.name)
+
+        out, err = StringIO(), StringIO()
+        call_command("import_books", file.name, *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_import_csv_reports_invalid_rows(self):
+        out, err = self.run_import(CSV_CONTENT, ".csv", "--batch-size", "1")
+
+        self.assertIn("Imported 2 books, 3 rows failed.", out)
+        self.assertIn("line 3: cover:", err)
+        self.assertIn("line 4: daily_fee:", err)
+        self.assertIn("line 5: inventory:", err)
+        self.assertEqual(
+            sorted(Book.objects.values_list("title", flat=True)),
+            ["Dune", "Emma"],
+        )
+        self.assertEqual(Book.objects.get(title="Emma").cover, "HARD")
+
+    def test_import_jsonl_upserts_by_id(self):
+        book = Book.objects.create(
+            title="Old", author="Author", inventory=1, daily_fee=Decimal("1.00")
+        )
+        content = (
+            f'{{"id": {book.id}, "title": "New", "author": "Author", '
+            f'"inventory": 4, "daily_fee": "2.00"}}\n'
+            "\n"
+            "not json\n"
+            '{"title": "Other", "author": "Author", "inventory": 1, '
+            '"daily_fee": 1}\n'
+        )
+        out, err = self.run_import(content, ".jsonl")
+
+        self.assertIn("Imported 2 books, 1 rows failed.", out)
+        self.assertIn("line 3: __all__: Invalid JSON", err)
+        book.refresh_from_db()
+        self.assertEqual((book.title, book.inventory), ("New", 4))
+        self.assertEqual(Book.objects.count(), 2)
+
+    def test_inserts_after_explicit_ids_get_new_ids(self):
+        content = (
+            '{"id": 500, "title": "Numbered", "author": "Author", '
+            '"inventory": 1, "daily_fee": 1}\n'
+        )
+        self.run_import(content, ".jsonl")
+        self.run_import(
+            '{"title": "Unnumbered", "author": "Author", "inventory": 1, '
+            '"daily_fee": 1}\n',
+            ".jsonl",
+        )
+        book = Book.objects.create(
+            title="Created", author="Author", inventory=1, daily_fee=Decimal("1.00")
+        )
+
+        self.assertGreater(Book.objects.get(title="Unnumbered").id, 500)
+        self.assertGreater(book.id, 500)
+
+
+class ImportBooksEndpointTests(TestCase):
+    """Tests for the admin bulk upload endpoint."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_superuser(
+            email="admin@example.com", password="password123"
+        )
+
+    def upload(self):
+        return self.client.post(
+            IMPORT_URL,
+            {"file": SimpleUploadedFile("books.csv", CSV_CONTENT.encode())},
+            format="multipart",
+        )
+
+    def test_import_as_admin(self):
+        self.client.force_authenticate(self.admin)
+        res = self.upload()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["imported"], 2)
+        self.assertEqual(res.data["failed"], 3)
+        self.assertEqual(
+            [error["line"] for error in res.data["errors"]], [3, 4, 5]
+        )
+        self.assertIn("inventory", res.data["errors"][2]["errors"])
+        self.assertFalse(res.data["errors_truncated"])
+
+    def test_import_requires_admin(self):
+        user = get_user_model().objects.create_user(
+            email="user@example.com", password="password123"
+        )
+        self.client.force_authenticate(user)
+
+        self.assertEqual(self.upload().status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Book.objects.exists())
@@ -0,0 +1,54 @@
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+
+BOOKS_URL = reverse("books:book-list")
+
+
+class BookPaginationTests(TestCase):
+    """Tests for keyset pagination of the book list."""
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        # Duplicate titles and authors make `id` the deciding tiebreaker.
+        for title in ("Beta", "Alpha", "Alpha", "Gamma", "Alpha"):
+            Book.objects.create(
+                title=title,
+                author="Same Author",
+                inventory=1,
+                daily_fee=Decimal("1.00"),
+            )
+        self.expected = list(
+            Book.objects.order_by("title", "author", "id")
+            .values_list("id", flat=True)
+        )
+
+    def test_walk_forward_and_back(self):
+        res = self.client.get(BOOKS_URL, {"page_size": 2})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsNone(res.data["previous"])
+
+        seen, pages = [], []
+        url = res.data["next"]
+        seen += [book["id"] for book in res.data["results"]]
+        while url:
+            res = self.client.get(url)
+            pages.append(res.data)
+            seen += [book["id"] for book in res.data["results"]]
+            url = res.data["next"]
+
+        self.assertEqual(seen, self.expected)
+
+        res = self.client.get(pages[-1]["previous"])
+        self.assertEqual(
+            [book["id"] for book in res.data["results"]], self.expected[2:4]
+        )
+
+    def test_invalid_cursor(self):
+        res = self.client.get(BOOKS_URL, {"cursor": "not-a-cursor"})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
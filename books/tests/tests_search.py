@@ -0,0 +1,105 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from books.models import Book
+
+BOOKS_URL = reverse("books:book-list")
+FACETS_URL = reverse("books:book-facets")
+
+
+def sample_book(**params) -> Book:
+    defaults = {
+        "title": "Sample Book",
+        "author": "Sample Author",
+        "cover": "HARD",
+        "inventory": 5,
+        "daily_fee": Decimal("1.00"),
+    }
+    defaults.update(params)
+    return Book.objects.create(**defaults)
+
+
+class BookSearchTests(TestCase):
+    """Tests for full-text search on the book list."""
+
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.hobbit = sample_book(title="The Hobbit", author="J. R. R. Tolkien")
+        self.rings = sample_book(
+            title="The Fellowship of the Ring", author="J. R. R. Tolkien"
+        )
+        self.dune = sample_book(title="Dune", author="Frank Herbert")
+
+    def search(self, query: str) -> list:
+        res = self.client.get(BOOKS_URL, {"q": query})
+        return [book["id"] for book in res.data["results"]]
+
+    def test_search_by_title(self):
+        self.assertEqual(self.search("hobbit"), [self.hobbit.id])
+
+    def test_search_by_author(self):
+        self.assertCountEqual(
+            self.search("tolkien"), [self.hobbit.id, self.rings.id]
+        )
+
+    def test_title_match_ranks_above_author_match(self):
+        herbert = sample_book(title="Herbert's Cookbook", author="Jane Doe")
+        self.assertEqual(self.search("herbert"), [herbert.id, self.dune.id])
+
+    def test_search_prefix_of_last_word(self):
+        self.assertEqual(self.search("fellow"), [self.rings.id])
+
+    def test_search_ignores_query_syntax(self):
+        self.assertEqual(self.search('"dune" -(*'), [self.dune.id])
+        self.assertEqual(self.search("!!!"), [])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.dune.title = "Children of Dune"
+        self.dune.save()
+        self.assertEqual(self.search("children"), [self.dune.id])
+
+        self.dune.delete()
+        self.assertEqual(self.search("dune"), [])
+
+    def test_search_results_are_paginated_by_rank(self):
+        res = self.client.get(BOOKS_URL, {"q": "tolkien", "page_size": 1})
+        first = res.data["results"][0]["id"]
+        res = self.client.get(res.data["next"])
+        self.assertEqual(len(res.data["results"]), 1)
+        self.assertCountEqual(
+            [first, res.data["results"][0]["id"]],
+            [self.hobbit.id, self.rings.id],
+        )
+        self.assertIsNone(res.data["next"])
+
+    def test_broad_query_matches_once(self):
+        Book.objects.bulk_create(
+            Book(
+                title=f"Volume {i}",
+                author="Common Author",
+                inventory=1,
+                daily_fee=Decimal("1.00"),
+            )
+            for i in range(200)
+        )
+        cache.clear()
+
+        # The list version and the page, with the index joined.
+        with self.assertNumQueries(2) as queries:
+            res = self.client.get(BOOKS_URL, {"q": "author", "page_size": 50})
+        ids = [book["id"] for book in res.data["results"]]
+        while res.data["next"]:
+            res = self.client.get(res.data["next"])
+            ids += [book["id"] for book in res.data["results"]]
+
+        self.assertEqual(len(ids), 200)
+        self.assertEqual(len(set(ids)), 200)
+        for query in queries.captured_queries:
+            self.assertLessEqual(query["sql"].count("MATCH"), 1)
+
+        res = self.client.get(FACETS_URL, {"q": "author"})
+        self.assertEqual(res.status_code, 200)
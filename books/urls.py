@@ -1,12 +1,15 @@
 from django.urls import path, include
 from rest_framework import routers
 
-from books.views import BookViewSet
+from books.views import BookAsyncView, BookViewSet
 
 
 router = routers.DefaultRouter()
 router.register("", BookViewSet)
 
-urlpatterns = router.urls
+urlpatterns = [
+    path("async/", BookAsyncView.as_view(), name="book-async-list"),
+    path("async/<int:pk>/", BookAsyncView.as_view(), name="book-async-detail"),
+] + router.urls
 
 app_name = "books"
@@ -1,11 +1,279 @@
+import io
+
+from django.db.models import Count, Max
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
 
+from books import cache
+from books.filters import facet_aggregates, facet_data, filter_conditions
+from books.importers import import_books, read_rows
 from books.models import Book
-from books.serializers import BookSerializer
+from books.pagination import BookPagination
+from books.search import search_books
+from books.serializers import (
+    BookSerializer,
+    BookFacetsSerializer,
+    BookFilterSerializer,
+    BookImportSerializer,
+    BookImportResultSerializer,
+)
 from books.permissions import IsAdminOrReadOnly
+from library_service_project.asynchronous import AsyncReadView
+from library_service_project.conditional import ConditionalGetMixin
+from library_service_project.exports import (
+    CSVRenderer,
+    NDJSONRenderer,
+    export_response,
+)
+from library_service_project.metrics import SerializationMetricsMixin
+from library_service_project.serialization import FastListMixin
+
+
+class BookViewSet(
+    SerializationMetricsMixin,
+    FastListMixin,
+    ConditionalGetMixin,
+    viewsets.ModelViewSet,
+):
+    """
+    ViewSet for managing the book catalog.
 
+    - Everyone can list and retrieve books; only admins can modify them.
+    - `?q=` switches the list to full-text search over title and author,
+      ordered by relevance.
+    - Lists can be filtered by `cover`, `author`, `min_fee`/`max_fee`
+      and `available`; `facets/` counts the results per filter value.
+    - Lists are cursor paginated (`?cursor=`, `?page_size=`) and rendered
+      through the compiled read-only form of `BookSerializer`.
+    - List pages and book details are served from cache; writes to a book
+      (here, or via borrowing/returning it) invalidate its entries.
+    - Reads carry ETag/Last-Modified; conditional requests get a 304.
+    - Admins can bulk import a CSV/JSON Lines catalog file and stream
+      the whole catalog out as CSV/NDJSON.
+    """
 
-class BookViewSet(viewsets.ModelViewSet):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = (IsAdminOrReadOnly,)
+    pagination_class = BookPagination
+    max_import_errors = 1000
+    export_chunk_size = 2000
+    export_fields = ("id", "title", "author", "cover", "inventory", "daily_fee")
+
+    def get_serializer_class(self):
+        if self.action == "import_books":
+            return BookImportSerializer
+        return super().get_serializer_class()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        if self.action in ("list", "facets"):
+            query = self.request.query_params.get("q", "").strip()
+            if query:
+                queryset = search_books(queryset, query)
+
+        if self.action == "list":
+            queryset = queryset.filter(*self.get_filter_conditions().values())
+
+        return queryset
+
+    def get_filter_conditions(self) -> dict:
+        """Validate the filter query params, 400 on invalid values."""
+        serializer = BookFilterSerializer(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return filter_conditions(serializer.validated_data)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="q",
+                type=OpenApiTypes.STR,
+                description="Full-text search over title and author, "
+                            "results are ordered by relevance.",
+            ),
+            BookFilterSerializer,
+        ]
+    )
+    def list(self, request, *args, **kwargs):
+        url = request.build_absolute_uri()
+        entry = cache.get_list(url)
+
+        if entry is None:
+            queryset = self.filter_queryset(self.get_queryset())
+            version = self.get_list_version(queryset)
+            not_modified = self.not_modified(version)
+            if not_modified is not None:
+                return not_modified
+
+            entry = (version, self.get_list_data(queryset))
+            cache.set_list(url, entry)
+
+        return self.conditional_response(*entry)
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            book_id = int(kwargs[self.lookup_field])
+        except ValueError:
+            return super().retrieve(request, *args, **kwargs)
+
+        entry = cache.get_detail(book_id)
+
+        if entry is None:
+            version = self.get_object_version(self.get_queryset(), book_id)
+            if version is not None:
+                not_modified = self.not_modified(version)
+                if not_modified is not None:
+                    return not_modified
+
+            instance = self.get_object()
+            entry = ((instance.updated_at,), self.get_serializer(instance).data)
+            cache.set_detail(book_id, entry)
+
+        return self.conditional_response(*entry)
+
+    @extend_schema(
+        summary="Catalog facets",
+        description="Count the books matching the current search and "
+                    "filters per cover, daily fee bucket and availability. "
+                    "Each facet ignores its own filter, so its counts show "
+                    "what choosing another value would return.",
+        parameters=[
+            OpenApiParameter(name="q", type=OpenApiTypes.STR),
+            BookFilterSerializer,
+        ],
+        responses={200: BookFacetsSerializer},
+    )
+    @action(detail=False, methods=["GET"])
+    def facets(self, request: Request) -> Response:
+        """Computes every facet and the list version in one aggregate query."""
+        url = request.build_absolute_uri()
+        entry = cache.get_list(url)
+
+        if entry is None:
+            conditions = self.get_filter_conditions()
+            stats = self.get_queryset().order_by().aggregate(
+                last_modified=Max(self.last_modified_field),
+                count=Count("pk"),
+                **facet_aggregates(conditions),
+            )
+            entry = ((stats["last_modified"], stats["count"]), facet_data(stats))
+            cache.set_list(url, entry)
+
+        return self.conditional_response(*entry)
+
+    @extend_schema(
+        summary="Bulk import books",
+        description="Stream a CSV or JSON Lines file of books into the "
+                    "catalog. Rows with an `id` update that book. "
+                    "Invalid rows are skipped and listed in `errors`. "
+                    "This action is available only to admin users.",
+        responses={200: BookImportResultSerializer},
+    )
+    @action(
+        detail=False,
+        methods=["POST"],
+        url_path="import",
+        permission_classes=[IsAdminUser],
+        parser_classes=[MultiPartParser],
+    )
+    def import_books(self, request: Request) -> Response:
+        """
+        Imports books from an uploaded file.
+
+        - Rows are validated against the `Book` field rules.
+        - Valid rows are written in batches of `batch_size`.
+        - Returns counts and a per-row error report.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = serializer.validated_data["file"]
+
+        errors = []
+
+        def collect(error):
+            if len(errors) < self.max_import_errors:
+                errors.append({"line": error.line, "errors": error.errors})
+
+        stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+        result = import_books(
+            read_rows(stream, serializer.validated_data["format"]),
+            batch_size=serializer.validated_data["batch_size"],
+            on_error=collect,
+        )
+
+        return Response(
+            {
+                "imported": result.imported,
+                "failed": result.failed,
+                "errors": errors,
+                "errors_truncated": result.failed > len(errors),
+            }
+        )
+
+    @extend_schema(
+        summary="Export books",
+        description="Stream the whole catalog as CSV (default) or NDJSON "
+                    "(`?format=ndjson`). "
+                    "This action is available only to admin users.",
+        responses={(200, "text/csv"): OpenApiTypes.STR,
+                   (200, "application/x-ndjson"): OpenApiTypes.STR},
+    )
+    @action(
+        detail=False,
+        methods=["GET"],
+        permission_classes=[IsAdminUser],
+        renderer_classes=[CSVRenderer, NDJSONRenderer],
+    )
+    def export(self, request: Request):
+        """Streams every book, reading the table through a server-side cursor."""
+        fields = self.export_fields
+        rows = (
+            Book.objects.order_by("id")
+            .values_list(*fields)
+            .iterator(chunk_size=self.export_chunk_size)
+        )
+        return export_response(
+            request.accepted_renderer.format, fields, rows, "books"
+        )
+
+
+class BookAsyncView(AsyncReadView):
+    """
+    Async-native catalog list and retrieve, see `AsyncReadView`. Reads
+    and fills the catalog cache like `BookViewSet` does.
+    """
+
+    viewset_class = BookViewSet
+
+    async def alist(self, viewset):
+        url = viewset.request.build_absolute_uri()
+        entry = await cache.aget_list(url)
+
+        if entry is None:
+            queryset = viewset.filter_queryset(viewset.get_queryset())
+            version = await viewset.aget_list_version(queryset)
+            not_modified = viewset.not_modified(version)
+            if not_modified is not None:
+                return not_modified
+
+            entry = (version, await viewset.aget_list_data(queryset))
+            await cache.aset_list(url, entry)
+
+        return viewset.conditional_response(*entry)
+
+    async def aretrieve(self, viewset, pk):
+        entry = await cache.aget_detail(pk)
+
+        if entry is None:
+            instance = await self.aget_object(viewset.get_queryset(), pk)
+            entry = ((instance.updated_at,), viewset.get_serializer(instance).data)
+            await cache.aset_detail(pk, entry)
+
+        return viewset.conditional_response(*entry)
@@ -1,6 +1,19 @@
 from django.contrib import admin
 
-from borrowings.models import Borrowing
+from borrowings.models import Borrowing, BorrowingArchive
+from borrowings.versions import bump_list_version
 
 
-admin.site.register(Borrowing)
+@admin.register(Borrowing)
+class BorrowingAdmin(admin.ModelAdmin):
+    # Borrowing deletes send no signal the list version listens to.
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        bump_list_version()
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        bump_list_version()
+
+
+admin.site.register(BorrowingArchive)
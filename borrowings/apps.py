@@ -1,6 +1,23 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
 
 
 class BorrowingsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "borrowings"
+
+    def ready(self):
+        from books.models import Book
+        from borrowings.models import Borrowing
+        from borrowings.signals import borrowings_returned
+        from borrowings.versions import bump_on_change
+
+        # Deletes of borrowings aren't connected: a post_delete receiver
+        # would make every bulk delete (archiving) fetch and delete rows
+        # one by one. Their call sites bump the version instead.
+        post_save.connect(bump_on_change, sender=Borrowing)
+        borrowings_returned.connect(bump_on_change)
+        for model in (Book, settings.AUTH_USER_MODEL):
+            post_save.connect(bump_on_change, sender=model)
+            post_delete.connect(bump_on_change, sender=model)
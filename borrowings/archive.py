@@ -0,0 +1,88 @@
+"""
+Archiving of returned borrowings.
+
+The live `Borrowing` table should only hold what the hot paths need:
+active loans and recent history. `archive_borrowings` moves billed
+borrowings returned before a cutoff into `BorrowingArchive`, in
+id-keyset batches of one transaction each (copy, then delete), so an
+interrupted run loses nothing and simply continues where it stopped
+when re-run. Unbilled borrowings stay in the live table, where billing
+looks for them.
+
+Reads that ask for history (returned borrowings, a user's borrowings,
+exports) go through the `BorrowingHistory` view, a `UNION ALL` of both
+tables created by migration 0011; everything else reads the live table
+only. A migration that alters a column of either table has to drop
+the view first and recreate it afterwards.
+"""
+from datetime import date
+from typing import Callable, Optional
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from borrowings.models import Borrowing, BorrowingArchive
+from borrowings.versions import bump_list_version
+from payments.models import Payment
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_DAYS = 365
+HISTORY_COLUMNS = (
+    "id",
+    "borrow_date",
+    "expected_return_date",
+    "actual_return_date",
+    "book_id",
+    "user_id",
+    "overdue_since",
+    "fine_rate",
+    "updated_at",
+)
+
+
+def archivable_borrowings(returned_before: date):
+    return Borrowing.objects.filter(
+        Exists(Payment.objects.filter(borrowing=OuterRef("pk"))),
+        actual_return_date__lt=returned_before,
+    )
+
+
+def archive_borrowings(
+    returned_before: date,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    on_batch: Optional[Callable[[int], None]] = None,
+) -> int:
+    """
+    Move billed borrowings returned before `returned_before` to the
+    archive, `batch_size` per transaction. `on_batch` is called with
+    the number of borrowings of each archived batch. Returns the total.
+    """
+    queryset = archivable_borrowings(returned_before).order_by("pk")
+    archived = 0
+    last_id = 0
+
+    while True:
+        with transaction.atomic():
+            rows = list(
+                queryset.select_for_update()
+                .filter(pk__gt=last_id)
+                .values_list(*HISTORY_COLUMNS)[:batch_size]
+            )
+            if not rows:
+                return archived
+            last_id = rows[-1][0]
+
+            BorrowingArchive.objects.bulk_create(
+                [BorrowingArchive(**dict(zip(HISTORY_COLUMNS, row)))
+                 for row in rows],
+                ignore_conflicts=True,
+            )
+            Borrowing.objects.filter(pk__in=[row[0] for row in rows]).delete()
+            bump_list_version()
+
+        archived += len(rows)
+        if on_batch is not None:
+            on_batch(len(rows))
+        if len(rows) < batch_size:
+            return archived
+
@@ -0,0 +1,74 @@
+"""Seeding helpers shared by the benchmark commands."""
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+
+from books.models import Book
+from borrowings.models import Borrowing
+
+SEED_BATCH_SIZE = 20000
+
+
+def seed_borrowings(rows: int, active_ratio: float, prefix: str) -> list:
+    """
+    Insert `rows` borrowings spread over two years, users and books.
+
+    Every `1 / active_ratio`-th borrowing is still active, the others
+    were returned up to three weeks after borrowing, i.e. some late.
+    Returns the created users.
+    """
+    User = get_user_model()
+    users = User.objects.bulk_create(
+        User(email=f"{prefix}-{i}@example.com", password="")
+        for i in range(max(rows // 50, 1))
+    )
+    books = Book.objects.bulk_create(
+        Book(
+            title=f"{prefix} book {i}",
+            author="Bench",
+            inventory=1,
+            daily_fee=Decimal(50 + i % 450) / 100,
+        )
+        for i in range(max(rows // 200, 1))
+    )
+
+    # Raw inserts: `borrow_date` is `auto_now_add`, and the history
+    # must span two years.
+    table = connection.ops.quote_name(Borrowing._meta.db_table)
+    columns = ", ".join(
+        connection.ops.quote_name(Borrowing._meta.get_field(name).column)
+        for name in (
+            "borrow_date",
+            "expected_return_date",
+            "actual_return_date",
+            "book",
+            "user",
+            "updated_at",
+        )
+    )
+    sql = f"INSERT INTO {table} ({columns}) VALUES (%s, %s, %s, %s, %s, %s)"
+    today = date.today()
+    now = connection.ops.adapt_datetimefield_value(
+        Borrowing._meta.get_field("updated_at").pre_save(Borrowing(), True)
+    )
+    active_every = max(round(1 / active_ratio), 1) if active_ratio else 0
+
+    with connection.cursor() as cursor:
+        for start in range(0, rows, SEED_BATCH_SIZE):
+            batch = []
+            for i in range(start, min(start + SEED_BATCH_SIZE, rows)):
+                borrowed = today - timedelta(days=i % 730)
+                active = active_every and i % active_every == 0
+                batch.append((
+                    borrowed,
+                    borrowed + timedelta(days=14),
+                    None if active else borrowed + timedelta(days=i % 21),
+                    books[i % len(books)].pk,
+                    users[i % len(users)].pk,
+                    now,
+                ))
+            cursor.executemany(sql, batch)
+
+    return users
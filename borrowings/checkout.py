@@ -0,0 +1,207 @@
+"""
+Checkout engine.
+
+A copy is reserved with one conditional UPDATE
+(`inventory = inventory - 1 WHERE inventory > 0`) and the borrowing
+is inserted in the same short transaction. No row is read and written
+back, so concurrent checkouts of a popular book neither lose updates
+nor oversell it, and no lock is held beyond that UPDATE's row lock.
+
+Batches of checkouts are planned against one fetch of their books and
+reserved with one `CASE`-based UPDATE and one `bulk_create`; batches of
+returns close their borrowings with one UPDATE and restock the books
+with one grouped increment.
+"""
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from books.models import Book
+from borrowings.models import Borrowing, BorrowingArchive
+from borrowings.signals import borrowings_returned
+from borrowings.versions import bump_list_version
+from users.cache import invalidate_dashboards
+
+
+MAX_BATCH_SIZE = 50
+MAX_RETURN_BATCH_SIZE = 1000
+
+
+class BookUnavailable(ValidationError):
+    """No copy of the book is left to borrow."""
+
+
+@dataclass
+class ItemError:
+    index: int
+    book: int
+    errors: list
+
+
+@dataclass
+class ReturnResult:
+    returned: list
+    already_returned: list
+    not_found: list
+    not_borrowed: list
+
+
+class BatchCheckoutError(Exception):
+    """An all-or-nothing batch failed; nothing was checked out."""
+
+    def __init__(self, failures: list):
+        super().__init__(failures)
+        self.failures = failures
+
+
+def check_out(book: Book, user, expected_return_date: date, **fields) -> Borrowing:
+    """Reserve a copy of `book` and create the borrowing, atomically."""
+    with transaction.atomic():
+        if not Book.objects.check_out(book.pk):
+            raise BookUnavailable(
+                f"The book '{book.title}' is not available for borrowing."
+            )
+        invalidate_dashboards(user.pk)
+        return Borrowing.objects.create(
+            book=book,
+            user=user,
+            expected_return_date=expected_return_date,
+            **fields,
+        )
+
+
+def check_out_batch(user, items: list, partial: bool = False) -> tuple:
+    """
+    Check out every `{"book": id, "expected_return_date": date}` item.
+
+    With `partial`, items that can't be served are skipped; otherwise
+    any failing item raises `BatchCheckoutError`. Returns the created
+    borrowings and the per-item failures.
+
+    The books are read without locking them; the conditional UPDATE of
+    `check_out_many` has the last word. If a concurrent checkout took
+    copies the plan counted on, nothing is checked out and
+    `BookUnavailable` asks the client to retry.
+    """
+    with transaction.atomic():
+        books = Book.objects.in_bulk(
+            {item["book"] for item in items}
+        )
+        left = {pk: book.inventory for pk, book in books.items()}
+        borrowings, failures = [], []
+
+        for index, item in enumerate(items):
+            book = books.get(item["book"])
+            if book is None:
+                failures.append(ItemError(index, item["book"], ["Book not found."]))
+            elif left[book.pk] <= 0:
+                failures.append(ItemError(index, book.pk, [
+                    f"The book '{book.title}' is not available for borrowing."
+                ]))
+            else:
+                left[book.pk] -= 1
+                borrowings.append(Borrowing(
+                    book=book,
+                    user=user,
+                    expected_return_date=item["expected_return_date"],
+                ))
+
+        if failures and not partial:
+            raise BatchCheckoutError(failures)
+
+        counts = Counter(borrowing.book_id for borrowing in borrowings)
+        if Book.objects.check_out_many(counts) != len(counts):
+            raise BookUnavailable(
+                "The inventory changed during checkout, please retry."
+            )
+        if borrowings:
+            invalidate_dashboards(user.pk)
+            bump_list_version()
+        return Borrowing.objects.bulk_create(borrowings), failures
+
+
+def return_batch(borrowing_ids=(), book_ids=()) -> ReturnResult:
+    """
+    Return borrowings given by id, or by the id of their book.
+
+    A book id returns the oldest active borrowing of that book (a book
+    listed twice, its two oldest). Runs a constant number of queries:
+    one locking read, one UPDATE of the borrowings and one of the books,
+    plus an archive lookup if some borrowing ids weren't found.
+    """
+    with transaction.atomic():
+        if borrowing_ids:
+            rows = list(
+                Borrowing.objects.select_for_update()
+                .filter(pk__in=borrowing_ids)
+                .values_list("pk", "book_id", "actual_return_date", "user_id")
+            )
+        else:
+            rows = list(
+                Borrowing.objects.select_for_update()
+                .filter(book_id__in=book_ids, actual_return_date__isnull=True)
+                .order_by("borrow_date", "id")
+                .values_list("pk", "book_id", "actual_return_date", "user_id")
+            )
+        result, to_close = plan_returns(rows, borrowing_ids, book_ids)
+        if result.not_found and borrowing_ids:
+            # Archived borrowings were returned long ago.
+            archived = set(
+                BorrowingArchive.objects.filter(pk__in=result.not_found)
+                .values_list("pk", flat=True)
+            )
+            result.already_returned += [
+                pk for pk in result.not_found if pk in archived
+            ]
+            result.not_found = [
+                pk for pk in result.not_found if pk not in archived
+            ]
+
+        if to_close:
+            now = timezone.now()
+            closed = Borrowing.objects.filter(
+                pk__in=to_close, actual_return_date__isnull=True
+            ).update(actual_return_date=now.date(), updated_at=now)
+            # Only short if a backend without row locks let a return in.
+            if closed != len(to_close):
+                raise ValidationError(
+                    "The borrowings changed during the return, please retry."
+                )
+            Book.objects.check_in_many(Counter(to_close.values()))
+            invalidate_dashboards(
+                *{row[3] for row in rows if row[0] in to_close}
+            )
+            borrowings_returned.send(sender=Borrowing, borrowing_ids=list(to_close))
+
+    result.returned = sorted(to_close)
+    return result
+
+
+def plan_returns(rows: list, borrowing_ids, book_ids) -> tuple:
+    """Pick the borrowings to close, as `{borrowing_id: book_id}`."""
+    result = ReturnResult([], [], [], [])
+    to_close = {}
+
+    if borrowing_ids:
+        found = {pk: (book_id, returned) for pk, book_id, returned, _ in rows}
+        for pk in dict.fromkeys(borrowing_ids):
+            if pk not in found:
+                result.not_found.append(pk)
+            elif found[pk][1] is not None:
+                result.already_returned.append(pk)
+            else:
+                to_close[pk] = found[pk][0]
+    else:
+        active = {}
+        for pk, book_id, *_ in rows:
+            active.setdefault(book_id, []).append(pk)
+        for book_id, copies in Counter(book_ids).items():
+            borrowings = active.get(book_id, [])[:copies]
+            to_close.update(dict.fromkeys(borrowings, book_id))
+            result.not_borrowed += [book_id] * (copies - len(borrowings))
+
+    return result, to_close
@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from borrowings.archive import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_DAYS,
+    archive_borrowings,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Move billed borrowings returned more than --days days ago to the "
+        "archive table, in batches. Safe to interrupt and re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=DEFAULT_DAYS,
+            help="Archive borrowings returned more than this many days ago.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Borrowings moved per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        if options["days"] < 0:
+            raise CommandError("--days can't be negative.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+
+        returned_before = timezone.localdate() - timedelta(days=options["days"])
+        archived = archive_borrowings(
+            returned_before,
+            options["batch_size"],
+            on_batch=lambda count: self.stdout.write(
+                f"Archived a batch of {count} borrowings."
+            ),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {archived} borrowings returned before "
+                f"{returned_before}."
+            )
+        )
@@ -0,0 +1,109 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from borrowings.benchmarks import seed_borrowings
+from borrowings.views import BorrowingViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a large borrowings table and report, for every filter "
+        "combination of the borrowing endpoints, the request latency and "
+        "the query plans of the SQL it runs. Runs inside a transaction "
+        "that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument(
+            "--active-ratio",
+            type=float,
+            default=0.1,
+            help="Share of borrowings not yet returned.",
+        )
+
+    def handle(self, *args, **options):
+        if options["rows"] < 1 or options["repeat"] < 1:
+            raise CommandError("--rows and --repeat must be positive.")
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            admin, user = self.seed(options["rows"], options["active_ratio"])
+            self.stdout.write(
+                f"Seeded {options['rows']:,} borrowings in "
+                f"{time.perf_counter() - started:.1f}s"
+            )
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+            # Requests are built in-process, their host is "testserver".
+            with override_settings(ALLOWED_HOSTS=["testserver"]):
+                for label, action, requester, params in self.cases(admin, user):
+                    self.measure(
+                        label, action, requester, params, options["repeat"]
+                    )
+            transaction.set_rollback(True)
+
+    def cases(self, admin, user):
+        return (
+            ("admin: all", "list", admin, {}),
+            ("admin: active", "list", admin, {"is_active": "true"}),
+            ("admin: returned", "list", admin, {"is_active": "false"}),
+            ("admin: user_id", "list", admin, {"user_id": user.pk}),
+            (
+                "admin: user_id + active",
+                "list",
+                admin,
+                {"user_id": user.pk, "is_active": "true"},
+            ),
+            ("user: own", "list", user, {}),
+            ("user: own active", "list", user, {"is_active": "true"}),
+            ("user: own returned", "list", user, {"is_active": "false"}),
+            ("user: get_user_borrowings", "get_user_borrowings", user, {}),
+        )
+
+    def seed(self, rows: int, active_ratio: float) -> tuple:
+        admin = get_user_model().objects.create_superuser(
+            email="bench-queries-admin@example.com", password="bench"
+        )
+        users = seed_borrowings(rows, active_ratio, "bench-queries")
+        return admin, users[0]
+
+    def measure(self, label, action, requester, params, repeat) -> None:
+        view = BorrowingViewSet.as_view({"get": action}, throttle_classes=())
+        factory = APIRequestFactory()
+
+        def request():
+            req = factory.get("/api/borrowings/", params)
+            force_authenticate(req, requester)
+            response = view(req)
+            response.render()
+            return response
+
+        with CaptureQueriesContext(connection) as queries:
+            request()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            request()
+            timings.append((time.perf_counter() - started) * 1000)
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{label:<28} p50 {statistics.median(timings):8.2f} ms   "
+            f"max {max(timings):8.2f} ms   {len(queries)} queries"
+        ))
+        for query in queries:
+            sql = query["sql"]
+            if not sql.startswith("SELECT"):
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}")
+                for row in cursor.fetchall():
+                    self.stdout.write(f"    {row[-1]}")
@@ -0,0 +1,131 @@
+import threading
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, transaction
+
+from books.models import Book
+from borrowings.checkout import BookUnavailable, check_out
+from borrowings.models import Borrowing
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark concurrent checkouts of one hot book: N client threads "
+        "(each with its own database connection) race for a limited number "
+        "of copies. Reports checkouts/sec and verifies that no copy was "
+        "oversold. Benchmark rows are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=50)
+        parser.add_argument("--copies", type=int, default=500)
+        parser.add_argument(
+            "--attempts",
+            type=int,
+            default=20,
+            help="Checkouts attempted by each thread.",
+        )
+        parser.add_argument(
+            "--naive",
+            action="store_true",
+            help="Use a read-modify-write checkout instead, for comparison.",
+        )
+
+    def handle(self, *args, **options):
+        threads, copies = options["threads"], options["copies"]
+        if threads < 1 or copies < 1 or options["attempts"] < 1:
+            raise CommandError("--threads, --copies and --attempts must be positive.")
+
+        users = get_user_model().objects.bulk_create(
+            get_user_model()(email=f"bench-checkout-{i}@example.com", password="")
+            for i in range(threads)
+        )
+        book = Book.objects.create(
+            title="Benchmark hot book",
+            author="Benchmark",
+            inventory=copies,
+            daily_fee=Decimal("1.00"),
+        )
+
+        try:
+            results = self.run(book, users, options)
+            self.report(book, copies, results)
+        finally:
+            Borrowing.objects.filter(book=book).delete()
+            book.delete()
+            get_user_model().objects.filter(pk__in=[user.pk for user in users]).delete()
+
+    def run(self, book, users, options) -> dict:
+        checkout = naive_check_out if options["naive"] else check_out
+        due = date.today() + timedelta(days=14)
+        results = {"ok": 0, "unavailable": 0, "errors": 0}
+        lock = threading.Lock()
+        start = threading.Barrier(len(users) + 1)
+
+        def client(user):
+            counts = dict.fromkeys(results, 0)
+            start.wait()
+            try:
+                for _ in range(options["attempts"]):
+                    try:
+                        checkout(book, user, due)
+                        counts["ok"] += 1
+                    except BookUnavailable:
+                        counts["unavailable"] += 1
+                    except OperationalError:
+                        counts["errors"] += 1
+            finally:
+                connection.close()
+            with lock:
+                for key, value in counts.items():
+                    results[key] += value
+
+        workers = [threading.Thread(target=client, args=(user,)) for user in users]
+        for worker in workers:
+            worker.start()
+        start.wait()
+        began = time.perf_counter()
+        for worker in workers:
+            worker.join()
+        results["seconds"] = time.perf_counter() - began
+        return results
+
+    def report(self, book, copies, results) -> None:
+        book.refresh_from_db()
+        borrowed = Borrowing.objects.filter(book=book).count()
+        attempts = results["ok"] + results["unavailable"] + results["errors"]
+
+        self.stdout.write(
+            f"{attempts} attempts in {results['seconds']:.2f}s: "
+            f"{results['ok']} checked out, {results['unavailable']} unavailable, "
+            f"{results['errors']} errors - "
+            f"{results['ok'] / results['seconds']:,.0f} checkouts/s"
+        )
+        self.stdout.write(
+            f"copies {copies}, borrowings {borrowed}, inventory left {book.inventory}"
+        )
+
+        if borrowed > copies or borrowed + book.inventory != copies:
+            self.stderr.write(self.style.ERROR(
+                "Inventory and borrowings disagree: copies were oversold "
+                "or updates were lost."
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS("No overselling."))
+
+
+def naive_check_out(book, user, expected_return_date) -> Borrowing:
+    """The read-modify-write checkout this benchmark compares against."""
+    with transaction.atomic():
+        book = Book.objects.get(pk=book.pk)
+        if book.inventory <= 0:
+            raise BookUnavailable("Not available.")
+        book.inventory -= 1
+        book.save(update_fields=["inventory"])
+        return Borrowing.objects.create(
+            book=book, user=user, expected_return_date=expected_return_date
+        )
@@ -0,0 +1,117 @@
+import copy
+import statistics
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+from django.db.utils import load_backend
+
+from books.models import Book
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the database connection setup cost per request: client "
+        "threads run short requests (open-or-reuse the connection like "
+        "Django's request signals do, read a page of books, release it) "
+        "with a new connection per request, with persistent connections "
+        "and, on PostgreSQL, with psycopg's connection pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--requests", type=int, default=4000)
+
+    def handle(self, *args, **options):
+        threads, requests = options["threads"], options["requests"]
+        if threads < 1 or requests < threads:
+            raise CommandError("Need 1 <= --threads <= --requests.")
+
+        base = connections[DEFAULT_DB_ALIAS].settings_dict
+        options_no_pool = {
+            name: value for name, value in base["OPTIONS"].items()
+            if name != "pool"
+        }
+        variants = [
+            ("new connection per request", {
+                "CONN_MAX_AGE": 0, "OPTIONS": options_no_pool,
+            }),
+            ("persistent connections", {
+                "CONN_MAX_AGE": settings.DB_CONN_MAX_AGE or 60,
+                "OPTIONS": options_no_pool,
+            }),
+        ]
+        if base["ENGINE"] == "django.db.backends.postgresql":
+            variants.append(("psycopg pool", {
+                "CONN_MAX_AGE": 0,
+                "OPTIONS": {
+                    **options_no_pool,
+                    "pool": {"min_size": threads, "max_size": threads},
+                },
+            }))
+
+        quote = connections[DEFAULT_DB_ALIAS].ops.quote_name
+        sql = (
+            f"SELECT id, title, author FROM {quote(Book._meta.db_table)} "
+            f"ORDER BY id LIMIT 20"
+        )
+        for label, overrides in variants:
+            settings_dict = {**copy.deepcopy(base), **overrides}
+            self.report(label, *run(settings_dict, sql, threads, requests // threads))
+
+    def report(self, label, elapsed, latencies, connects):
+        latencies.sort()
+        self.stdout.write(
+            f"{label:<28} {len(latencies) / elapsed:8.0f} req/s   "
+            f"p50 {statistics.median(latencies) * 1000:7.3f} ms   "
+            f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:7.3f} ms   "
+            f"{connects} connects"
+        )
+
+
+def run(settings_dict, sql, threads, per_thread):
+    # Its own alias, so that a pool isn't shared with the real connections.
+    alias = "bench-connections"
+    backend = load_backend(settings_dict["ENGINE"])
+    latencies, connects = [], []
+    lock = threading.Lock()
+
+    def count(sender, connection, **kwargs):
+        if connection.alias == alias:
+            with lock:
+                connects.append(1)
+
+    def client():
+        wrapper = backend.DatabaseWrapper(copy.deepcopy(settings_dict), alias)
+        timings = []
+        for _ in range(per_thread):
+            began = time.perf_counter()
+            # What close_old_connections() does on request_started and
+            # request_finished.
+            wrapper.close_if_unusable_or_obsolete()
+            with wrapper.cursor() as cursor:
+                cursor.execute(sql)
+                cursor.fetchall()
+            wrapper.close_if_unusable_or_obsolete()
+            timings.append(time.perf_counter() - began)
+        wrapper.close()
+        with lock:
+            latencies.extend(timings)
+
+    connection_created.connect(count, weak=False)
+    try:
+        workers = [threading.Thread(target=client) for _ in range(threads)]
+        began = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - began
+    finally:
+        connection_created.disconnect(count)
+        if "pool" in settings_dict["OPTIONS"]:
+            backend.DatabaseWrapper(settings_dict, alias).close_pool()
+    return elapsed, latencies, len(connects)
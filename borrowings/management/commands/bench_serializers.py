@@ -0,0 +1,100 @@
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from books.models import Book
+from books.serializers import BookSerializer
+from borrowings.models import Borrowing
+from borrowings.serializers import BorrowingListSerializer
+from library_service_project.serialization import compile_serializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark list serialization in rows/sec: DRF serializers versus "
+        "the compiled values() fast path. Runs on throwaway rows inside a "
+        "transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        rows, repeat = options["rows"], options["repeat"]
+
+        with transaction.atomic():
+            self.seed(rows)
+            cases = (
+                ("books", Book.objects.order_by("id")[:rows], BookSerializer),
+                (
+                    "borrowings",
+                    Borrowing.objects.order_by("id")[:rows],
+                    BorrowingListSerializer,
+                ),
+            )
+            for name, queryset, serializer_class in cases:
+                self.compare(name, queryset, serializer_class, rows, repeat)
+            transaction.set_rollback(True)
+
+    def seed(self, rows: int) -> None:
+        users = get_user_model().objects.bulk_create(
+            get_user_model()(email=f"bench-{i}@example.com", password="")
+            for i in range(max(rows // 100, 1))
+        )
+        books = Book.objects.bulk_create(
+            Book(
+                title=f"Benchmark title {i}",
+                author=f"Author {i % 97}",
+                cover="SOFT" if i % 2 else "HARD",
+                inventory=i % 10,
+                daily_fee=Decimal(i % 500) / 100,
+            )
+            for i in range(rows)
+        )
+        due = date.today() + timedelta(days=14)
+        Borrowing.objects.bulk_create(
+            Borrowing(
+                book=books[i],
+                user=users[i % len(users)],
+                expected_return_date=due,
+                actual_return_date=date.today() if i % 3 == 0 else None,
+            )
+            for i in range(rows)
+        )
+
+    def compare(self, name, queryset, serializer_class, rows, repeat) -> None:
+        renderer = JSONRenderer()
+        fast = compile_serializer(serializer_class)
+
+        def drf():
+            return renderer.render(serializer_class(queryset.all(), many=True).data)
+
+        def compiled():
+            return renderer.render(fast.many(queryset.values(*fast.columns)))
+
+        if drf() != compiled():
+            self.stderr.write(f"{name}: outputs differ!")
+
+        before = self.rows_per_second(drf, rows, repeat)
+        after = self.rows_per_second(compiled, rows, repeat)
+        self.stdout.write(
+            f"{name:<12} DRF {before:>12,.0f} rows/s   "
+            f"compiled {after:>12,.0f} rows/s   x{after / before:.1f}"
+        )
+
+    @staticmethod
+    def rows_per_second(func, rows, repeat) -> float:
+        best = min(timed(func) for _ in range(repeat))
+        return rows / best
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from borrowings.overdue import DEFAULT_CHUNK_SIZE, scan_overdue
+
+
+class Command(BaseCommand):
+    help = (
+        "Mark borrowings that became overdue since the last run and record "
+        "their daily fine. Meant to run daily, e.g. from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Borrowings marked per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive.")
+
+        marked = scan_overdue(chunk_size=options["chunk_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Marked {marked} borrowings overdue.")
+        )
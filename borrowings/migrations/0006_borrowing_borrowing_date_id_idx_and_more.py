@@ -0,0 +1,24 @@
+# Generated by Django 5.1.5 on 2026-10-18 01:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0003_book_book_title_author_id_idx'),
+        ('borrowings', '0005_remove_borrowing_created_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='borrowing',
+            index=models.Index(fields=['borrow_date', 'id'], name='borrowing_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='borrowing',
+            index=models.Index(fields=['user', 'borrow_date', 'id'], name='borrowing_user_date_id_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:12
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("borrowings", "0006_borrowing_borrowing_date_id_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="borrowing",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+    ]
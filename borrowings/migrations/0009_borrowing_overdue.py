@@ -0,0 +1,39 @@
+# Generated by Django 5.1.5 on 2026-10-18 02:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0006_book_filter_indexes"),
+        ("borrowings", "0008_borrowing_active_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="borrowing",
+            name="fine_rate",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, max_digits=7, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="borrowing",
+            name="overdue_since",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="borrowing",
+            index=models.Index(
+                condition=models.Q(
+                    ("actual_return_date__isnull", True),
+                    ("overdue_since__isnull", False),
+                ),
+                fields=["overdue_since", "id"],
+                name="borrowing_overdue_idx",
+            ),
+        ),
+    ]
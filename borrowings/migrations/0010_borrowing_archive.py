@@ -0,0 +1,82 @@
+# Generated by Django 5.1.5 on 2026-10-18 02:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0006_book_filter_indexes"),
+        ("borrowings", "0009_borrowing_overdue"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BorrowingHistory",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("borrow_date", models.DateField()),
+                ("expected_return_date", models.DateField()),
+                ("actual_return_date", models.DateField(null=True)),
+                ("overdue_since", models.DateField(null=True)),
+                (
+                    "fine_rate",
+                    models.DecimalField(decimal_places=2, max_digits=7, null=True),
+                ),
+                ("updated_at", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name_plural": "borrowing history",
+                "db_table": "borrowings_borrowinghistory",
+                "managed": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="BorrowingArchive",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("borrow_date", models.DateField()),
+                ("expected_return_date", models.DateField()),
+                ("actual_return_date", models.DateField()),
+                ("overdue_since", models.DateField(blank=True, null=True)),
+                (
+                    "fine_rate",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=7, null=True
+                    ),
+                ),
+                ("updated_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "book",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_borrowings",
+                        to="books.book",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_borrowings",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["borrow_date", "id"], name="archive_date_id_idx"
+                    ),
+                    models.Index(
+                        fields=["user", "borrow_date", "id"],
+                        name="archive_user_date_id_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
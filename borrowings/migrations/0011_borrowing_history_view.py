@@ -0,0 +1,27 @@
+from django.db import migrations
+
+# The columns of `BorrowingHistory`, in both tables.
+HISTORY_SELECT = (
+    'SELECT "id", "borrow_date", "expected_return_date", '
+    '"actual_return_date", "book_id", "user_id", "overdue_since", '
+    '"fine_rate", "updated_at" FROM "{table}"'
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("borrowings", "0010_borrowing_archive"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                'CREATE VIEW "borrowings_borrowinghistory" AS '
+                + HISTORY_SELECT.format(table="borrowings_borrowing")
+                + " UNION ALL "
+                + HISTORY_SELECT.format(table="borrowings_borrowingarchive")
+            ),
+            reverse_sql='DROP VIEW "borrowings_borrowinghistory"',
+        ),
+    ]
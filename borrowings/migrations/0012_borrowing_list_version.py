@@ -0,0 +1,23 @@
+# Generated by Django 5.1.5 on 2026-10-18 04:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("borrowings", "0011_borrowing_history_view"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BorrowingListVersion",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=32, primary_key=True, serialize=False),
+                ),
+                ("version", models.BigIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -1,8 +1,10 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 
 from books.models import Book
+from borrowings.signals import borrowings_returned
+from users.cache import invalidate_dashboards
 from library_service_project import settings
 
 
@@ -16,6 +18,11 @@ class Borrowing(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="borrowings"
     )
+    overdue_since = models.DateField(null=True, blank=True)
+    fine_rate = models.DecimalField(
+        max_digits=7, decimal_places=2, null=True, blank=True
+    )
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         constraints = [
@@ -24,15 +31,154 @@ class Borrowing(models.Model):
                 name="check_expected_after_borrow",
             )
         ]
+        indexes = [
+            models.Index(
+                fields=["borrow_date", "id"],
+                name="borrowing_date_id_idx",
+            ),
+            models.Index(
+                fields=["user", "borrow_date", "id"],
+                name="borrowing_user_date_id_idx",
+            ),
+            # Active loans are a small, hot slice of the table: partial
+            # indexes keep them in small indexes in the list order.
+            models.Index(
+                fields=["borrow_date", "id"],
+                condition=models.Q(actual_return_date__isnull=True),
+                name="borrowing_active_date_idx",
+            ),
+            models.Index(
+                fields=["user", "borrow_date", "id"],
+                condition=models.Q(actual_return_date__isnull=True),
+                name="borrowing_active_user_idx",
+            ),
+            models.Index(
+                fields=["book", "borrow_date", "id"],
+                condition=models.Q(actual_return_date__isnull=True),
+                name="borrowing_active_book_idx",
+            ),
+            models.Index(
+                fields=["expected_return_date", "id"],
+                condition=models.Q(actual_return_date__isnull=True),
+                name="borrowing_active_due_idx",
+            ),
+            models.Index(
+                fields=["overdue_since", "id"],
+                condition=models.Q(
+                    actual_return_date__isnull=True, overdue_since__isnull=False
+                ),
+                name="borrowing_overdue_idx",
+            ),
+        ]
 
     def return_book(self) -> None:
-        """Updates actual_return_date and return the book to inventory."""
+        """
+        Updates actual_return_date and return the book to inventory,
+        updating the book's borrowing counters in the same transaction.
+
+        The borrowing is closed with a conditional UPDATE, so of two
+        concurrent returns only one puts the copy back.
+        """
         if self.actual_return_date:
             raise ValidationError("This book has already been returned")
-        self.actual_return_date = timezone.now().date()
-        self.book.inventory += 1
-        self.book.save()
-        self.save()
+        returned = timezone.now().date()
+        with transaction.atomic():
+            closed = Borrowing.objects.filter(
+                pk=self.pk, actual_return_date__isnull=True
+            ).update(actual_return_date=returned, updated_at=timezone.now())
+            if not closed:
+                raise ValidationError("This book has already been returned")
+            Book.objects.check_in(self.book_id)
+            invalidate_dashboards(self.user_id)
+            borrowings_returned.send(sender=Borrowing, borrowing_ids=[self.pk])
+        self.actual_return_date = returned
+
+    def __str__(self):
+        return f"Book {self.book.title} borrowed from {self.borrow_date} to {self.expected_return_date}"
+
+
+class BorrowingArchive(models.Model):
+    """
+    Returned borrowings moved out of the live table by
+    `archive_borrowings`. Rows keep their original id and values.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    borrow_date = models.DateField()
+    expected_return_date = models.DateField()
+    actual_return_date = models.DateField()
+    book = models.ForeignKey(
+        Book, on_delete=models.CASCADE, related_name="archived_borrowings"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="archived_borrowings",
+    )
+    overdue_since = models.DateField(null=True, blank=True)
+    fine_rate = models.DecimalField(
+        max_digits=7, decimal_places=2, null=True, blank=True
+    )
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["borrow_date", "id"],
+                name="archive_date_id_idx",
+            ),
+            models.Index(
+                fields=["user", "borrow_date", "id"],
+                name="archive_user_date_id_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Archived borrowing {self.pk} of book {self.book_id}"
+
+
+class BorrowingHistory(models.Model):
+    """
+    Read-only view over the live and archived borrowings (`UNION ALL`),
+    see `borrowings.archive`.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    borrow_date = models.DateField()
+    expected_return_date = models.DateField()
+    actual_return_date = models.DateField(null=True)
+    book = models.ForeignKey(
+        Book, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    overdue_since = models.DateField(null=True)
+    fine_rate = models.DecimalField(max_digits=7, decimal_places=2, null=True)
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = "borrowings_borrowinghistory"
+        verbose_name_plural = "borrowing history"
 
     def __str__(self):
         return f"Book {self.book.title} borrowed from {self.borrow_date} to {self.expected_return_date}"
+
+
+
+class BorrowingListVersion(models.Model):
+    """
+    A counter bumped by every write that can change a borrowing list,
+    from which the lists' ETags are derived (see `borrowings.versions`).
+    """
+
+    name = models.CharField(max_length=32, primary_key=True)
+    version = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} lists at version {self.version}"
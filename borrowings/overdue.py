@@ -0,0 +1,79 @@
+"""
+Overdue detection.
+
+`scan_overdue` walks the active borrowings past their expected return
+date that aren't marked yet, in `(expected_return_date, id)` keyset
+chunks served by the active-loan due-date index, and records when
+each became overdue and the daily fine it accrues. Marked borrowings
+drop out of the scan, so every run only processes newly overdue ones;
+the admin overdue list reads the recorded state.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from borrowings.models import Borrowing
+from library_service_project.pagination import keyset_filter
+
+DEFAULT_CHUNK_SIZE = 1000
+SCAN_ORDERING = ("expected_return_date", "id")
+
+
+def fine_multiplier() -> Decimal:
+    return Decimal(str(getattr(settings, "FINE_MULTIPLIER", 2)))
+
+
+def scan_overdue(
+    today: Optional[date] = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> int:
+    """Mark borrowings that became overdue by `today`, return how many."""
+    today = today or timezone.localdate()
+    multiplier = fine_multiplier()
+    candidates = Borrowing.objects.filter(
+        actual_return_date__isnull=True,
+        overdue_since__isnull=True,
+        expected_return_date__lt=today,
+    ).order_by(*SCAN_ORDERING)
+
+    marked = 0
+    position = None
+    while True:
+        queryset = candidates
+        if position is not None:
+            queryset = queryset.filter(keyset_filter(SCAN_ORDERING, position))
+        chunk = list(
+            queryset.values_list("pk", "expected_return_date", "book__daily_fee")
+            [:chunk_size]
+        )
+        if not chunk:
+            return marked
+        pk, expected_return_date, _ = chunk[-1]
+        position = [expected_return_date, pk]
+
+        now = timezone.now()
+        with transaction.atomic():
+            Borrowing.objects.bulk_update(
+                [
+                    Borrowing(
+                        pk=pk,
+                        overdue_since=expected_return_date + timedelta(days=1),
+                        fine_rate=daily_fee * multiplier,
+                        updated_at=now,
+                    )
+                    for pk, expected_return_date, daily_fee in chunk
+                ],
+                ["overdue_since", "fine_rate", "updated_at"],
+            )
+        marked += len(chunk)
+
+
+def accrued_fine(
+    expected_return_date: date, fine_rate: Decimal, until: date
+) -> tuple:
+    """Days overdue and the fine accrued by `until`."""
+    days = max((until - expected_return_date).days, 0)
+    return days, fine_rate * days
@@ -0,0 +1,16 @@
+from library_service_project.pagination import KeysetPagination
+
+
+class BorrowingPagination(KeysetPagination):
+    """
+    Pages borrowings newest first by `borrow_date` with `id` as a
+    tiebreaker; overdue borrowings are paged longest overdue first.
+    """
+
+    ordering = ("-borrow_date", "-id")
+    overdue_ordering = ("overdue_since", "id")
+
+    def get_ordering(self, request, queryset, view) -> tuple:
+        if getattr(view, "action", None) == "overdue":
+            return self.overdue_ordering
+        return super().get_ordering(request, queryset, view)
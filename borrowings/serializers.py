@@ -1,6 +1,13 @@
 from datetime import date
+
 from rest_framework import serializers
 
+from borrowings.checkout import (
+    MAX_BATCH_SIZE,
+    MAX_RETURN_BATCH_SIZE,
+    BookUnavailable,
+    check_out,
+)
 from borrowings.models import Borrowing
 from books.serializers import BookSerializer
 from users.serializers import UserSerializer
@@ -50,16 +57,87 @@ class BorrowingSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         """
         Custom logic for borrowing creation -
-        decreases the book inventory by 1 upon borrowing.
+        reserves a copy of the book (decreasing its inventory by 1 and
+        updating its borrowing counters) and creates the borrowing in
+        one transaction. Fails if the last copy was taken meanwhile.
         """
-        book = validated_data["book"]
+        try:
+            return check_out(**validated_data)
+        except BookUnavailable as error:
+            raise serializers.ValidationError(error.messages)
+
+
+class BorrowingBatchItemSerializer(serializers.Serializer):
+    """One book of a batch checkout."""
 
-        # Decrease the book inventory by 1
-        book.inventory -= 1
-        book.save()
+    book = serializers.IntegerField(min_value=1)
+    expected_return_date = serializers.DateField()
+
+    def validate_expected_return_date(self, value):
+        if value <= date.today():
+            raise serializers.ValidationError(
+                "Expected return date should be later than borrow date."
+            )
+        return value
+
+
+class BorrowingBatchSerializer(serializers.Serializer):
+    """
+    Serializer for checking out several books in one request.
+    Books are looked up by the checkout itself, in a single query.
+    """
 
-        # Create the borrowing instance
-        return super().create(validated_data)
+    items = BorrowingBatchItemSerializer(
+        many=True, allow_empty=False, max_length=MAX_BATCH_SIZE
+    )
+    partial = serializers.BooleanField(
+        default=False,
+        help_text="Check out the available books and report the others, "
+                  "instead of failing the whole batch.",
+    )
+
+
+class BorrowingBatchErrorSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    book = serializers.IntegerField()
+    errors = serializers.ListField(child=serializers.CharField())
+
+
+class BorrowingBatchResultSerializer(serializers.Serializer):
+    created = BorrowingSerializer(many=True)
+    failed = BorrowingBatchErrorSerializer(many=True)
+
+
+class BorrowingBulkReturnSerializer(serializers.Serializer):
+    """
+    Serializer for returning many borrowings at once, given either
+    their IDs or the IDs of the returned books.
+    """
+
+    borrowings = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        max_length=MAX_RETURN_BATCH_SIZE,
+    )
+    books = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        max_length=MAX_RETURN_BATCH_SIZE,
+    )
+
+    def validate(self, data):
+        if bool(data.get("borrowings")) == bool(data.get("books")):
+            raise serializers.ValidationError(
+                "Provide either a non-empty `borrowings` or `books` list."
+            )
+        return data
+
+
+class BorrowingBulkReturnResultSerializer(serializers.Serializer):
+    returned = serializers.ListField(child=serializers.IntegerField())
+    already_returned = serializers.ListField(child=serializers.IntegerField())
+    not_found = serializers.ListField(child=serializers.IntegerField())
+    not_borrowed = serializers.ListField(child=serializers.IntegerField())
 
 
 class BorrowingListSerializer(BorrowingSerializer):
@@ -72,6 +150,26 @@ class BorrowingListSerializer(BorrowingSerializer):
     user = serializers.SlugRelatedField(slug_field="email", read_only=True)
 
 
+class BorrowingOverdueSerializer(BorrowingListSerializer):
+    """
+    Serializer for the overdue list.
+    Adds the recorded overdue state to the list representation.
+    """
+
+    class Meta:
+        model = Borrowing
+        fields = [
+            "id",
+            "borrow_date",
+            "expected_return_date",
+            "overdue_since",
+            "fine_rate",
+            "book",
+            "user",
+        ]
+        read_only_fields = fields
+
+
 class BorrowingDetailSerializer(BorrowingSerializer):
     """
     Serializer for detailed borrowing view.
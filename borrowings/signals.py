@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent inside the returning transaction with `borrowing_ids`, the
+# borrowings that were just returned.
+borrowings_returned = Signal()
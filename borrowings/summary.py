@@ -0,0 +1,35 @@
+"""
+Borrowing summary of one user, for the `me` dashboard.
+
+The counts and the next due date come from one aggregate over the
+user's active borrowings (served by the active-loan user index), the
+most recent borrowings from one `values()` query rendered through the
+compiled list serializer.
+"""
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from borrowings.models import Borrowing
+from borrowings.serializers import BorrowingListSerializer
+from library_service_project.serialization import compile_serializer
+
+
+def borrowing_summary(user, recent: int) -> dict:
+    today = timezone.localdate()
+    stats = Borrowing.objects.filter(
+        user=user, actual_return_date__isnull=True
+    ).aggregate(
+        active_borrowings=Count("pk"),
+        overdue_borrowings=Count("pk", filter=Q(expected_return_date__lt=today)),
+        next_due_date=Min("expected_return_date"),
+    )
+    if stats["next_due_date"] is not None:
+        stats["next_due_date"] = stats["next_due_date"].isoformat()
+
+    fast = compile_serializer(BorrowingListSerializer)
+    rows = (
+        Borrowing.objects.filter(user=user)
+        .order_by("-borrow_date", "-id")
+        .values(*fast.columns)[:recent]
+    )
+    return {**stats, "recent_borrowings": fast.many(rows)}
@@ -0,0 +1,200 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from books.models import Book
+from borrowings.archive import archive_borrowings
+from borrowings.models import Borrowing, BorrowingArchive
+from payments.billing import bill_borrowings
+from payments.models import Payment
+
+LIST_URL = reverse("borrowings:borrowings-list")
+USER_BORROWINGS_URL = reverse("borrowings:borrowings-get-user-borrowings")
+
+
+class ArchiveTests(TestCase):
+    """Tests for archiving returned borrowings and reading them back."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_superuser(
+            email="admin@example.com", password="password_admin"
+        )
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com", password="password_user"
+        )
+        self.book = Book.objects.create(
+            title="Old Book", author="Author", inventory=5, daily_fee=Decimal("1.00")
+        )
+        self.today = timezone.localdate()
+        self.old = [self.borrow(returned_days_ago=400) for _ in range(3)]
+        self.recent = self.borrow(returned_days_ago=10)
+        self.active = self.borrow(returned_days_ago=None)
+        bill_borrowings()
+        self.unbilled = self.borrow(returned_days_ago=400)
+
+    def borrow(self, returned_days_ago) -> Borrowing:
+        borrowing = Borrowing.objects.create(
+            book=self.book,
+            user=self.user,
+            expected_return_date=self.today + timedelta(days=14),
+        )
+        if returned_days_ago is not None:
+            returned = self.today - timedelta(days=returned_days_ago)
+            Borrowing.objects.filter(pk=borrowing.pk).update(
+                borrow_date=returned - timedelta(days=7),
+                expected_return_date=returned,
+                actual_return_date=returned,
+            )
+            borrowing.refresh_from_db()
+        return borrowing
+
+    def archive(self, **kwargs) -> int:
+        return archive_borrowings(self.today - timedelta(days=365), **kwargs)
+
+    def test_archives_old_billed_borrowings_only(self):
+        batches = []
+        self.assertEqual(self.archive(batch_size=2, on_batch=batches.append), 3)
+
+        self.assertEqual(batches, [2, 1])
+        self.assertEqual(
+            set(BorrowingArchive.objects.values_list("pk", flat=True)),
+            {borrowing.pk for borrowing in self.old},
+        )
+        self.assertEqual(
+            set(Borrowing.objects.values_list("pk", flat=True)),
+            {self.recent.pk, self.active.pk, self.unbilled.pk},
+        )
+        archived = BorrowingArchive.objects.get(pk=self.old[0].pk)
+        self.assertEqual(archived.borrow_date, self.old[0].borrow_date)
+        self.assertEqual(archived.actual_return_date, self.old[0].actual_return_date)
+        self.assertEqual(archived.updated_at, self.old[0].updated_at)
+        # Payments of archived borrowings are kept.
+        self.assertEqual(
+            Payment.objects.filter(borrowing_id=self.old[0].pk).count(), 1
+        )
+
+    def test_rerun_is_a_no_op(self):
+        self.archive()
+        with self.assertNumQueries(3):
+            self.assertEqual(self.archive(), 0)
+        self.assertEqual(BorrowingArchive.objects.count(), 3)
+
+    def test_command(self):
+        out = StringIO()
+        call_command(
+            "archive_borrowings", "--days", "365", "--batch-size", "2", stdout=out
+        )
+        self.assertIn("Archived 3 borrowings returned before", out.getvalue())
+
+    def test_lists_read_across_live_and_archive(self):
+        self.archive()
+        self.client.force_authenticate(self.user)
+        every = {borrowing.pk for borrowing in (
+            *self.old, self.recent, self.active, self.unbilled
+        )}
+
+        res = self.client.get(LIST_URL)
+        self.assertEqual(
+            {row["id"] for row in res.data["results"]},
+            {self.recent.pk, self.active.pk, self.unbilled.pk},
+        )
+
+        res = self.client.get(LIST_URL, {"is_active": "false"})
+        self.assertEqual(
+            {row["id"] for row in res.data["results"]}, every - {self.active.pk}
+        )
+        self.assertEqual(res.data["results"][-1]["book"], "Old Book")
+
+        res = self.client.get(LIST_URL, {"is_active": "true"})
+        self.assertEqual([row["id"] for row in res.data["results"]], [self.active.pk])
+
+        res = self.client.get(USER_BORROWINGS_URL, {"is_active": "false"})
+        self.assertEqual(len(res.data["results"]), 5)
+
+        res = self.client.get(USER_BORROWINGS_URL)
+        self.assertEqual({row["id"] for row in res.data["results"]}, every)
+
+    def test_only_history_reads_use_the_view(self):
+        self.client.force_authenticate(self.user)
+        for params, history in (
+            ({}, False),
+            ({"is_active": "true"}, False),
+            ({"is_active": "false"}, True),
+        ):
+            with self.subTest(params=params), CaptureQueriesContext(
+                connection
+            ) as queries:
+                self.client.get(LIST_URL, params)
+            self.assertEqual(
+                any("borrowinghistory" in query["sql"] for query in queries),
+                history,
+            )
+
+    def test_archives_zero_fee_borrowings(self):
+        Book.objects.filter(pk=self.book.pk).update(daily_fee=Decimal("0.00"))
+        free = self.borrow(returned_days_ago=400)
+        bill_borrowings()
+
+        self.assertEqual(self.archive(), 5)
+        self.assertTrue(BorrowingArchive.objects.filter(pk=free.pk).exists())
+
+    def test_retrieve_and_return_archived_borrowing(self):
+        self.archive()
+        self.client.force_authenticate(self.admin)
+        pk = self.old[0].pk
+
+        res = self.client.get(reverse("borrowings:borrowings-detail", args=[pk]))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["book"]["title"], "Old Book")
+        self.assertEqual(res.data["user"]["email"], "user@example.com")
+
+        res = self.client.get(
+            reverse("borrowings:borrowings-async-detail", args=[pk]),
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.admin)}",
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()["id"], pk)
+
+        res = self.client.post(
+            reverse("borrowings:borrowings-return-borrowing", args=[pk])
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_return_reports_archived_as_already_returned(self):
+        self.archive()
+        self.client.force_authenticate(self.admin)
+
+        res = self.client.post(
+            reverse("borrowings:borrowings-bulk-return"),
+            {"borrowings": [self.old[0].pk, self.active.pk, 999999]},
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["returned"], [self.active.pk])
+        self.assertEqual(res.data["already_returned"], [self.old[0].pk])
+        self.assertEqual(res.data["not_found"], [999999])
+
+    def test_counter_rebuild_counts_archived_borrowings(self):
+        Book.objects.filter(pk=self.book.pk).update(
+            total_borrowings=0, active_borrowings=0
+        )
+        self.archive()
+        call_command("rebuild_book_counters", stdout=StringIO())
+
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.total_borrowings, 6)
+        self.assertEqual(self.book.active_borrowings, 1)
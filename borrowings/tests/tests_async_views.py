@@ -0,0 +1,106 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from books.models import Book
+from borrowings.models import Borrowing
+
+ASYNC_BORROWINGS_URL = reverse("borrowings:borrowings-async-list")
+
+
+def auth(user) -> dict:
+    return {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}"}
+
+
+class BorrowingAsyncViewTests(TestCase):
+    """The async borrowing endpoints must answer like the sync ones."""
+
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            email="user@example.com", password="password_user"
+        )
+        self.other = User.objects.create_user(
+            email="other@example.com", password="password_other"
+        )
+        self.admin = User.objects.create_superuser(
+            email="admin@example.com", password="password_admin"
+        )
+        book = Book.objects.create(
+            title="Book", author="Author", inventory=10, daily_fee=Decimal("1.00")
+        )
+        due = timezone.now().date() + timedelta(days=7)
+        self.borrowings = [
+            Borrowing.objects.create(book=book, user=user, expected_return_date=due)
+            for user in (self.user, self.user, self.other)
+        ]
+
+    def test_list_matches_sync_list(self):
+        for user, params in (
+            (self.user, {}),
+            (self.admin, {}),
+            (self.admin, {"user_id": self.other.id, "is_active": "true"}),
+        ):
+            with self.subTest(user=user.email, params=params):
+                sync = self.client.get(
+                    reverse("borrowings:borrowings-list"), params, **auth(user)
+                ).json()
+                res = self.client.get(ASYNC_BORROWINGS_URL, params, **auth(user))
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+                self.assertEqual(res.json()["results"], sync["results"])
+
+    def test_retrieve_is_scoped_to_user(self):
+        own, _, others = self.borrowings
+        res = self.client.get(
+            reverse("borrowings:borrowings-async-detail", args=[own.id]),
+            **auth(self.user),
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()["book"]["title"], "Book")
+        self.assertEqual(res.json()["user"]["email"], "user@example.com")
+
+        res = self.client.get(
+            reverse("borrowings:borrowings-async-detail", args=[others.id]),
+            **auth(self.user),
+        )
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_conditional_get(self):
+        own = self.borrowings[0]
+        for url in (
+            ASYNC_BORROWINGS_URL,
+            reverse("borrowings:borrowings-async-detail", args=[own.id]),
+        ):
+            with self.subTest(url=url):
+                res = self.client.get(url, **auth(self.user))
+                etag = res["ETag"]
+                res = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **auth(self.user))
+                self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+                # Another user's copy is a different representation.
+                res = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **auth(self.admin))
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_authentication_is_required(self):
+        self.assertEqual(
+            self.client.get(ASYNC_BORROWINGS_URL).status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+        res = self.client.get(
+            ASYNC_BORROWINGS_URL, HTTP_AUTHORIZATION="Bearer not-a-token"
+        )
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_inactive_user_is_rejected(self):
+        token = auth(self.user)
+        self.user.is_active = False
+        self.user.save()
+        res = self.client.get(ASYNC_BORROWINGS_URL, **token)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,127 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.models import Borrowing
+
+BATCH_URL = reverse("borrowings:borrowings-batch-checkout")
+
+
+class BatchCheckoutTests(TestCase):
+    """Tests for checking out several books in one request."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com", password="password_user"
+        )
+        self.client.force_authenticate(self.user)
+        self.due = timezone.now().date() + timedelta(days=7)
+        self.books = Book.objects.bulk_create(
+            Book(
+                title=f"Book {i}",
+                author="Author",
+                inventory=2,
+                daily_fee=Decimal("1.00"),
+            )
+            for i in range(5)
+        )
+        self.sold_out = Book.objects.create(
+            title="Sold Out", author="Author", inventory=0, daily_fee=Decimal("1.00")
+        )
+
+    def items(self, *books) -> list:
+        return [
+            {"book": book.id, "expected_return_date": self.due} for book in books
+        ]
+
+    def test_batch_checkout(self):
+        books = [*self.books, self.books[0]]
+        res = self.client.post(BATCH_URL, {"items": self.items(*books)}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data["created"]), 6)
+        self.assertEqual(res.data["failed"], [])
+        self.assertEqual(
+            Borrowing.objects.filter(user=self.user).count(), 6
+        )
+        first = Book.objects.get(pk=self.books[0].pk)
+        self.assertEqual(first.inventory, 0)
+        self.assertEqual(first.active_borrowings, 2)
+        self.assertEqual(Book.objects.get(pk=self.books[1].pk).inventory, 1)
+
+    def test_all_or_nothing(self):
+        items = self.items(self.books[0], self.sold_out)
+        items.append({"book": 999999, "expected_return_date": self.due})
+        res = self.client.post(BATCH_URL, {"items": items}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [(error["index"], error["book"]) for error in res.data["failed"]],
+            [(1, self.sold_out.id), (2, 999999)],
+        )
+        self.assertFalse(Borrowing.objects.exists())
+        self.assertEqual(Book.objects.get(pk=self.books[0].pk).inventory, 2)
+
+    def test_partial(self):
+        books = (self.books[0], self.books[0], self.books[0], self.sold_out)
+        res = self.client.post(
+            BATCH_URL, {"items": self.items(*books), "partial": True}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data["created"]), 2)
+        self.assertEqual([error["index"] for error in res.data["failed"]], [2, 3])
+        self.assertEqual(Book.objects.get(pk=self.books[0].pk).inventory, 0)
+
+    def test_invalid_items(self):
+        for items in (
+            [],
+            [{"book": self.books[0].id, "expected_return_date": timezone.now().date()}],
+            self.items(self.books[0]) * 51,
+        ):
+            with self.subTest(count=len(items)):
+                res = self.client.post(BATCH_URL, {"items": items}, format="json")
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Borrowing.objects.exists())
+
+    def test_query_count_is_independent_of_batch_size(self):
+        for books in (self.books[:1], self.books):
+            with self.subTest(items=len(books)):
+                # SAVEPOINT, books SELECT, UPDATE, INSERT, RELEASE.
+                with self.assertNumQueries(5):
+                    res = self.client.post(
+                        BATCH_URL, {"items": self.items(*books)}, format="json"
+                    )
+                self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_copies_taken_after_planning_roll_the_batch_back(self):
+        in_bulk = Book.objects.in_bulk
+
+        def in_bulk_then_concurrent_checkout(*args, **kwargs):
+            books = in_bulk(*args, **kwargs)
+            Book.objects.filter(pk=self.books[0].pk).update(inventory=0)
+            return books
+
+        with mock.patch.object(
+            Book.objects, "in_bulk", in_bulk_then_concurrent_checkout
+        ):
+            res = self.client.post(
+                BATCH_URL,
+                {"items": self.items(*self.books[:2]), "partial": True},
+                format="json",
+            )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Borrowing.objects.exists())
+        self.books[1].refresh_from_db()
+        self.assertEqual(self.books[1].inventory, 2)
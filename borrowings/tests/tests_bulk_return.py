@@ -0,0 +1,111 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.checkout import check_out
+from borrowings.models import Borrowing
+
+RETURN_URL = reverse("borrowings:borrowings-bulk-return")
+
+
+class BulkReturnTests(TestCase):
+    """Tests for returning many borrowings in one request."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_superuser(
+            email="admin@example.com", password="password_admin"
+        )
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com", password="password_user"
+        )
+        self.client.force_authenticate(self.admin)
+        due = timezone.now().date() + timedelta(days=7)
+        self.books = Book.objects.bulk_create(
+            Book(
+                title=f"Book {i}",
+                author="Author",
+                inventory=3,
+                daily_fee=Decimal("1.00"),
+            )
+            for i in range(3)
+        )
+        self.borrowings = [
+            check_out(book, self.user, due)
+            for book in (*self.books, self.books[0])
+        ]
+
+    def assertStock(self, book: Book, inventory: int, active: int):
+        book.refresh_from_db()
+        self.assertEqual(book.inventory, inventory)
+        self.assertEqual(book.active_borrowings, active)
+
+    def test_return_by_borrowing_ids(self):
+        self.borrowings[1].return_book()
+        ids = [borrowing.id for borrowing in self.borrowings]
+
+        res = self.client.post(
+            RETURN_URL, {"borrowings": [*ids, 999999]}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["returned"], sorted([ids[0], ids[2], ids[3]]))
+        self.assertEqual(res.data["already_returned"], [ids[1]])
+        self.assertEqual(res.data["not_found"], [999999])
+        self.assertFalse(
+            Borrowing.objects.filter(actual_return_date__isnull=True).exists()
+        )
+        self.assertStock(self.books[0], 3, 0)
+        self.assertStock(self.books[1], 3, 0)
+
+    def test_return_by_book_ids(self):
+        res = self.client.post(
+            RETURN_URL,
+            {"books": [self.books[0].id, self.books[1].id, self.books[1].id]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        # The oldest active borrowing of the first book is returned.
+        self.assertEqual(
+            res.data["returned"], [self.borrowings[0].id, self.borrowings[1].id]
+        )
+        self.assertEqual(res.data["not_borrowed"], [self.books[1].id])
+        self.assertStock(self.books[0], 2, 1)
+        self.assertStock(self.books[1], 3, 0)
+        self.assertStock(self.books[2], 2, 1)
+
+    def test_invalid_requests(self):
+        for data in ({}, {"books": []}, {"books": [1], "borrowings": [1]}):
+            with self.subTest(data=data):
+                res = self.client.post(RETURN_URL, data, format="json")
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_admin_only(self):
+        self.client.force_authenticate(self.user)
+        res = self.client.post(
+            RETURN_URL, {"borrowings": [self.borrowings[0].id]}, format="json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_query_count_is_independent_of_batch_size(self):
+        for borrowings in (self.borrowings[:1], self.borrowings[1:]):
+            with self.subTest(items=len(borrowings)):
+                # SAVEPOINT, borrowings SELECT, two UPDATEs, billing
+                # SELECT and INSERT (in its own savepoint), RELEASE.
+                with self.assertNumQueries(9):
+                    res = self.client.post(
+                        RETURN_URL,
+                        {"borrowings": [borrowing.id for borrowing in borrowings]},
+                        format="json",
+                    )
+                self.assertEqual(len(res.data["returned"]), len(borrowings))
@@ -0,0 +1,67 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.checkout import BookUnavailable, check_out
+from borrowings.models import Borrowing
+
+
+class CheckoutTests(TestCase):
+    """
+    Checkout and return must stay correct when the in-memory objects
+    are stale, i.e. another request changed the rows meanwhile.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com", password="password_user"
+        )
+        self.book = Book.objects.create(
+            title="Hot Book", author="Author", inventory=1, daily_fee=Decimal("1.00")
+        )
+        self.due = timezone.now().date() + timedelta(days=7)
+
+    def test_last_copy_is_not_oversold(self):
+        stale = Book.objects.get(pk=self.book.pk)
+
+        check_out(self.book, self.user, self.due)
+        with self.assertRaises(BookUnavailable):
+            check_out(stale, self.user, self.due)
+
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 0)
+        self.assertEqual(self.book.active_borrowings, 1)
+        self.assertEqual(Borrowing.objects.count(), 1)
+
+    def test_api_reports_unavailable_book(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        url = reverse("borrowings:borrowings-list")
+        data = {"book": self.book.id, "expected_return_date": self.due}
+
+        self.assertEqual(client.post(url, data).status_code, status.HTTP_201_CREATED)
+        res = client.post(url, data)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Borrowing.objects.count(), 1)
+
+    def test_concurrent_returns_restock_once(self):
+        borrowing = check_out(self.book, self.user, self.due)
+        stale = Borrowing.objects.get(pk=borrowing.pk)
+
+        borrowing.return_book()
+        with self.assertRaises(ValidationError):
+            stale.return_book()
+
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 1)
+        self.assertEqual(self.book.active_borrowings, 0)
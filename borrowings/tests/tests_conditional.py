@@ -0,0 +1,124 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.checkout import check_out_batch
+from borrowings.models import Borrowing
+
+User = get_user_model()
+
+
+class ConditionalGetTests(TestCase):
+    """Tests for ETag/Last-Modified handling on borrowings and books."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="user@example.com", password="password_user"
+        )
+        self.book = Book.objects.create(
+            title="Test Book", author="Test Author", inventory=3, daily_fee=2.00
+        )
+        self.borrowing = Borrowing.objects.create(
+            user=self.user,
+            book=self.book,
+            expected_return_date=timezone.now().date() + timezone.timedelta(days=5),
+        )
+        self.url_list = reverse("borrowings:borrowings-list")
+        self.url_detail = reverse(
+            "borrowings:borrowings-detail", args=[self.borrowing.pk]
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_not_modified(self):
+        res = self.client.get(self.url_list)
+        etag = res["ETag"]
+
+        # The list version lookup alone decides the 304.
+        with self.assertNumQueries(1):
+            res = self.client.get(self.url_list, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+
+    def test_list_etag_changes_on_return(self):
+        etag = self.client.get(self.url_list)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.borrowing.return_book()
+
+        res = self.client.get(self.url_list, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+
+    def test_list_etag_changes_on_book_rename(self):
+        etag = self.client.get(self.url_list)["ETag"]
+        self.book.title = "Renamed Book"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.book.save()
+
+        res = self.client.get(self.url_list, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"][0]["book"], "Renamed Book")
+
+    def test_list_etag_changes_on_batch_checkout(self):
+        etag = self.client.get(self.url_list)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            check_out_batch(self.user, [{
+                "book": self.book.pk,
+                "expected_return_date": timezone.now().date() + timezone.timedelta(days=3),
+            }])
+
+        res = self.client.get(self.url_list, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 2)
+
+    def test_detail_if_modified_since(self):
+        res = self.client.get(self.url_detail)
+        last_modified = res["Last-Modified"]
+
+        res = self.client.get(
+            self.url_detail, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_etag_is_per_user(self):
+        etag = self.client.get(self.url_list)["ETag"]
+        other = User.objects.create_user(
+            email="other@example.com", password="password_other"
+        )
+        self.client.force_authenticate(user=other)
+
+        res = self.client.get(self.url_list, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_book_detail_not_modified(self):
+        url = reverse("books:book-detail", args=[self.book.id])
+        etag = self.client.get(url)["ETag"]
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.book.inventory = 10
+        self.book.save()
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["inventory"], 10)
+
+    def test_detail_etag_follows_the_nested_book(self):
+        etag = self.client.get(self.url_detail)["ETag"]
+        other = User.objects.create_user(
+            email="other@example.com", password="password_other"
+        )
+        self.client.force_authenticate(user=other)
+        self.client.post(self.url_list, {
+            "book": self.book.pk,
+            "expected_return_date": timezone.now().date() + timezone.timedelta(days=2),
+        })
+
+        self.client.force_authenticate(user=self.user)
+        res = self.client.get(self.url_detail, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["book"]["inventory"], 2)
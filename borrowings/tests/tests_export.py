@@ -0,0 +1,79 @@
+import csv
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.models import Borrowing
+
+User = get_user_model()
+
+
+class ExportTests(TestCase):
+    """Tests for the streaming book and borrowing exports."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="user@example.com", password="password_user"
+        )
+        self.admin = User.objects.create_superuser(
+            email="admin@example.com", password="password_admin"
+        )
+        self.book = Book.objects.create(
+            title="Book, with comma", author="Author", inventory=3, daily_fee=2.00
+        )
+        for _ in range(3):
+            Borrowing.objects.create(
+                user=self.user,
+                book=self.book,
+                expected_return_date=timezone.now().date() + timezone.timedelta(days=5),
+            )
+        self.client.force_authenticate(user=self.admin)
+
+    @staticmethod
+    def content(response) -> str:
+        return b"".join(response.streaming_content).decode()
+
+    def test_export_borrowings_csv(self):
+        url = reverse("borrowings:borrowings-export")
+        with self.assertNumQueries(1):
+            res = self.client.get(url)
+            rows = list(csv.reader(io.StringIO(self.content(res))))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res["Content-Type"].startswith("text/csv"))
+        self.assertEqual(rows[0][-2:], ["user_id", "user_email"])
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[1][5], "Book, with comma")
+        self.assertEqual(rows[1][7], "user@example.com")
+
+    def test_export_borrowings_ndjson_with_filter(self):
+        Borrowing.objects.filter(
+            id=Borrowing.objects.first().id
+        ).update(actual_return_date=timezone.now().date())
+        url = reverse("borrowings:borrowings-export")
+        res = self.client.get(url, {"format": "ndjson", "is_active": "true"})
+
+        lines = self.content(res).splitlines()
+        self.assertEqual(len(lines), 2)
+        row = json.loads(lines[0])
+        self.assertIsNone(row["actual_return_date"])
+        self.assertEqual(row["book_id"], self.book.id)
+
+    def test_export_books(self):
+        res = self.client.get(reverse("books:book-export"), {"format": "ndjson"})
+        row = json.loads(self.content(res))
+        self.assertEqual(row["title"], "Book, with comma")
+        self.assertEqual(row["daily_fee"], "2.00")
+
+    def test_export_requires_admin(self):
+        self.client.force_authenticate(user=self.user)
+        res = self.client.get(reverse("borrowings:borrowings-export"))
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
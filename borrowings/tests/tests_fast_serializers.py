@@ -0,0 +1,73 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from books.models import Book
+from books.serializers import BookSerializer
+from borrowings.models import Borrowing
+from borrowings.serializers import (
+    BorrowingDetailSerializer,
+    BorrowingListSerializer,
+)
+from library_service_project.serialization import compile_serializer
+
+User = get_user_model()
+
+
+class FastSerializerTests(TestCase):
+    """The compiled list path must render exactly what DRF would."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="user@example.com", password="password_user"
+        )
+        self.client.force_authenticate(user=self.user)
+        today = timezone.now().date()
+        self.books = [
+            Book.objects.create(
+                title="Ünïcode “quoted”   title",
+                author="Author",
+                cover="SOFT",
+                inventory=0,
+                daily_fee=Decimal("0.5"),
+            ),
+            Book.objects.create(
+                title="Plain", author="Author", inventory=7, daily_fee=Decimal("12.30")
+            ),
+        ]
+        for book in self.books:
+            Borrowing.objects.create(
+                user=self.user,
+                book=book,
+                expected_return_date=today + timezone.timedelta(days=3),
+            )
+        Borrowing.objects.filter(book=self.books[0]).update(actual_return_date=today)
+
+    def assertSameJSON(self, results, expected):
+        renderer = JSONRenderer()
+        self.assertEqual(renderer.render(results), renderer.render(expected))
+
+    def test_book_list_matches_serializer(self):
+        res = self.client.get(reverse("books:book-list"))
+        books = Book.objects.order_by("title", "author", "id")
+        self.assertSameJSON(
+            res.data["results"], BookSerializer(books, many=True).data
+        )
+
+    def test_borrowing_list_matches_serializer(self):
+        res = self.client.get(reverse("borrowings:borrowings-list"))
+        borrowings = Borrowing.objects.order_by("-borrow_date", "-id")
+        self.assertSameJSON(
+            res.data["results"],
+            BorrowingListSerializer(borrowings, many=True).data,
+        )
+
+    def test_nested_serializers_are_not_compiled(self):
+        with self.assertRaises(TypeError):
+            compile_serializer(BorrowingDetailSerializer)
@@ -0,0 +1,64 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from borrowings.models import Borrowing
+
+
+@skipUnless(connection.vendor == "sqlite", "Query plans are SQLite specific.")
+class ActiveBorrowingIndexTests(TestCase):
+    """The active-loan queries must be served by the partial indexes."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com", password="password_user"
+        )
+
+    def assertUsesIndex(self, queryset, index: str):
+        self.assertIn(f"USING INDEX {index}", queryset.explain())
+
+    def test_active_per_user(self):
+        self.assertUsesIndex(
+            Borrowing.objects.filter(user=self.user, actual_return_date__isnull=True)
+            .order_by("-borrow_date", "-id"),
+            "borrowing_active_user_idx",
+        )
+
+    def test_active_per_book(self):
+        self.assertUsesIndex(
+            Borrowing.objects.filter(book_id=1, actual_return_date__isnull=True)
+            .order_by("borrow_date", "id"),
+            "borrowing_active_book_idx",
+        )
+
+    def test_active_due(self):
+        self.assertUsesIndex(
+            Borrowing.objects.filter(
+                actual_return_date__isnull=True,
+                expected_return_date__lt=timezone.now().date() + timedelta(days=1),
+            ).order_by("expected_return_date", "id"),
+            "borrowing_active_due_idx",
+        )
+
+    def test_overdue_list(self):
+        self.assertUsesIndex(
+            Borrowing.objects.filter(
+                actual_return_date__isnull=True, overdue_since__isnull=False
+            ).order_by("overdue_since", "id"),
+            "borrowing_overdue_idx",
+        )
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command(
+            "bench_borrowing_queries", "--rows", "200", "--repeat", "1", stdout=out
+        )
+        self.assertIn("user: own active", out.getvalue())
+        self.assertIn("borrowing_active_user_idx", out.getvalue())
+        self.assertFalse(Borrowing.objects.exists())
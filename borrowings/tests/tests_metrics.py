@@ -0,0 +1,204 @@
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.checkout import check_out
+from library_service_project.metrics import (
+    BUCKETS,
+    QUERIES,
+    REQUESTS,
+    Measure,
+    Registry,
+    SQLiteMetricsStore,
+    registry,
+)
+
+METRICS_URL = reverse("metrics")
+BORROWINGS_URL = reverse("borrowings:borrowings-list")
+
+
+def samples(text: str) -> dict:
+    """`{series: value}` of a Prometheus text exposition."""
+    return {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+        for line in text.splitlines()
+        if line and not line.startswith("#")
+    }
+
+
+class MetricsTests(TestCase):
+    """Tests for the metrics middleware and `/api/metrics/`."""
+
+    def setUp(self):
+        cache.clear()
+        registry.clear()
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_superuser(
+            email="admin@example.com", password="password_admin"
+        )
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com", password="password_user"
+        )
+        book = Book.objects.create(
+            title="Dune", author="Frank Herbert", inventory=5, daily_fee=Decimal("1.00")
+        )
+        self.borrowing = check_out(
+            book, self.user, timezone.localdate() + timedelta(days=7)
+        )
+
+    def scrape(self) -> dict:
+        self.client.force_authenticate(self.admin)
+        res = self.client.get(METRICS_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res["Content-Type"].startswith("text/plain; version=0.0.4"))
+        return samples(res.content.decode())
+
+    def test_records_per_view_and_method(self):
+        self.client.force_authenticate(self.user)
+        for _ in range(2):
+            self.client.get(BORROWINGS_URL)
+        self.client.force_authenticate(self.admin)
+        self.client.post(
+            reverse("borrowings:borrowings-return-borrowing", args=[self.borrowing.pk])
+        )
+
+        metrics = self.scrape()
+        labels = 'view="borrowing:borrowings-list",method="GET"'
+        self.assertEqual(metrics[f"library_http_requests_total{{{labels}}}"], 2)
+        self.assertGreater(metrics[f"library_db_queries_total{{{labels}}}"], 0)
+        self.assertGreater(
+            metrics[f"library_db_query_duration_seconds_total{{{labels}}}"], 0
+        )
+        self.assertGreater(
+            metrics[f"library_serializer_duration_seconds_total{{{labels}}}"], 0
+        )
+        histogram = "library_http_request_duration_seconds"
+        self.assertEqual(metrics[f'{histogram}_bucket{{{labels},le="+Inf"}}'], 2)
+        self.assertEqual(metrics[f"{histogram}_count{{{labels}}}"], 2)
+
+        labels = 'view="borrowing:borrowings-return-borrowing",method="POST"'
+        self.assertEqual(metrics[f"library_http_requests_total{{{labels}}}"], 1)
+
+    def test_detail_rendering_is_timed_as_serialization(self):
+        self.client.force_authenticate(self.user)
+        self.client.get(
+            reverse("borrowings:borrowings-detail", args=[self.borrowing.pk])
+        )
+
+        labels = 'view="borrowing:borrowings-detail",method="GET"'
+        self.assertGreater(
+            self.scrape()[f"library_serializer_duration_seconds_total{{{labels}}}"],
+            0,
+        )
+
+    def test_unmatched_urls_share_one_series(self):
+        self.client.get("/api/nothing-here/")
+        self.client.get("/api/nothing-either/")
+        metrics = self.scrape()
+        self.assertEqual(
+            metrics['library_http_requests_total{view="unmatched",method="GET"}'], 2
+        )
+
+    def test_scrape_merges_the_host_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            location = os.path.join(directory, "metrics.sqlite3")
+            # Another worker of the host that served two requests.
+            other = Registry()
+            for _ in range(2):
+                other.record(("borrowing:borrowings-list", "GET"), 0.01, Measure())
+            SQLiteMetricsStore(location).flush(other)
+
+            with override_settings(METRICS_LOCATION=location):
+                self.client.force_authenticate(self.user)
+                self.client.get(BORROWINGS_URL)
+                metrics = self.scrape()
+
+        labels = 'view="borrowing:borrowings-list",method="GET"'
+        self.assertEqual(metrics[f"library_http_requests_total{{{labels}}}"], 3)
+
+    def test_admin_only(self):
+        res = self.client.get(METRICS_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.force_authenticate(self.user)
+        res = self.client.get(METRICS_URL)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class RegistryTests(SimpleTestCase):
+
+    def test_merges_shards_of_live_and_finished_threads(self):
+        shards = Registry()
+        measure = Measure()
+        measure.queries = 3
+
+        def serve():
+            for duration in (0.001, 0.2):
+                shards.record(("books:book-list", "GET"), duration, measure)
+
+        thread = threading.Thread(target=serve)
+        thread.start()
+        thread.join()
+        serve()
+
+        for _ in range(2):
+            counters = shards.collect()[("books:book-list", "GET")]
+            self.assertEqual(counters[0], 2)
+            self.assertEqual(sum(counters[:len(BUCKETS) + 1]), 4)
+            self.assertEqual(counters[REQUESTS], 4)
+            self.assertEqual(counters[QUERIES], 12)
+        self.assertEqual(len(shards.shards), 1)
+
+
+class SQLiteMetricsStoreTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.location = os.path.join(directory.name, "metrics.sqlite3")
+
+    def worker(self, requests: int) -> tuple:
+        """A store and registry as one worker process would have them."""
+        shards = Registry()
+        for _ in range(requests):
+            shards.record(("books:book-list", "GET"), 0.01, Measure())
+        return SQLiteMetricsStore(self.location), shards
+
+    def requests(self, merged: dict) -> int:
+        return merged[("books:book-list", "GET")][REQUESTS]
+
+    def test_merges_workers(self):
+        first, first_shards = self.worker(2)
+        second, second_shards = self.worker(3)
+        first.flush(first_shards)
+
+        self.assertEqual(self.requests(second.collect(second_shards)), 5)
+        # Flushes replace a worker's totals, they don't add to them.
+        first.flush(first_shards)
+        self.assertEqual(self.requests(second.collect(second_shards)), 5)
+
+    def test_keeps_the_totals_of_exited_workers(self):
+        exited, exited_shards = self.worker(2)
+        exited.flush(exited_shards)
+        process = subprocess.Popen([sys.executable, "-c", "pass"])
+        process.wait()
+        exited.connection.execute("UPDATE metrics SET pid = ?", (process.pid,))
+
+        live, live_shards = self.worker(3)
+        for _ in range(2):
+            self.assertEqual(self.requests(live.collect(live_shards)), 5)
+        self.assertEqual(
+            live.connection.execute("SELECT COUNT(*) FROM metrics").fetchone(), (2,)
+        )
@@ -0,0 +1,100 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.models import Borrowing
+from borrowings.overdue import scan_overdue
+
+OVERDUE_URL = reverse("borrowings:borrowings-overdue")
+
+
+@override_settings(FINE_MULTIPLIER=2)
+class OverdueTests(TestCase):
+    """Tests for the overdue scan and the overdue list."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_superuser(
+            email="admin@example.com", password="password_admin"
+        )
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com", password="password_user"
+        )
+        self.book = Book.objects.create(
+            title="Late Book", author="Author", inventory=5, daily_fee=Decimal("1.50")
+        )
+        self.today = timezone.localdate()
+        self.late = self.borrow(days_late=3)
+        self.later = self.borrow(days_late=10)
+        self.returned = self.borrow(days_late=5, returned=True)
+        self.due_today = self.borrow(days_late=0)
+
+    def borrow(self, days_late: int, returned: bool = False) -> Borrowing:
+        borrowing = Borrowing.objects.create(
+            book=self.book,
+            user=self.user,
+            expected_return_date=self.today + timedelta(days=1),
+            actual_return_date=self.today if returned else None,
+        )
+        # `borrow_date` is set on insert; move the loan into the past.
+        Borrowing.objects.filter(pk=borrowing.pk).update(
+            borrow_date=self.today - timedelta(days=days_late + 14),
+            expected_return_date=self.today - timedelta(days=days_late),
+        )
+        borrowing.refresh_from_db()
+        return borrowing
+
+    def test_scan_marks_newly_overdue_only(self):
+        self.assertEqual(scan_overdue(chunk_size=1), 2)
+
+        self.late.refresh_from_db()
+        self.assertEqual(
+            self.late.overdue_since, self.late.expected_return_date + timedelta(days=1)
+        )
+        self.assertEqual(self.late.fine_rate, Decimal("3.00"))
+        self.returned.refresh_from_db()
+        self.assertIsNone(self.returned.overdue_since)
+        self.due_today.refresh_from_db()
+        self.assertIsNone(self.due_today.overdue_since)
+
+        # Nothing new: the next run has nothing to process.
+        with self.assertNumQueries(1):
+            self.assertEqual(scan_overdue(), 0)
+        self.assertEqual(scan_overdue(today=self.today + timedelta(days=1)), 1)
+
+    def test_command(self):
+        out = StringIO()
+        call_command("scan_overdue", "--chunk-size", "1", stdout=out)
+        self.assertIn("Marked 2 borrowings overdue.", out.getvalue())
+
+    def test_overdue_list(self):
+        scan_overdue()
+        self.client.force_authenticate(self.admin)
+
+        res = self.client.get(OVERDUE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row["id"] for row in res.data["results"]], [self.later.id, self.late.id]
+        )
+        later = res.data["results"][0]
+        self.assertEqual(later["book"], "Late Book")
+        self.assertEqual(later["days_overdue"], 10)
+        self.assertEqual(later["fine"], "30.00")
+
+    def test_overdue_list_is_admin_only(self):
+        self.client.force_authenticate(self.user)
+        self.assertEqual(
+            self.client.get(OVERDUE_URL).status_code, status.HTTP_403_FORBIDDEN
+        )
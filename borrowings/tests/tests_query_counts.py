@@ -0,0 +1,150 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.models import Borrowing
+
+User = get_user_model()
+
+ROW_COUNTS = (1, 100, 1000)
+
+
+class BorrowingQueryCountTests(TestCase):
+    """
+    Every borrowing action must run a fixed number of queries,
+    however many borrowings exist.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="user@example.com", password="password_user"
+        )
+        self.admin = User.objects.create_superuser(
+            email="admin@example.com", password="password_admin"
+        )
+
+    def seed(self, rows: int) -> list:
+        """Create `rows` active borrowings spread over users and books."""
+        users = [self.user] + User.objects.bulk_create(
+            User(email=f"patron-{i}@example.com", password="")
+            for i in range(9)
+        )
+        books = Book.objects.bulk_create(
+            Book(
+                title=f"Book {i}",
+                author="Author",
+                inventory=5,
+                daily_fee=Decimal("1.00"),
+            )
+            for i in range(10)
+        )
+        due = timezone.now().date() + timedelta(days=7)
+        return Borrowing.objects.bulk_create(
+            Borrowing(
+                user=users[i % len(users)],
+                book=books[i % len(books)],
+                expected_return_date=due,
+            )
+            for i in range(rows)
+        )
+
+    def assertQueriesPerRowCount(self, expected: int, request, user=None):
+        self.client.force_authenticate(user or self.user)
+        for rows in ROW_COUNTS:
+            with self.subTest(rows=rows), transaction.atomic():
+                borrowings = self.seed(rows)
+                with self.assertNumQueries(expected):
+                    res = request(borrowings)
+                    if res.streaming:
+                        b"".join(res.streaming_content)
+                self.assertLess(res.status_code, 400)
+                transaction.set_rollback(True)
+
+    def test_list(self):
+        url = reverse("borrowings:borrowings-list")
+        # The list version lookup, then the page.
+        self.assertQueriesPerRowCount(2, lambda _: self.client.get(url))
+        self.assertQueriesPerRowCount(
+            2, lambda _: self.client.get(url, {"page_size": 100})
+        )
+
+    def test_list_as_admin_filtered(self):
+        url = reverse("borrowings:borrowings-list")
+        self.assertQueriesPerRowCount(
+            2,
+            lambda _: self.client.get(
+                url, {"user_id": self.user.id, "is_active": "true"}
+            ),
+            user=self.admin,
+        )
+
+    def test_retrieve(self):
+        self.assertQueriesPerRowCount(
+            2,
+            lambda borrowings: self.client.get(
+                reverse("borrowings:borrowings-detail", args=[borrowings[0].id])
+            ),
+        )
+
+    def test_get_user_borrowings(self):
+        url = reverse("borrowings:borrowings-get-user-borrowings")
+        self.assertQueriesPerRowCount(1, lambda _: self.client.get(url))
+
+    def test_create(self):
+        def create(borrowings):
+            return self.client.post(
+                reverse("borrowings:borrowings-list"),
+                {
+                    "book": borrowings[0].book_id,
+                    "expected_return_date": timezone.now().date() + timedelta(days=3),
+                },
+            )
+
+        # Book lookup, then SAVEPOINT, counter UPDATE, INSERT, RELEASE.
+        self.assertQueriesPerRowCount(5, create)
+
+    def test_return_borrowing(self):
+        # Borrowing lookup, then SAVEPOINT, counter UPDATE, UPDATE,
+        # billing SELECT and INSERT (in its own savepoint), RELEASE.
+        self.assertQueriesPerRowCount(
+            9,
+            lambda borrowings: self.client.post(
+                reverse(
+                    "borrowings:borrowings-return-borrowing",
+                    args=[borrowings[0].id],
+                )
+            ),
+            user=self.admin,
+        )
+
+    def test_export(self):
+        url = reverse("borrowings:borrowings-export")
+        self.assertQueriesPerRowCount(
+            1, lambda _: self.client.get(url), user=self.admin
+        )
+
+    def test_get_user_borrowings_is_scoped_to_user(self):
+        self.client.force_authenticate(self.user)
+        other = User.objects.create_user(
+            email="other@example.com", password="password_other"
+        )
+        self.seed(3)
+        res = self.client.get(
+            reverse("borrowings:borrowings-get-user-borrowings"),
+            {"user_id": other.id},
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(
+            all(row["user"] == self.user.id for row in res.data["results"])
+        )
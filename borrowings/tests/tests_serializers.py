@@ -101,8 +101,8 @@ class BorrowingSerializerTests(TestCase):
         self.client.force_authenticate(user=self.user)
         response = self.client.get(self.url_list)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["id"], self.borrowing.id)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], self.borrowing.id)
 
     def test_borrowing_detail_serializer(self):
         """
@@ -148,4 +148,4 @@ class BorrowingSerializerTests(TestCase):
         self.client.force_authenticate(user=self.superuser)
         response = self.client.get(self.url_list)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
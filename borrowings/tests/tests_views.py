@@ -69,7 +69,7 @@ class BorrowingViewSetTest(TestCase):
         response = self.client.get(self.url_list)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.json()), 1)
+        self.assertEqual(len(response.json()["results"]), 1)
 
     def test_retrieve_borrowing(self):
         """
@@ -2,11 +2,21 @@ from django.urls import path, include
 from rest_framework import routers
 
 
-from borrowings.views import BorrowingViewSet
+from borrowings.views import BorrowingAsyncView, BorrowingViewSet
 
 router = routers.DefaultRouter()
 router.register("", BorrowingViewSet, basename="borrowings")
 
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [
+    path(
+        "async/", BorrowingAsyncView.as_view(), name="borrowings-async-list"
+    ),
+    path(
+        "async/<int:pk>/",
+        BorrowingAsyncView.as_view(),
+        name="borrowings-async-detail",
+    ),
+    path("", include(router.urls)),
+]
 
 app_name = "borrowings"
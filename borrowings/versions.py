@@ -0,0 +1,63 @@
+"""
+Version of the borrowing lists, for their ETags.
+
+A list validator has to cost less than the list: a `Max`/`Count`
+aggregate scans the whole filtered set (and the archive too for
+history reads), and a digest of the page costs the page. Instead every
+write that can change what a borrowing list shows bumps one counter
+row, and a conditional list request reads it by primary key; with the
+request's URL and user in the ETag, that one value validates every
+list. A write bumps it for all lists, which only costs the clients of
+the other lists one full response.
+
+The bump runs once the writing transaction commits, so no writer holds
+the counter's row lock longer than its one UPDATE. Bumped by:
+
+- saves of borrowings, returns (`borrowings_returned`), and the bulk
+  paths that skip both: batch checkouts, archiving and deletes;
+- saves and deletes of books and users, whose titles and emails the
+  lists show and whose deletes cascade to their borrowings.
+"""
+from django.db import transaction
+from django.db.models import F
+
+from borrowings.models import BorrowingListVersion
+
+LIST_VERSION = "borrowings"
+
+
+def get_list_version() -> int:
+    return (
+        BorrowingListVersion.objects.filter(pk=LIST_VERSION)
+        .values_list("version", flat=True)
+        .first()
+    ) or 0
+
+
+async def aget_list_version() -> int:
+    return await (
+        BorrowingListVersion.objects.filter(pk=LIST_VERSION)
+        .values_list("version", flat=True)
+        .afirst()
+    ) or 0
+
+
+def bump_list_version() -> None:
+    """Bump the list version once the current transaction commits."""
+    transaction.on_commit(_bump)
+
+
+def _bump() -> None:
+    bumped = BorrowingListVersion.objects.filter(pk=LIST_VERSION).update(
+        version=F("version") + 1
+    )
+    if not bumped:
+        BorrowingListVersion.objects.bulk_create(
+            [BorrowingListVersion(name=LIST_VERSION, version=1)],
+            ignore_conflicts=True,
+        )
+
+
+def bump_on_change(sender, **kwargs) -> None:
+    """Receiver bumping the list version for any signal it's connected to."""
+    bump_list_version()
@@ -1,8 +1,15 @@
+from datetime import date
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404
+from django.utils import timezone
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAdminUser
 from rest_framework.request import Request
 from rest_framework.decorators import action
 
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import (
     extend_schema,
     OpenApiResponse,
@@ -12,28 +19,82 @@ from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.serializers import ModelSerializer
 
-from borrowings.models import Borrowing
+from borrowings import versions
+from borrowings.checkout import (
+    BatchCheckoutError,
+    BookUnavailable,
+    check_out_batch,
+    return_batch,
+)
+from borrowings.models import Borrowing, BorrowingArchive, BorrowingHistory
+from borrowings.overdue import accrued_fine
+from borrowings.pagination import BorrowingPagination
 from borrowings.serializers import (
     BorrowingSerializer,
+    BorrowingBatchSerializer,
+    BorrowingBatchResultSerializer,
+    BorrowingBulkReturnSerializer,
+    BorrowingBulkReturnResultSerializer,
     BorrowingListSerializer,
+    BorrowingOverdueSerializer,
     BorrowingDetailSerializer,
     BorrowingReturnSerializer
 )
+from library_service_project.asynchronous import AsyncReadView
+from library_service_project.conditional import ConditionalGetMixin
+from library_service_project.exports import (
+    CSVRenderer,
+    NDJSONRenderer,
+    export_response,
+)
+from library_service_project.metrics import SerializationMetricsMixin
+from library_service_project.serialization import FastListMixin
 
 
-class BorrowingViewSet(viewsets.ModelViewSet):
+class BorrowingViewSet(
+    SerializationMetricsMixin,
+    FastListMixin,
+    ConditionalGetMixin,
+    viewsets.ModelViewSet,
+):
     """
         ViewSet for managing borrowings.
 
         - Admin users can view all borrowings.
         - Regular users can only see their own borrowings.
         - Borrowings can be filtered by user ID and active status.
-        - Provides an endpoint for returning a borrowed item (admin only).
+        - Provides an endpoint for returning a borrowed item, and one for
+          returning many at once (admin only).
+        - Several books can be checked out at once via `batch/`.
+        - Lists are cursor paginated, newest borrowings first, and rendered
+          through the compiled read-only form of `BorrowingListSerializer`.
+        - List and detail reads carry ETag validators (details also
+          Last-Modified); conditional requests for unchanged data get a 304.
+        - Admins can stream the borrowing history as CSV/NDJSON.
+        - Admins can list overdue borrowings, as recorded by `scan_overdue`.
+        - History reads (`is_active=false`, a user's borrowings, exports)
+          also cover the borrowings moved to the archive by
+          `archive_borrowings`, and so does the detail of an archived one.
         """
 
     queryset = Borrowing.objects.all()
     serializer_class = BorrowingSerializer
     permission_classes = (IsAuthenticated,)
+    pagination_class = BorrowingPagination
+    etag_vary_on_user = True
+    history_actions = ("get_user_borrowings", "export")
+    read_history = False
+    export_chunk_size = 2000
+    export_fields = (
+        "id",
+        "borrow_date",
+        "expected_return_date",
+        "actual_return_date",
+        "book_id",
+        "book_title",
+        "user_id",
+        "user_email",
+    )
 
     def get_queryset(self):
         """
@@ -44,7 +105,8 @@ class BorrowingViewSet(viewsets.ModelViewSet):
         - Supports filtering by `user_id` (admin only).
         - Supports filtering by active status.
         """
-        queryset = Borrowing.objects.all() if self.request.user.is_staff else Borrowing.objects.filter(
+        model = self.get_borrowing_model()
+        queryset = model.objects.all() if self.request.user.is_staff else model.objects.filter(
             user=self.request.user)
 
         queryset = self.filter_by_active(queryset)
@@ -54,6 +116,33 @@ class BorrowingViewSet(viewsets.ModelViewSet):
             if user_id is not None:
                 queryset = queryset.filter(user_id=user_id)
 
+        return self.select_relations(queryset)
+
+    def get_borrowing_model(self):
+        """
+        Read from the live and archived borrowings only when history is
+        asked for: the `UNION ALL` view costs every other read a scan
+        of the archive too.
+        """
+        is_active = self.request.query_params.get("is_active", "").lower()
+        if self.read_history or (
+            is_active != "true"
+            and (self.action in self.history_actions or is_active == "false")
+        ):
+            return BorrowingHistory
+        return Borrowing
+
+    def select_relations(self, queryset):
+        """
+        Join in exactly the relations the current action reads.
+
+        List actions are served from `values()` rows, which join the
+        slug columns themselves, so they need nothing here.
+        """
+        if self.action in ("retrieve", "export"):
+            return queryset.select_related("book", "user")
+        if self.action == "return_borrowing":
+            return queryset.select_related("book")
         return queryset
 
     def get_serializer_class(self):
@@ -66,8 +155,71 @@ class BorrowingViewSet(viewsets.ModelViewSet):
             return BorrowingDetailSerializer
         elif self.action == "return_borrowing":
             return BorrowingReturnSerializer
+        elif self.action == "batch_checkout":
+            return BorrowingBatchSerializer
+        elif self.action == "bulk_return":
+            return BorrowingBulkReturnSerializer
+        elif self.action == "overdue":
+            return BorrowingOverdueSerializer
         return BorrowingSerializer
 
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        version = self.get_list_version(queryset)
+        not_modified = self.not_modified(version)
+        if not_modified is not None:
+            return not_modified
+        return self.set_validators(
+            Response(self.get_list_data(queryset)), version
+        )
+
+    def get_list_version(self, queryset) -> tuple:
+        """
+        Every list is validated by the borrowing list version (see
+        `borrowings.versions`), one primary key lookup: an aggregate
+        over the filtered set would cost far more than the keyset page.
+        """
+        return None, versions.get_list_version()
+
+    async def aget_list_version(self, queryset) -> tuple:
+        return None, await versions.aget_list_version()
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            pk = int(kwargs[self.lookup_field])
+        except ValueError:
+            return super().retrieve(request, *args, **kwargs)
+
+        version = self.get_object_version(self.get_queryset(), pk)
+        if version is None:
+            # Not live: it may have been archived.
+            self.read_history = True
+            version = self.get_object_version(self.get_queryset(), pk)
+        if version is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        not_modified = self.not_modified(version)
+        if not_modified is not None:
+            return not_modified
+
+        response = super().retrieve(request, *args, **kwargs)
+        return self.set_validators(response, version)
+
+    def object_version_query(self, queryset, pk):
+        """
+        The detail nests the book (inventory, counters) and the user,
+        so their changes are part of its version too.
+        """
+        return queryset.filter(pk=pk).values_list(
+            "updated_at", "book__updated_at", "user__email", "user__is_staff"
+        )
+
+    def object_version(self, row):
+        if row is None:
+            return None
+        updated_at, book_updated_at, *user = row
+        return max(updated_at, book_updated_at), updated_at, book_updated_at, *user
+
     def create(self, request, *args, **kwargs):
         """Creates a new borrowing instance.
 
@@ -95,6 +247,10 @@ class BorrowingViewSet(viewsets.ModelViewSet):
         """
         serializer.save(user=self.request.user)
 
+    def perform_destroy(self, instance) -> None:
+        super().perform_destroy(instance)
+        versions.bump_list_version()
+
     def filter_by_active(self, queryset):
         """
         Filter the borrowings queryset to only include active borrowings
@@ -131,14 +287,20 @@ class BorrowingViewSet(viewsets.ModelViewSet):
         """
         Returns a borrowed book.
 
-        - Checks if the book has already been returned.
+        - Checks if the book has already been returned (or archived).
         - If not, marks the borrowing as returned.
         - Increases the book's inventory count by 1.
         - Only accessible by admin users.
         """
-        borrowing = self.get_object()
+        try:
+            borrowing = self.get_object()
+        except Http404:
+            # Archived borrowings have been returned long ago.
+            if not (pk.isdigit() and BorrowingArchive.objects.filter(pk=pk).exists()):
+                raise
+            borrowing = None
 
-        if borrowing.actual_return_date is not None:
+        if borrowing is None or borrowing.actual_return_date is not None:
             return Response(
                 {"error": "This book has already been returned"},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -150,28 +312,204 @@ class BorrowingViewSet(viewsets.ModelViewSet):
         try:
             serializer.return_borrowing()
             return Response({"message": "The book was successfully returned"})
-        except ValidationError:
+        except (ValidationError, DjangoValidationError):
             return Response(
                 {"error": "This book has already been returned"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+    @extend_schema(
+        summary="Batch checkout",
+        description="Borrow several books in one request. By default the "
+                    "batch is all-or-nothing; with `partial` the available "
+                    "books are borrowed and the others listed in `failed`.",
+        request=BorrowingBatchSerializer,
+        responses={
+            201: BorrowingBatchResultSerializer,
+            400: BorrowingBatchResultSerializer,
+        },
+    )
+    @action(detail=False, methods=["POST"], url_path="batch")
+    def batch_checkout(self, request: Request) -> Response:
+        """
+        Checks out a list of `{book, expected_return_date}` items for the
+        current user.
+
+        - All books are fetched in one query and reserved with one UPDATE.
+        - All borrowings are created with one INSERT, in one transaction.
+        - Returns 201 if anything was borrowed, 400 otherwise.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            borrowings, failures = check_out_batch(
+                request.user,
+                serializer.validated_data["items"],
+                partial=serializer.validated_data["partial"],
+            )
+        except BatchCheckoutError as error:
+            borrowings, failures = [], error.failures
+        except BookUnavailable as error:
+            return Response(
+                {"error": error.messages[0]}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        data = BorrowingBatchResultSerializer(
+            {"created": borrowings, "failed": failures}
+        ).data
+        return Response(
+            data,
+            status=status.HTTP_201_CREATED if borrowings
+            else status.HTTP_400_BAD_REQUEST,
+        )
+
+    @extend_schema(
+        summary="Bulk return",
+        description="Mark many borrowings as returned, given their IDs "
+                    "(`borrowings`) or the IDs of the returned books "
+                    "(`books`, the oldest active borrowing of each). "
+                    "Already returned and unknown items are reported. "
+                    "This action is available only to admin users.",
+        request=BorrowingBulkReturnSerializer,
+        responses={200: BorrowingBulkReturnResultSerializer},
+    )
+    @action(
+        detail=False,
+        methods=["POST"],
+        url_path="return",
+        permission_classes=[IsAdminUser],
+    )
+    def bulk_return(self, request: Request) -> Response:
+        """
+        Returns many borrowed books in one transaction.
+
+        - Sets `actual_return_date` of all of them with one UPDATE.
+        - Increases each book's inventory by its number of returned
+          copies with one grouped UPDATE.
+        - Runs the same number of queries however many items are sent.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            result = return_batch(
+                borrowing_ids=serializer.validated_data.get("borrowings", ()),
+                book_ids=serializer.validated_data.get("books", ()),
+            )
+        except DjangoValidationError as error:
+            return Response(
+                {"error": error.messages[0]}, status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(BorrowingBulkReturnResultSerializer(result).data)
+
+    @extend_schema(
+        summary="Overdue borrowings",
+        description="List unreturned borrowings marked overdue by the "
+                    "`scan_overdue` job, longest overdue first, with the "
+                    "days overdue and the fine accrued so far. "
+                    "This action is available only to admin users.",
+        responses={200: BorrowingOverdueSerializer(many=True)},
+    )
+    @action(detail=False, methods=["GET"], permission_classes=[IsAdminUser])
+    def overdue(self, request: Request) -> Response:
+        """
+        Lists overdue borrowings from the precomputed overdue state.
+
+        Served by the partial index on overdue, unreturned borrowings,
+        so it never scans the borrowing history.
+        """
+        queryset = Borrowing.objects.filter(
+            actual_return_date__isnull=True, overdue_since__isnull=False
+        )
+        data = self.get_list_data(queryset)
+
+        today = timezone.localdate()
+        for borrowing in data["results"]:
+            days, fine = accrued_fine(
+                date.fromisoformat(borrowing["expected_return_date"]),
+                Decimal(borrowing["fine_rate"]),
+                today,
+            )
+            borrowing["days_overdue"] = days
+            borrowing["fine"] = str(fine)
+        return Response(data)
+
     @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated])
     def get_user_borrowings(self, request):
-        """Get borrowings by user ID and filter by active status."""
-        user_id = request.query_params.get("user_id")
-        is_active = request.query_params.get("is_active")
+        """
+        Get borrowings by user ID and filter by active status.
 
-        queryset = self.queryset.filter(user_id=user_id) if user_id else self.queryset
+        Filtering by `user_id` is applied for admin users only, regular
+        users always get their own borrowings.
+        """
+        return Response(self.get_list_data(self.get_queryset()))
 
-        if is_active is not None:
-            is_active = is_active.lower() == "true"
-            queryset = queryset.filter(actual_return_date__isnull=is_active)
+    @extend_schema(
+        summary="Export borrowings",
+        description="Stream the borrowing history as CSV (default) or "
+                    "NDJSON (`?format=ndjson`). Honours the `user_id` and "
+                    "`is_active` filters. "
+                    "This action is available only to admin users.",
+        responses={(200, "text/csv"): OpenApiTypes.STR,
+                   (200, "application/x-ndjson"): OpenApiTypes.STR},
+    )
+    @action(
+        detail=False,
+        methods=["GET"],
+        permission_classes=[IsAdminUser],
+        renderer_classes=[CSVRenderer, NDJSONRenderer],
+    )
+    def export(self, request: Request):
+        """
+        Streams borrowings with their book and user.
 
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+        Rows are read through a server-side cursor with the book and user
+        joined in, so memory stays flat regardless of the history size.
+        """
+        borrowings = (
+            self.filter_queryset(self.get_queryset())
+            .only(
+                "id",
+                "borrow_date",
+                "expected_return_date",
+                "actual_return_date",
+                "book__title",
+                "user__email",
+            )
+            .order_by("id")
+            .iterator(chunk_size=self.export_chunk_size)
+        )
+        rows = (
+            (
+                borrowing.id,
+                borrowing.borrow_date,
+                borrowing.expected_return_date,
+                borrowing.actual_return_date,
+                borrowing.book_id,
+                borrowing.book.title,
+                borrowing.user_id,
+                borrowing.user.email,
+            )
+            for borrowing in borrowings
+        )
+        return export_response(
+            request.accepted_renderer.format,
+            self.export_fields,
+            rows,
+            "borrowings",
+        )
 
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+
+class BorrowingAsyncView(AsyncReadView):
+    """Async-native borrowing list and retrieve, see `AsyncReadView`."""
+
+    viewset_class = BorrowingViewSet
+
+    async def aretrieve(self, viewset, pk):
+        try:
+            return await super().aretrieve(viewset, pk)
+        except Http404:
+            # Not live: it may have been archived.
+            viewset.read_history = True
+            return await super().aretrieve(viewset, pk)
@@ -0,0 +1,54 @@
+"""
+Gunicorn configuration, every value overridable from the environment.
+
+WSGI (default):
+    gunicorn -c gunicorn.conf.py library_service_project.wsgi
+ASGI, for the async read endpoints:
+    GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker \
+    gunicorn -c gunicorn.conf.py library_service_project.asgi
+"""
+import multiprocessing
+import os
+
+
+def env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+os.environ.setdefault("DJANGO_ENV", "prod")
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+
+# Workers are processes; threads serve requests concurrently inside a
+# worker (the "gthread" class). 2 x cores + 1 workers is gunicorn's usual
+# starting point; every worker thread may hold a database connection.
+workers = env_int("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1)
+threads = env_int("GUNICORN_THREADS", 1)
+worker_class = os.environ.get(
+    "GUNICORN_WORKER_CLASS", "gthread" if threads > 1 else "sync"
+)
+
+# Import the app once in the master, so workers fork with it loaded
+# (faster boot, shared memory pages).
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") == "1"
+
+# Graceful recycling: a worker is restarted after about `max_requests`
+# requests (jittered so they don't all restart at once), finishing the
+# requests in flight within `graceful_timeout`.
+max_requests = env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = env_int("GUNICORN_MAX_REQUESTS_JITTER", 100)
+graceful_timeout = env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+timeout = env_int("GUNICORN_TIMEOUT", 30)
+keepalive = env_int("GUNICORN_KEEPALIVE", 5)
+
+# Access logging costs every request; set GUNICORN_ACCESS_LOG=- for stdout.
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG") or None
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    # Database connections opened while preloading must not be shared
+    # between processes.
+    from django.db import connections
+
+    connections.close_all()
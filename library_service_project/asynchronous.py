@@ -0,0 +1,135 @@
+"""
+Async-native read endpoints.
+
+DRF views are synchronous, so under ASGI every request holds a worker
+thread for its whole database round trip. `AsyncReadView` serves the
+list and retrieve actions of a viewset as a plain async Django view:
+the viewset still builds the querysets, picks the serializer and
+paginates (nothing is duplicated), but the JWT user lookup and every
+query run through the async ORM (`aget`, `aiterator`). Cache reads
+and writes use the async cache API, and the throttle check runs in a
+worker thread.
+
+Requests go through the viewset's permissions and throttles, and
+answer with the same validators as the sync views (the viewset's
+`ConditionalGetMixin`): a current `If-None-Match` gets a 304. A view
+with a response cache overrides `alist`/`aretrieve` to read and fill
+it, see `books.views.BookAsyncView`. The endpoints are read-only;
+writes stay on the sync views.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import Http404
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import exception_handler
+
+from library_service_project.metrics import timed_serialization
+from users.authentication import CachedJWTAuthentication
+
+
+async def aauthenticate(request):
+    """
+    Async `CachedJWTAuthentication`: the token is checked in-process,
+    only the user is looked up, in the user cache and then with `aget`.
+    """
+    authentication = CachedJWTAuthentication()
+    header = authentication.get_header(request)
+    if header is None:
+        return AnonymousUser()
+    raw_token = authentication.get_raw_token(header)
+    if raw_token is None:
+        return AnonymousUser()
+
+    token = authentication.get_validated_token(raw_token)
+    return await authentication.aget_user(token)
+
+
+class AsyncReadView(View):
+    """Serves `viewset_class`'s list (no `pk`) and retrieve actions."""
+
+    viewset_class = None
+    http_method_names = ["get", "head", "options"]
+
+    async def get(self, request, pk=None):
+        drf_request = Request(request)
+        # As negotiated for JSON clients by the sync views, whose ETags
+        # include the media type.
+        drf_request.accepted_renderer = JSONRenderer()
+        drf_request.accepted_media_type = JSONRenderer.media_type
+        viewset = self.viewset_class(
+            request=drf_request,
+            args=(),
+            kwargs={} if pk is None else {"pk": pk},
+            action="list" if pk is None else "retrieve",
+            format_kwarg=None,
+        )
+        try:
+            drf_request.user = await aauthenticate(request)
+            self.check_permissions(viewset)
+            # Throttle stores may be a shared cache or a database file,
+            # so the check runs in a worker thread.
+            await sync_to_async(viewset.check_throttles)(drf_request)
+            if pk is None:
+                response = await self.alist(viewset)
+            else:
+                response = await self.aretrieve(viewset, pk)
+        except Exception as exc:
+            response = exception_handler(exc, {"view": viewset, "request": drf_request})
+            if response is None:
+                raise
+        return self.render(response)
+
+    @staticmethod
+    def check_permissions(viewset) -> None:
+        request = viewset.request
+        for permission in viewset.get_permissions():
+            if not permission.has_permission(request, viewset):
+                if request.user.is_authenticated:
+                    raise exceptions.PermissionDenied()
+                raise exceptions.NotAuthenticated()
+
+    async def alist(self, viewset) -> Response:
+        queryset = viewset.filter_queryset(viewset.get_queryset())
+        version = await viewset.aget_list_version(queryset)
+        not_modified = viewset.not_modified(version)
+        if not_modified is not None:
+            return not_modified
+        return viewset.set_validators(
+            Response(await viewset.aget_list_data(queryset)), version
+        )
+
+    async def aretrieve(self, viewset, pk) -> Response:
+        queryset = viewset.get_queryset()
+        version = await viewset.aget_object_version(queryset, pk)
+        if version is None:
+            raise Http404
+        not_modified = viewset.not_modified(version)
+        if not_modified is not None:
+            return not_modified
+        instance = await self.aget_object(queryset, pk)
+        return viewset.set_validators(
+            Response(viewset.get_serializer(instance).data), version
+        )
+
+    @staticmethod
+    async def aget_object(queryset, pk):
+        try:
+            return await queryset.aget(pk=pk)
+        except ObjectDoesNotExist:
+            raise Http404
+
+    @staticmethod
+    def render(response):
+        if not isinstance(response, Response):
+            # A 304, which has no body to render.
+            return response
+        response.accepted_renderer = JSONRenderer()
+        response.accepted_media_type = JSONRenderer.media_type
+        response.renderer_context = {}
+        with timed_serialization():
+            return response.render()
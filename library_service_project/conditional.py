@@ -0,0 +1,100 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.http import HttpResponseNotModified
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """
+    ETag/Last-Modified support for list and retrieve actions.
+
+    Validators are derived from a *version* tuple whose first item is
+    the last-modified time (or None): for a detail it's the row's
+    `updated_at`, for a list the `Max(updated_at)` and `Count` of the
+    filtered queryset, fetched in one aggregate query, unless the view
+    keeps a cheaper version of its own (`get_list_version`). Matching `If-None-Match`/`If-Modified-Since`
+    requests get a 304 without the body being rendered or sent.
+
+    The version lookups have `a`-prefixed async twins for the async
+    read views.
+    """
+
+    last_modified_field = "updated_at"
+    etag_vary_on_user = False
+
+    def get_list_version(self, queryset) -> tuple:
+        return self.list_version(
+            queryset.order_by().aggregate(**self.list_version_aggregates())
+        )
+
+    async def aget_list_version(self, queryset) -> tuple:
+        return self.list_version(
+            await queryset.order_by().aaggregate(**self.list_version_aggregates())
+        )
+
+    def list_version_aggregates(self) -> dict:
+        return {"last_modified": Max(self.last_modified_field), "count": Count("pk")}
+
+    @staticmethod
+    def list_version(stats: dict) -> tuple:
+        return stats["last_modified"], stats["count"]
+
+    def get_object_version(self, queryset, pk):
+        """Version of a single row, or None if it's not in `queryset`."""
+        return self.object_version(self.object_version_query(queryset, pk).first())
+
+    async def aget_object_version(self, queryset, pk):
+        return self.object_version(
+            await self.object_version_query(queryset, pk).afirst()
+        )
+
+    def object_version_query(self, queryset, pk):
+        return queryset.filter(pk=pk).values_list(self.last_modified_field)
+
+    def object_version(self, row):
+        """The version of an `object_version_query` row (None if missing)."""
+        return None if row is None else tuple(row)
+
+    def make_etag(self, version: tuple) -> str:
+        request = self.request
+        parts = [
+            request.get_full_path(),
+            getattr(request, "accepted_media_type", ""),
+            *(value.isoformat() if hasattr(value, "isoformat") else value
+              for value in version),
+        ]
+        if self.etag_vary_on_user:
+            parts.append(request.user.pk)
+        digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+        return f'"{digest}"'
+
+    def not_modified(self, version: tuple):
+        """Return a 304 response if the client's copy is still current."""
+        response = get_conditional_response(
+            self.request,
+            etag=self.make_etag(version),
+            last_modified=self.timestamp(version[0]),
+        )
+        if isinstance(response, HttpResponseNotModified):
+            return self.set_validators(response, version)
+        return None
+
+    def conditional_response(self, version: tuple, data):
+        """A 304 for a current client copy, else `data` with validators."""
+        not_modified = self.not_modified(version)
+        if not_modified is not None:
+            return not_modified
+        return self.set_validators(Response(data), version)
+
+    def set_validators(self, response, version: tuple):
+        response["ETag"] = self.make_etag(version)
+        if version[0] is not None:
+            response["Last-Modified"] = http_date(self.timestamp(version[0]))
+        return response
+
+    @staticmethod
+    def timestamp(last_modified):
+        return int(last_modified.timestamp()) if last_modified else None
@@ -0,0 +1,99 @@
+"""
+Streaming CSV / NDJSON exports.
+
+Rows are produced lazily (typically from `QuerySet.iterator()`) and
+written into ~64 KB chunks of a `StreamingHttpResponse`, so memory use
+stays flat no matter how many rows are exported.
+"""
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+
+CHUNK_SIZE = 64 * 1024
+
+
+class CSVRenderer(BaseRenderer):
+    """Selects CSV exports; renders non-streamed (error) payloads as CSV."""
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if not isinstance(data, dict):
+            data = {"detail": data}
+        return "".join(csv_lines([data.keys(), data.values()])).encode()
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Selects NDJSON exports; renders non-streamed payloads as one line."""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return (json.dumps(data, cls=DjangoJSONEncoder) + "\n").encode()
+
+
+class _Echo:
+    """File-like object for `csv.writer` that returns what is written."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    writer = csv.writer(_Echo())
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def ndjson_lines(header, rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(header, row))) + "\n"
+
+
+def chunked(lines, size: int = CHUNK_SIZE):
+    buffer, buffered = [], 0
+    for line in lines:
+        buffer.append(line)
+        buffered += len(line)
+        if buffered >= size:
+            yield "".join(buffer).encode("utf-8")
+            buffer, buffered = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def export_response(
+    export_format: str, header: tuple, rows, filename: str
+) -> StreamingHttpResponse:
+    """Stream `rows` (sequences matching `header`) as CSV or NDJSON."""
+    if export_format == NDJSONRenderer.format:
+        lines = ndjson_lines(header, rows)
+        content_type = NDJSONRenderer.media_type
+    else:
+        lines = csv_lines(_with_header(header, rows))
+        content_type = CSVRenderer.media_type
+
+    response = StreamingHttpResponse(
+        chunked(lines), content_type=f"{content_type}; charset=utf-8"
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{filename}.{export_format}"'
+    )
+    return response
+
+
+def _with_header(header, rows):
+    yield header
+    yield from rows
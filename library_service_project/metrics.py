@@ -0,0 +1,490 @@
+"""
+Per-endpoint request metrics in Prometheus text format.
+
+`MetricsMiddleware` times every request and files it under the view
+that served it (the resolved URL name, e.g. `borrowing:borrowings-list`
+or `borrowing:borrowings-return-borrowing`) and the HTTP method: the
+request count, a latency histogram, and the number and total time of
+its SQL queries and of its serialization.
+
+Recording takes no lock: every thread adds to its own shard of
+counters, and a scrape of `MetricsView` (admin only) merges the shards.
+Queries are timed by a wrapper installed on each database connection.
+Serialization is timed where the views do it: the compiled list path
+of `FastListMixin`, and the rendering of the response of views with
+`SerializationMetricsMixin` and of the async read views. Both are only
+recorded while a request is being measured.
+
+Counters are kept by each worker process. With `METRICS_LOCATION` set
+(the production default), a thread of every worker of the host also
+writes its counters to a shared `SQLiteMetricsStore`, at most once a
+second and only after new requests, and a scrape merges them: it
+reports the whole host, whichever worker serves it. The counters of
+recycled workers are folded into one retired row, so totals never go
+down.
+"""
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from drf_spectacular.utils import extend_schema
+from rest_framework.permissions import IsAdminUser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+# Upper bounds of the latency histogram buckets, in seconds.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Slots of an endpoint's counters: per-bucket counts (the last one is
+# +Inf), then these.
+REQUESTS, DURATION, QUERIES, QUERY_DURATION, SERIALIZER_DURATION = range(
+    len(BUCKETS) + 1, len(BUCKETS) + 6
+)
+SLOTS = len(BUCKETS) + 6
+
+
+class Measure:
+    """What the request being served has spent so far."""
+
+    __slots__ = ("queries", "query_duration", "serializer_duration", "serializing")
+
+    def __init__(self):
+        self.queries = 0
+        self.query_duration = 0.0
+        self.serializer_duration = 0.0
+        self.serializing = False
+
+
+_current: ContextVar = ContextVar("metrics_measure", default=None)
+
+
+class Registry:
+    """Per-thread shards of `{(view, method): counters}`."""
+
+    def __init__(self):
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.shards = []
+        self.retired = {}
+
+    @property
+    def shard(self) -> dict:
+        shard = getattr(self.local, "shard", None)
+        if shard is None:
+            shard = self.local.shard = {}
+            with self.lock:
+                self.shards.append((threading.current_thread(), shard))
+        return shard
+
+    def record(self, key: tuple, duration: float, measure: Measure) -> None:
+        counters = self.shard.get(key)
+        if counters is None:
+            counters = self.shard[key] = [0] * SLOTS
+        bucket = 0
+        while bucket < len(BUCKETS) and duration > BUCKETS[bucket]:
+            bucket += 1
+        counters[bucket] += 1
+        counters[REQUESTS] += 1
+        counters[DURATION] += duration
+        counters[QUERIES] += measure.queries
+        counters[QUERY_DURATION] += measure.query_duration
+        counters[SERIALIZER_DURATION] += measure.serializer_duration
+
+    def collect(self) -> dict:
+        """Merged counters of every shard."""
+        with self.lock:
+            # Shards of finished threads (runserver starts one per
+            # request) are folded into one and dropped.
+            live = []
+            for thread, shard in self.shards:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    merge(self.retired, shard)
+            self.shards = live
+            merged = merge({}, self.retired)
+        for _, shard in live:
+            merge(merged, shard)
+        return merged
+
+    def clear(self) -> None:
+        with self.lock:
+            for _, shard in self.shards:
+                shard.clear()
+            self.retired.clear()
+
+
+def merge(into: dict, shard: dict) -> dict:
+    # A copy first: the owning thread may add keys meanwhile.
+    for key, counters in list(shard.items()):
+        total = into.get(key)
+        if total is None:
+            into[key] = list(counters)
+        else:
+            for slot, value in enumerate(counters):
+                total[slot] += value
+    return into
+
+
+registry = Registry()
+
+
+class SQLiteMetricsStore:
+    """
+    The counters of every worker process of a host, in a SQLite file:
+    one row per process with its latest totals, replaced by each flush.
+    Rows of processes that are gone are summed into the `retired` row
+    when the store is collected.
+    """
+
+    flush_interval = 1.0
+    retired = "retired"
+
+    def __init__(self, location: str):
+        self.location = location
+        self.local = threading.local()
+        # Flushes of one process are serialized, so a snapshot is never
+        # overwritten by an older one.
+        self.lock = threading.Lock()
+        self.pid = None
+        self.flusher_pid = None
+        self.dirty = False
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self.local, "connection", None)
+        # Connections can't be shared with processes forked after opening.
+        if connection is None or self.local.pid != os.getpid():
+            connection = sqlite3.connect(
+                self.location, timeout=5, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS metrics ("
+                " process TEXT PRIMARY KEY,"
+                " pid INTEGER NOT NULL,"
+                " counters TEXT NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            self.local.connection = connection
+            self.local.pid = os.getpid()
+        return connection
+
+    @property
+    def process(self) -> str:
+        """This process's row; a reused pid doesn't take over a dead one's."""
+        if self.pid != os.getpid():
+            self.pid = os.getpid()
+            self.process_key = f"{self.pid}:{uuid.uuid4().hex}"
+        return self.process_key
+
+    def flush_later(self, registry: Registry) -> None:
+        """Have this process's totals written within `flush_interval`."""
+        self.dirty = True
+        # The flusher thread doesn't survive a fork: start one per process.
+        if self.flusher_pid != os.getpid():
+            with self.lock:
+                if self.flusher_pid != os.getpid():
+                    self.flusher_pid = os.getpid()
+                    threading.Thread(
+                        target=self.run_flusher,
+                        args=(registry,),
+                        name="metrics-flusher",
+                        daemon=True,
+                    ).start()
+
+    def run_flusher(self, registry: Registry) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            if self.dirty:
+                self.dirty = False
+                try:
+                    self.flush(registry)
+                except sqlite3.Error:
+                    # E.g. locked past the timeout: retried next time.
+                    self.dirty = True
+
+    def flush(self, registry: Registry) -> None:
+        """Write this process's current totals."""
+        with self.lock:
+            self.connection.execute(
+                "INSERT INTO metrics (process, pid, counters) VALUES (?, ?, ?)"
+                " ON CONFLICT (process) DO UPDATE SET counters = excluded.counters",
+                (self.process, os.getpid(), dumps(registry.collect())),
+            )
+
+    def collect(self, registry: Registry) -> dict:
+        """Merged counters of every process, this one's flushed first."""
+        self.flush(registry)
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            retired, live, dead = {}, [], []
+            for process, pid, counters in connection.execute(
+                "SELECT process, pid, counters FROM metrics"
+            ):
+                if process == self.retired:
+                    merge(retired, loads(counters))
+                elif alive(pid):
+                    live.append(counters)
+                else:
+                    merge(retired, loads(counters))
+                    dead.append((process,))
+            if dead:
+                connection.executemany("DELETE FROM metrics WHERE process = ?", dead)
+                connection.execute(
+                    "INSERT INTO metrics (process, pid, counters) VALUES (?, 0, ?)"
+                    " ON CONFLICT (process) DO UPDATE SET counters = excluded.counters",
+                    (self.retired, dumps(retired)),
+                )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        merged = merge({}, retired)
+        for counters in live:
+            merge(merged, loads(counters))
+        return merged
+
+    def clear(self) -> None:
+        self.connection.execute("DELETE FROM metrics")
+
+
+def dumps(merged: dict) -> str:
+    return json.dumps([[*key, counters] for key, counters in merged.items()])
+
+
+def loads(text: str) -> dict:
+    return {(view, method): counters for view, method, counters in json.loads(text)}
+
+
+def alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+_store = None
+
+
+def get_store():
+    """The host-wide store at `METRICS_LOCATION`, or None if unset."""
+    global _store
+    if _store is None and settings.METRICS_LOCATION:
+        _store = SQLiteMetricsStore(settings.METRICS_LOCATION)
+        # What a worker served since its last flush, e.g. when recycled.
+        atexit.register(_store.flush, registry)
+    return _store
+
+
+def _reset_store(setting, **kwargs) -> None:
+    global _store
+    if setting == "METRICS_LOCATION" and _store is not None:
+        atexit.unregister(_store.flush)
+        _store = None
+
+
+setting_changed.connect(_reset_store)
+
+
+def collect() -> dict:
+    """This process's counters, or the host's with a store."""
+    store = get_store()
+    return registry.collect() if store is None else store.collect(registry)
+
+
+def time_query(execute, sql, params, many, context):
+    """`execute_wrapper` counting the queries of measured requests."""
+    measure = _current.get()
+    if measure is None:
+        return execute(sql, params, many, context)
+    began = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        measure.queries += 1
+        measure.query_duration += time.perf_counter() - began
+
+
+class timed_serialization:
+    """Adds the time spent in the block to the request's serializer time."""
+
+    __slots__ = ("measure", "began")
+
+    def __enter__(self):
+        measure = _current.get()
+        # Nested serializations are already counted by the outer one.
+        if measure is None or measure.serializing:
+            self.measure = None
+        else:
+            self.measure = measure
+            measure.serializing = True
+            self.began = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        measure = self.measure
+        if measure is not None:
+            measure.serializer_duration += time.perf_counter() - self.began
+            measure.serializing = False
+
+
+def _add_query_timer(sender, connection, **kwargs) -> None:
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+
+def instrument() -> None:
+    """Install the query timer on every database connection."""
+    # Connected once, whatever the number of middleware instances.
+    connection_created.connect(_add_query_timer, dispatch_uid="metrics")
+    for connection in connections.all(initialized_only=True):
+        _add_query_timer(None, connection)
+
+
+class SerializationMetricsMixin:
+    """
+    Renders a view's response in `finalize_response`, timed as
+    serialization, instead of later in the request handler.
+    """
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if isinstance(response, Response) and not response.is_rendered:
+            with timed_serialization():
+                response.render()
+        return response
+
+
+class MetricsMiddleware:
+    """Records every request in `registry`."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        instrument()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        measure = Measure()
+        token = _current.set(measure)
+        began = time.perf_counter()
+        try:
+            return self.get_response(request)
+        finally:
+            duration = time.perf_counter() - began
+            _current.reset(token)
+            registry.record(endpoint(request), duration, measure)
+            store = get_store()
+            if store is not None:
+                store.flush_later(registry)
+
+    async def __acall__(self, request):
+        measure = Measure()
+        token = _current.set(measure)
+        began = time.perf_counter()
+        try:
+            return await self.get_response(request)
+        finally:
+            duration = time.perf_counter() - began
+            _current.reset(token)
+            registry.record(endpoint(request), duration, measure)
+            store = get_store()
+            if store is not None:
+                store.flush_later(registry)
+
+
+def endpoint(request) -> tuple:
+    match = getattr(request, "resolver_match", None)
+    view = match.view_name if match is not None and match.url_name else "unmatched"
+    return view, request.method
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def exposition(merged: dict) -> str:
+    """`merged` counters in the Prometheus text format (version 0.0.4)."""
+    families = [
+        ("library_http_requests_total", "counter",
+         "Requests served, by view and method.", REQUESTS),
+        ("library_db_queries_total", "counter",
+         "SQL queries run by requests.", QUERIES),
+        ("library_db_query_duration_seconds_total", "counter",
+         "Time requests spent in SQL queries.", QUERY_DURATION),
+        ("library_serializer_duration_seconds_total", "counter",
+         "Time requests spent serializing responses.", SERIALIZER_DURATION),
+    ]
+    endpoints = sorted(
+        (f'view="{escape(view)}",method="{escape(method)}"', counters)
+        for (view, method), counters in merged.items()
+    )
+
+    lines = []
+    for name, kind, help_text, slot in families:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        lines += [f"{name}{{{labels}}} {counters[slot]}" for labels, counters in endpoints]
+
+    name = "library_http_request_duration_seconds"
+    lines += [
+        f"# HELP {name} Time to serve requests, by view and method.",
+        f"# TYPE {name} histogram",
+    ]
+    for labels, counters in endpoints:
+        cumulative = 0
+        for bound, count in zip((*BUCKETS, "+Inf"), counters):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {counters[DURATION]}")
+        lines.append(f"{name}_count{{{labels}}} {counters[REQUESTS]}")
+    return "\n".join(lines) + "\n"
+
+
+class PrometheusRenderer(BaseRenderer):
+    media_type = "text/plain"
+    format = "prometheus"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict):
+            # Error payloads, e.g. a denied scrape.
+            data = "".join(f"# {key}: {value}\n" for key, value in data.items())
+        return data.encode()
+
+
+@extend_schema(exclude=True)
+class MetricsView(APIView):
+    """Per-endpoint request metrics of the host's worker processes."""
+
+    permission_classes = [IsAdminUser]
+    renderer_classes = [PrometheusRenderer]
+    throttle_classes = []
+
+    def get(self, request):
+        return Response(
+            exposition(collect()),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
@@ -0,0 +1,217 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a composite, unique ordering.
+
+    Unlike DRF's ``CursorPagination`` (which keys on the first ordering
+    field and falls back to an OFFSET for ties), the cursor stores the
+    values of *every* ordering field of the boundary row and the next
+    page is selected with a row-value comparison, e.g. for
+    ``("title", "author", "id")``::
+
+        title > t OR (title = t AND author > a)
+        OR (title = t AND author = a AND id > i)
+
+    Backed by an index on the same columns, every page costs the same
+    as the first one. The last ordering field must be unique.
+    """
+
+    cursor_query_param = "cursor"
+    cursor_query_description = _("The pagination cursor value.")
+    page_size = 20
+    page_size_query_param = "page_size"
+    page_size_query_description = _("Number of results to return per page.")
+    max_page_size = 100
+    ordering = ("id",)
+    invalid_cursor_message = _("Invalid cursor")
+
+    def get_ordering(self, request, queryset, view) -> tuple:
+        return tuple(self.ordering)
+
+    def get_page_size(self, request) -> int:
+        if self.page_size_query_param:
+            try:
+                page_size = int(request.query_params[self.page_size_query_param])
+                if page_size > 0:
+                    return min(page_size, self.max_page_size)
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.prepare_queryset(queryset, request, view)
+        return self.build_page(list(queryset[:self.page_size + 1]))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset`` through the async ORM."""
+        queryset = self.prepare_queryset(queryset, request, view)
+        rows = queryset[:self.page_size + 1].aiterator()
+        return self.build_page([row async for row in rows])
+
+    def prepare_queryset(self, queryset, request, view=None):
+        """Order and filter ``queryset`` to the rows of the requested page."""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.position, self.reverse = self.decode_cursor(request)
+
+        ordering = self.ordering
+        if self.reverse:
+            ordering = tuple(invert(field) for field in ordering)
+
+        queryset = queryset.order_by(*ordering)
+        if self.position is not None:
+            queryset = queryset.filter(keyset_filter(ordering, self.position))
+        return queryset
+
+    def build_page(self, rows: list) -> list:
+        """Trim the ``page_size + 1`` fetched rows and work out the links."""
+        has_more = len(rows) > self.page_size
+        page = rows[:self.page_size]
+
+        if self.reverse:
+            page.reverse()
+            self.has_next = self.position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.position is not None
+
+        self.page = page
+        return page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.get_position(self.page[0]), reverse=True)
+
+    def get_position(self, item) -> list:
+        fields = [field.lstrip("-") for field in self.ordering]
+        if isinstance(item, dict):
+            return [item[field] for field in fields]
+        return [getattr(item, field) for field in fields]
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            position = payload["p"]
+            reverse = bool(payload.get("r", False))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, position: list, reverse: bool) -> str:
+        payload = {"p": [to_json_value(value) for value in position]}
+        if reverse:
+            payload["r"] = 1
+        encoded = urlsafe_b64encode(
+            json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        ).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_data(self, data) -> OrderedDict:
+        return OrderedDict([
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+            ("results", data),
+        ])
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri",
+                    "example": "http://api.example.org/accounts/?{cursor_query_param}=eyJwIjpbMV19".format(
+                        cursor_query_param=self.cursor_query_param)
+                },
+                "previous": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri",
+                    "example": "http://api.example.org/accounts/?{cursor_query_param}=eyJwIjpbMV0sInIiOjF9".format(
+                        cursor_query_param=self.cursor_query_param)
+                },
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        parameters = [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.cursor_query_description),
+                "schema": {"type": "string"},
+            }
+        ]
+        if self.page_size_query_param:
+            parameters.append(
+                {
+                    "name": self.page_size_query_param,
+                    "required": False,
+                    "in": "query",
+                    "description": str(self.page_size_query_description),
+                    "schema": {"type": "integer"},
+                }
+            )
+        return parameters
+
+
+def invert(field: str) -> str:
+    return field[1:] if field.startswith("-") else f"-{field}"
+
+
+def keyset_filter(ordering: tuple, position: list) -> Q:
+    """Build the row-value comparison selecting rows after ``position``."""
+    condition = Q()
+    equal = Q()
+    for field, value in zip(ordering, position):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        condition |= equal & Q(**{f"{name}__{lookup}": value})
+        equal &= Q(**{name: value})
+    return condition
+
+
+def to_json_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
@@ -0,0 +1,120 @@
+"""
+Read-only fast path for list actions.
+
+A `ModelSerializer` builds bound field objects for every instance and
+walks them calling `get_attribute`/`to_representation` per field, per
+row. For list endpoints that only read flat model columns this module
+compiles the serializer once into a tuple of
+`(output key, values() column, converter)` accessors, fetches rows
+with `QuerySet.values()` (related slug fields become joined columns)
+and builds plain dicts from them.
+
+Converters are the serializer's own field `to_representation` methods
+(identity for columns the database already returns in their final
+form), so the output - and the JSON DRF renders from it - is identical
+to the regular serializer's.
+"""
+from functools import lru_cache
+
+from rest_framework import fields, relations, serializers
+
+from library_service_project.metrics import timed_serialization
+
+IDENTITY_FIELDS = (
+    fields.BooleanField,
+    fields.CharField,
+    fields.ChoiceField,
+    fields.IntegerField,
+    relations.PrimaryKeyRelatedField,
+)
+
+
+class FastSerializer:
+    """Compiled, read-only representation of a flat serializer."""
+
+    def __init__(self, accessors: tuple):
+        self.accessors = accessors
+        self.columns = tuple(column for _, column, _ in accessors)
+
+    def to_representation(self, row: dict) -> dict:
+        ret = {}
+        for key, column, convert in self.accessors:
+            value = row[column]
+            ret[key] = value if value is None or convert is None else convert(value)
+        return ret
+
+    def many(self, rows) -> list:
+        to_representation = self.to_representation
+        with timed_serialization():
+            return [to_representation(row) for row in rows]
+
+
+@lru_cache(maxsize=None)
+def compile_serializer(serializer_class) -> FastSerializer:
+    """
+    Compile `serializer_class` into a `FastSerializer`.
+
+    Raises `TypeError` for fields that can't be read from a single
+    column (nested serializers, method fields, dotted sources).
+    """
+    accessors = []
+
+    for key, field in serializer_class().fields.items():
+        if field.write_only:
+            continue
+        if "." in field.source or field.source == "*":
+            raise TypeError(f"{serializer_class.__name__}.{key} is not a column")
+
+        if isinstance(field, relations.SlugRelatedField):
+            accessors.append((key, f"{field.source}__{field.slug_field}", None))
+        elif isinstance(field, IDENTITY_FIELDS):
+            accessors.append((key, field.source, None))
+        elif isinstance(field, (serializers.BaseSerializer,
+                                fields.SerializerMethodField,
+                                relations.RelatedField,
+                                relations.ManyRelatedField)):
+            raise TypeError(f"{serializer_class.__name__}.{key} is not a column")
+        else:
+            accessors.append((key, field.source, field.to_representation))
+
+    return FastSerializer(tuple(accessors))
+
+
+class FastListMixin:
+    """
+    Serve the `list` action from `values()` rows through the compiled
+    form of the action's serializer class.
+    """
+
+    def get_list_data(self, queryset):
+        """Page `queryset` and return the (paginated) representation."""
+        fast = compile_serializer(self.get_serializer_class())
+        rows = self.get_list_rows(queryset, fast)
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return fast.many(rows.iterator())
+        return self.paginator.get_paginated_data(fast.many(page))
+
+    async def aget_list_data(self, queryset):
+        """`get_list_data` through the async ORM."""
+        fast = compile_serializer(self.get_serializer_class())
+        rows = self.get_list_rows(queryset, fast)
+        paginator = self.paginator
+        if paginator is None:
+            return fast.many([row async for row in rows.aiterator()])
+        page = await paginator.apaginate_queryset(rows, self.request, self)
+        return paginator.get_paginated_data(fast.many(page))
+
+    def get_list_rows(self, queryset, fast: FastSerializer):
+        """`values()` of the serializer's columns and the page ordering."""
+        columns = list(fast.columns)
+
+        paginator = self.paginator
+        if paginator is not None:
+            ordering = paginator.get_ordering(self.request, queryset, self)
+            columns += [
+                field.lstrip("-") for field in ordering
+                if field.lstrip("-") not in columns
+            ]
+
+        return queryset.values(*columns)
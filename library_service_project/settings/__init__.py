@@ -0,0 +1,10 @@
+"""
+Settings are picked by the `DJANGO_ENV` environment variable: `dev`
+(the default) or `prod`.
+"""
+import os
+
+if os.environ.get("DJANGO_ENV", "dev") == "prod":
+    from library_service_project.settings.prod import *  # noqa: F401,F403
+else:
+    from library_service_project.settings.dev import *  # noqa: F401,F403
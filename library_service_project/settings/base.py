@@ -0,0 +1,248 @@
+"""
+Django settings for library_service_project project, shared by the
+development (`dev`) and production (`prod`) settings.
+
+Generated by 'django-admin startproject' using Django 5.1.5.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.1/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/5.1/ref/settings/
+"""
+import os
+from datetime import timedelta
+from pathlib import Path
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    "django.contrib.admin",
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.staticfiles",
+    "rest_framework",
+    "rest_framework.authtoken",
+    "drf_spectacular",
+    "books",
+    "borrowings",
+    "payments",
+    "users",
+]
+
+AUTH_USER_MODEL = "users.User"
+
+MIDDLEWARE = [
+    "library_service_project.metrics.MetricsMiddleware",
+    "django.middleware.security.SecurityMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+
+ROOT_URLCONF = "library_service_project.urls"
+
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": [],
+        "APP_DIRS": True,
+        "OPTIONS": {
+            "context_processors": [
+                "django.template.context_processors.debug",
+                "django.template.context_processors.request",
+                "django.contrib.auth.context_processors.auth",
+                "django.contrib.messages.context_processors.messages",
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = "library_service_project.wsgi.application"
+
+
+# Database
+# https://docs.djangoproject.com/en/5.1/ref/settings/#databases
+
+# PostgreSQL (the compose `db` service) when DB_HOST is set, otherwise a
+# local SQLite file. Connections stay open between requests for
+# DB_CONN_MAX_AGE seconds and are health-checked before being reused.
+# DB_POOL=1 (PostgreSQL) hands out connections from a psycopg pool of
+# DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE per worker process instead; useful
+# with threaded workers.
+
+DB_CONN_MAX_AGE = int(os.environ.get("DB_CONN_MAX_AGE", 60))
+DB_POOL = os.environ.get("DB_POOL", "0") == "1"
+
+if os.environ.get("DB_HOST"):
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "HOST": os.environ["DB_HOST"],
+            "PORT": os.environ.get("DB_PORT", "5432"),
+            "NAME": os.environ.get("DB_NAME", ""),
+            "USER": os.environ.get("DB_USER", ""),
+            "PASSWORD": os.environ.get("DB_PASSWORD", ""),
+            # A pooled connection goes back to the pool after each
+            # request; Django refuses pools with persistent connections.
+            "CONN_MAX_AGE": 0 if DB_POOL else DB_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {
+                "pool": {
+                    "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+                    "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+                    "timeout": int(os.environ.get("DB_POOL_TIMEOUT", 10)),
+                },
+            } if DB_POOL else {},
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / "db.sqlite3",
+            "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {
+                # Run on every new connection. WAL lets readers proceed
+                # while a writer commits, and only needs syncing at
+                # checkpoints with synchronous=NORMAL; a 64 MB page cache
+                # and 256 MB of memory-mapped reads per connection.
+                "init_command": (
+                    "PRAGMA journal_mode=WAL;"
+                    "PRAGMA synchronous=NORMAL;"
+                    "PRAGMA cache_size=-65536;"
+                    "PRAGMA mmap_size=268435456"
+                ),
+            },
+        }
+    }
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Local memory by default; point CACHE_BACKEND/CACHE_LOCATION at a shared
+# server in production, e.g.
+# django.core.cache.backends.memcached.PyMemcacheCache / 127.0.0.1:11211
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+    }
+}
+
+BOOK_CACHE_ALIAS = "default"
+BOOK_CACHE_TIMEOUT = int(os.environ.get("BOOK_CACHE_TIMEOUT", 300))
+
+# Throttle state, see library_service_project.throttling. The cache store
+# is shared between workers when the cache is; with a per-process cache,
+# set THROTTLE_BACKEND=library_service_project.throttling.SQLiteThrottleStore
+# and THROTTLE_LOCATION to a file path to share limits between the
+# workers of a host.
+THROTTLE_STORE = {
+    "BACKEND": os.environ.get(
+        "THROTTLE_BACKEND", "library_service_project.throttling.CacheThrottleStore"
+    ),
+    "LOCATION": os.environ.get("THROTTLE_LOCATION", "default"),
+}
+
+# SQLite file through which the worker processes of a host merge their
+# request metrics (see library_service_project.metrics). Unset, a scrape
+# reports the worker that serves it.
+METRICS_LOCATION = os.environ.get("METRICS_LOCATION") or None
+
+USER_CACHE_ALIAS = "default"
+USER_CACHE_TIMEOUT = int(os.environ.get("USER_CACHE_TIMEOUT", 300))
+
+# Overdue borrowings are fined this many times the book's daily fee per day.
+FINE_MULTIPLIER = 2
+
+
+# Password validation
+# https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.MinimumLengthValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.CommonPasswordValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.NumericPasswordValidator",
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/5.1/topics/i18n/
+
+LANGUAGE_CODE = "en-us"
+
+TIME_ZONE = "UTC"
+
+USE_I18N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/5.1/howto/static-files/
+
+STATIC_URL = "static/"
+
+MEDIA_URL = "/media/"
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+REST_FRAMEWORK = {
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "users.authentication.CachedJWTAuthentication",
+    ],
+    "DEFAULT_SCHEMA_CLASS":
+        "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_THROTTLE_CLASSES": [
+        "library_service_project.throttling.AnonRateThrottle",
+        "library_service_project.throttling.UserRateThrottle"
+    ],
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "30/minute",
+        "user": "60/minute"
+    }
+}
+
+SPECTACULAR_SETTINGS = {
+    "TITLE": "Library Service API",
+    "DESCRIPTION": "An online library for book borrowings",
+    "VERSION": "1.0.0",
+    "SERVE_INCLUDE_SCHEMA": False,
+    "SWAGGER_UI_SETTINGS": {
+        "deepLinking": True,
+        "defaultModelRendering": "model",
+        "defaultModelExpandDepth": 2,
+    }
+}
+
+SIMPLE_JWT = {
+    "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
+    "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
+    "ROTATE_REFRESH_TOKENS": False,
+}
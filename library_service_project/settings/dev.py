@@ -0,0 +1,27 @@
+"""
+Development settings: debug mode, the debug toolbar and a fixed,
+insecure secret key unless SECRET_KEY is set.
+"""
+import os
+
+from library_service_project.settings.base import *  # noqa: F401,F403
+from library_service_project.settings.base import INSTALLED_APPS, MIDDLEWARE
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = True
+
+SECRET_KEY = os.environ.get("SECRET_KEY", "django-insecure-development-only")
+
+ALLOWED_HOSTS = [
+    host for host in os.environ.get("ALLOWED_HOSTS", "").split(",") if host
+]
+
+INSTALLED_APPS = [*INSTALLED_APPS, "debug_toolbar"]
+
+# Right after SecurityMiddleware.
+_security = MIDDLEWARE.index("django.middleware.security.SecurityMiddleware")
+MIDDLEWARE = [
+    *MIDDLEWARE[:_security + 1],
+    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    *MIDDLEWARE[_security + 1:],
+]
@@ -0,0 +1,42 @@
+"""
+Production settings: no debug mode or toolbar, the secret key and
+allowed hosts come from the environment.
+"""
+import os
+import tempfile
+
+from library_service_project.settings.base import *  # noqa: F401,F403
+
+DEBUG = False
+
+SECRET_KEY = os.environ["SECRET_KEY"]
+
+ALLOWED_HOSTS = [
+    host for host in os.environ.get("ALLOWED_HOSTS", "").split(",") if host
+]
+
+# Several server workers share the host: unless another throttle store
+# (e.g. on a shared cache) is configured, keep the throttle state in a
+# file they all use.
+if "THROTTLE_BACKEND" not in os.environ:
+    THROTTLE_STORE = {
+        "BACKEND": "library_service_project.throttling.SQLiteThrottleStore",
+        "LOCATION": os.environ.get(
+            "THROTTLE_LOCATION",
+            os.path.join(tempfile.gettempdir(), "library-service-throttle.sqlite3"),
+        ),
+    }
+
+# Merge the metrics of all workers of the host, see METRICS_LOCATION.
+METRICS_LOCATION = os.environ.get(
+    "METRICS_LOCATION",
+    os.path.join(tempfile.gettempdir(), "library-service-metrics.sqlite3"),
+)
+
+# A cached user (its is_active and is_staff) is only dropped from the
+# cache of the worker that saved it: with a per-process cache the other
+# workers would keep authenticating the old row for USER_CACHE_TIMEOUT.
+# Without a shared cache, users and dashboards aren't cached.
+if CACHES["default"]["BACKEND"] == "django.core.cache.backends.locmem.LocMemCache":
+    CACHES["users"] = {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+    USER_CACHE_ALIAS = "users"
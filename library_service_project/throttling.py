@@ -0,0 +1,218 @@
+"""
+Sliding-window rate limiting with a shared store.
+
+DRF's `SimpleRateThrottle` keeps a list of request timestamps per key
+in the default cache and re-slices it on every check. Here each key
+holds a fixed-size record - the current window number and the request
+counts of the current and the previous window - and the number of
+requests in the last `duration` seconds is estimated as::
+
+    previous * (1 - elapsed / duration) + current
+
+where `elapsed` is the time since the current window started. A check
+is a constant amount of work, and only allowed requests are counted.
+The limits are the usual `DEFAULT_THROTTLE_RATES`.
+
+The record lives in the store configured by `THROTTLE_STORE`:
+
+- `CacheThrottleStore` keeps per-window counters in a Django cache,
+  shared by every worker (and host) when the cache is memcached/Redis.
+- `SQLiteThrottleStore` keeps the records in a SQLite file, shared by
+  every worker of one host without any cache server.
+"""
+import os
+import sqlite3
+import threading
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.utils.module_loading import import_string
+from rest_framework import throttling
+
+
+class Hit(NamedTuple):
+    allowed: bool
+    wait: Optional[float]
+
+
+def sliding_window(now: float, duration: int) -> tuple:
+    """The window `now` falls in, and the weight of the previous one."""
+    window, elapsed = divmod(now, duration)
+    return int(window), 1 - elapsed / duration
+
+
+def wait_time(
+    current: int, previous: int, limit: int, duration: int, now: float
+) -> float:
+    """Seconds until a request over the limit would be allowed again."""
+    elapsed = now % duration
+    if current >= limit:
+        # Wait for the next window, until the current one weighs less.
+        return duration - elapsed + duration * (1 - limit / current)
+    return max(duration * (1 - (limit - current) / previous) - elapsed, 0)
+
+
+class CacheThrottleStore:
+    """
+    Counters in a Django cache, one key per throttle key and window.
+    Atomic across processes when the cache's `incr` is (memcached,
+    Redis).
+    """
+
+    def __init__(self, location: str = "default"):
+        self.alias = location
+
+    def hit(self, key: str, limit: int, duration: int, now: float) -> Hit:
+        cache = caches[self.alias]
+        window, weight = sliding_window(now, duration)
+        current_key = f"throttle:{key}:{window}"
+
+        cache.add(current_key, 0, duration * 2)
+        current = cache.incr(current_key)
+        previous = cache.get(f"throttle:{key}:{window - 1}", 0)
+        if previous * weight + current - 1 < limit:
+            return Hit(True, None)
+
+        cache.decr(current_key)
+        return Hit(False, wait_time(current - 1, previous, limit, duration, now))
+
+    def clear(self) -> None:
+        caches[self.alias].clear()
+
+
+class SQLiteThrottleStore:
+    """
+    Records in a SQLite file, one row per key, rolled over and counted
+    with two single-row statements. Every process on the host opening
+    the same file shares the limits. The state is disposable, so writes
+    aren't synced to disk.
+    """
+
+    purge_every = 1000
+
+    def __init__(self, location: str):
+        self.location = location
+        self.local = threading.local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self.local, "connection", None)
+        # Connections can't be shared with processes forked after opening.
+        if connection is None or self.local.pid != os.getpid():
+            connection = sqlite3.connect(
+                self.location, timeout=5, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS throttle ("
+                " key TEXT PRIMARY KEY,"
+                " window INTEGER NOT NULL,"
+                " current INTEGER NOT NULL,"
+                " previous INTEGER NOT NULL,"
+                " allowed INTEGER NOT NULL,"
+                " expires REAL NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            self.local.connection = connection
+            self.local.pid = os.getpid()
+            self.local.hits = 0
+        return connection
+
+    def hit(self, key: str, limit: int, duration: int, now: float) -> Hit:
+        window, weight = sliding_window(now, duration)
+        params = {
+            "key": key,
+            "window": window,
+            "weight": weight,
+            "limit": limit,
+            "expires": (window + 2) * duration,
+        }
+        connection = self.connection
+        # Roll the record over to the current window; a no-op for a new
+        # key, or if another process rolled it first.
+        connection.execute(
+            """
+            UPDATE throttle SET
+                previous = CASE WHEN window = :window - 1 THEN current ELSE 0 END,
+                current = 0,
+                window = :window
+            WHERE key = :key AND window < :window
+            """,
+            params,
+        )
+        # SET expressions all read the row as it was before the update.
+        current, previous, allowed = connection.execute(
+            """
+            INSERT INTO throttle (key, window, current, previous, allowed, expires)
+            VALUES (:key, :window, 1, 0, 1, :expires)
+            ON CONFLICT (key) DO UPDATE SET
+                current = current + (previous * :weight + current < :limit),
+                allowed = previous * :weight + current < :limit,
+                expires = :expires
+            RETURNING current, previous, allowed
+            """,
+            params,
+        ).fetchone()
+
+        self.local.hits += 1
+        if self.local.hits % self.purge_every == 0:
+            connection.execute("DELETE FROM throttle WHERE expires < ?", (now,))
+
+        if allowed:
+            return Hit(True, None)
+        return Hit(False, wait_time(current, previous, limit, duration, now))
+
+    def clear(self) -> None:
+        self.connection.execute("DELETE FROM throttle")
+
+
+_store = None
+
+
+def get_store():
+    """The process-wide store configured by `THROTTLE_STORE`."""
+    global _store
+    if _store is None:
+        config = settings.THROTTLE_STORE
+        _store = import_string(config["BACKEND"])(config["LOCATION"])
+    return _store
+
+
+def _reset_store(setting, **kwargs) -> None:
+    global _store
+    if setting == "THROTTLE_STORE":
+        _store = None
+
+
+setting_changed.connect(_reset_store)
+
+
+class SlidingWindowRateThrottle(throttling.SimpleRateThrottle):
+    """`SimpleRateThrottle` checked against the shared sliding-window store."""
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.decision = get_store().hit(
+            self.key, self.num_requests, self.duration, self.timer()
+        )
+        return self.decision.allowed
+
+    def wait(self):
+        return self.decision.wait
+
+
+class AnonRateThrottle(SlidingWindowRateThrottle, throttling.AnonRateThrottle):
+    pass
+
+
+class UserRateThrottle(SlidingWindowRateThrottle, throttling.UserRateThrottle):
+    pass
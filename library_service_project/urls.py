@@ -20,6 +20,7 @@ from django.contrib import admin
 from django.conf import settings
 from django.urls import path, include
 
+from library_service_project.metrics import MetricsView
 from drf_spectacular.views import (
     SpectacularAPIView,
     SpectacularRedocView,
@@ -31,7 +32,7 @@ urlpatterns = [
     path("api/books/", include("books.urls")),
     path("api/borrowings/", include("borrowings.urls", namespace="borrowing")),
     path("api/users/", include("users.urls", namespace="user")),
-    path("__debug__/", include("debug_toolbar.urls")),
+    path("api/metrics/", MetricsView.as_view(), name="metrics"),
     path("api/schema/",
          SpectacularAPIView.as_view(),
          name="schema"),
@@ -42,3 +43,6 @@ urlpatterns = [
          SpectacularRedocView.as_view(url_name="schema"),
          name="redoc"),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+if "debug_toolbar" in settings.INSTALLED_APPS:
+    urlpatterns.append(path("__debug__/", include("debug_toolbar.urls")))
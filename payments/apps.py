@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class PaymentsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "payments"
+
+    def ready(self):
+        from borrowings.signals import borrowings_returned
+        from payments.signals import bill_returned_borrowings
+
+        borrowings_returned.connect(bill_returned_borrowings)
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from borrowings.benchmarks import seed_borrowings
+from payments.billing import DEFAULT_CHUNK_SIZE, bill_borrowings
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark batch billing: seed a backlog of returned borrowings and "
+        "bill all of them, reporting borrowings/sec. Runs inside a "
+        "transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        if options["rows"] < 1 or options["chunk_size"] < 1:
+            raise CommandError("--rows and --chunk-size must be positive.")
+
+        with transaction.atomic():
+            seed_borrowings(options["rows"], 0, "bench-billing")
+
+            started = time.perf_counter()
+            result = bill_borrowings(chunk_size=options["chunk_size"])
+            elapsed = time.perf_counter() - started
+
+            self.stdout.write(
+                f"Billed {result.borrowings:,} borrowings "
+                f"({result.payments:,} payments, total {result.total}) "
+                f"in {elapsed:.1f}s - {result.borrowings / elapsed:,.0f} borrowings/s"
+            )
+            transaction.set_rollback(True)
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from payments.billing import DEFAULT_CHUNK_SIZE, bill_borrowings
+
+
+class Command(BaseCommand):
+    help = (
+        "Bill every returned borrowing that has no payments yet: the "
+        "borrowing fee and, if returned late, the fine. Meant to run "
+        "nightly; returns are also billed as they happen."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Borrowings billed per query.",
+        )
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive.")
+
+        result = bill_borrowings(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Billed {result.borrowings} borrowings: "
+            f"{result.payments} payments totalling {result.total}."
+        ))
@@ -0,0 +1,62 @@
+# Generated by Django 5.1.5 on 2026-10-18 02:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("borrowings", "0009_borrowing_overdue"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Payment",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("PENDING", "Pending"), ("PAID", "Paid")],
+                        default="PENDING",
+                        max_length=7,
+                    ),
+                ),
+                (
+                    "type",
+                    models.CharField(
+                        choices=[("PAYMENT", "Payment"), ("FINE", "Fine")], max_length=7
+                    ),
+                ),
+                ("money_to_pay", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "borrowing",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="payments",
+                        to="borrowings.borrowing",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("borrowing", "type"),
+                        name="unique_payment_type_per_borrowing",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.5 on 2026-10-18 02:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("borrowings", "0010_borrowing_archive"),
+        ("payments", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="payment",
+            name="borrowing",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="payments",
+                to="borrowings.borrowing",
+            ),
+        ),
+    ]
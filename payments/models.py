@@ -0,0 +1,39 @@
+from django.db import models
+
+from borrowings.models import Borrowing
+
+
+class Payment(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        PAID = "PAID", "Paid"
+
+    class Type(models.TextChoices):
+        PAYMENT = "PAYMENT", "Payment"
+        FINE = "FINE", "Fine"
+
+    status = models.CharField(
+        max_length=7, choices=Status.choices, default=Status.PENDING
+    )
+    type = models.CharField(max_length=7, choices=Type.choices)
+    # Archived borrowings leave the borrowings table, their payments stay.
+    borrowing = models.ForeignKey(
+        Borrowing,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="payments",
+    )
+    money_to_pay = models.DecimalField(max_digits=10, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            # A borrowing is billed once: re-running billing is a no-op.
+            models.UniqueConstraint(
+                fields=["borrowing", "type"],
+                name="unique_payment_type_per_borrowing",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_type_display()} of {self.money_to_pay} for borrowing {self.borrowing_id}"
@@ -0,0 +1,6 @@
+from payments.billing import bill_borrowings
+
+
+def bill_returned_borrowings(sender, borrowing_ids, **kwargs) -> None:
+    """Bill borrowings as they are returned, in the same transaction."""
+    bill_borrowings(borrowing_ids=borrowing_ids)
@@ -0,0 +1,140 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from books.models import Book
+from borrowings.models import Borrowing
+from payments import billing
+from payments.billing import bill_borrowings
+from payments.models import Payment
+
+
+@override_settings(FINE_MULTIPLIER=2)
+class BillingTests(TestCase):
+    """Tests for billing fees and fines of returned borrowings."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com", password="password_user"
+        )
+        self.book = Book.objects.create(
+            title="Billed Book", author="Author", inventory=5, daily_fee=Decimal("0.35")
+        )
+        self.today = timezone.localdate()
+
+    def borrowing(self, days: int, late: int = 0, returned: bool = True, **fields):
+        """
+        A borrowing lent for `days` days, returned today, `late` days
+        late (early if negative).
+        """
+        borrowing = Borrowing.objects.create(
+            book=self.book,
+            user=self.user,
+            expected_return_date=self.today + timedelta(days=1),
+        )
+        borrow_date = self.today - timedelta(days=days + late)
+        Borrowing.objects.filter(pk=borrowing.pk).update(
+            borrow_date=borrow_date,
+            expected_return_date=borrow_date + timedelta(days=days),
+            actual_return_date=self.today if returned else None,
+            **fields,
+        )
+        return borrowing
+
+    def charges(self, borrowing) -> dict:
+        return dict(
+            Payment.objects.filter(borrowing=borrowing)
+            .values_list("type", "money_to_pay")
+        )
+
+    def test_fee_and_fine(self):
+        on_time = self.borrowing(days=7)
+        late = self.borrowing(days=7, late=3)
+        scanned = self.borrowing(days=7, late=3, fine_rate=Decimal("1.11"))
+        same_day = self.borrowing(days=7, late=-7)
+        active = self.borrowing(days=7, returned=False)
+
+        result = bill_borrowings(chunk_size=2)
+
+        self.assertEqual(result.borrowings, 4)
+        self.assertEqual(result.payments, 6)
+        self.assertEqual(result.total, Decimal("13.13"))
+        self.assertEqual(self.charges(on_time), {"PAYMENT": Decimal("2.45")})
+        self.assertEqual(
+            self.charges(late), {"PAYMENT": Decimal("2.45"), "FINE": Decimal("2.10")}
+        )
+        self.assertEqual(
+            self.charges(scanned), {"PAYMENT": Decimal("2.45"), "FINE": Decimal("3.33")}
+        )
+        self.assertEqual(self.charges(same_day), {"PAYMENT": Decimal("0.35")})
+        self.assertEqual(self.charges(active), {})
+
+    def test_billing_is_idempotent(self):
+        self.borrowing(days=7, late=1)
+        bill_borrowings()
+
+        result = bill_borrowings()
+
+        self.assertEqual(result.borrowings, 0)
+        self.assertEqual(Payment.objects.count(), 2)
+
+    def test_borrowings_billed_meanwhile_are_not_counted(self):
+        first = self.borrowing(days=7)
+        second = self.borrowing(days=7, late=3)
+        charges = billing.charges
+
+        def charges_after_a_concurrent_billing(rows, multiplier):
+            if not Payment.objects.exists():
+                Payment.objects.create(
+                    borrowing=second,
+                    type=Payment.Type.PAYMENT,
+                    money_to_pay=Decimal("2.45"),
+                )
+            return charges(rows, multiplier)
+
+        with mock.patch.object(
+            billing, "charges", charges_after_a_concurrent_billing
+        ):
+            result = bill_borrowings()
+
+        self.assertEqual(result.borrowings, 1)
+        self.assertEqual(result.payments, 1)
+        self.assertEqual(result.total, Decimal("2.45"))
+        self.assertEqual(self.charges(first), {"PAYMENT": Decimal("2.45")})
+        self.assertEqual(self.charges(second), {"PAYMENT": Decimal("2.45")})
+
+    def test_zero_fee_is_billed_once(self):
+        Book.objects.filter(pk=self.book.pk).update(daily_fee=Decimal("0.00"))
+        borrowing = self.borrowing(days=7)
+
+        result = bill_borrowings()
+
+        self.assertEqual(result.borrowings, 1)
+        self.assertEqual(result.total, Decimal("0.00"))
+        payment = Payment.objects.get(borrowing=borrowing)
+        self.assertEqual(payment.type, Payment.Type.PAYMENT)
+        self.assertEqual(payment.money_to_pay, Decimal("0.00"))
+        self.assertEqual(payment.status, Payment.Status.PAID)
+        self.assertEqual(bill_borrowings().borrowings, 0)
+
+    def test_return_bills_the_borrowing(self):
+        borrowing = self.borrowing(days=7, returned=False)
+        borrowing.refresh_from_db()
+
+        borrowing.return_book()
+
+        self.assertEqual(self.charges(borrowing), {"PAYMENT": Decimal("2.45")})
+
+    def test_command(self):
+        self.borrowing(days=2)
+        out = StringIO()
+        call_command("bill_borrowings", stdout=out)
+        self.assertIn("Billed 1 borrowings: 1 payments totalling 0.70.", out.getvalue())
@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class UsersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "users"
+
+    def ready(self):
+        from users import schema  # noqa: F401
+        from users.models import User
+        from users.signals import invalidate_user
+
+        post_save.connect(invalidate_user, sender=User)
+        post_delete.connect(invalidate_user, sender=User)
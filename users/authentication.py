@@ -0,0 +1,63 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from users import cache
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    `JWTAuthentication` that resolves the token's user through the
+    user cache, loading it from the database only on a miss.
+
+    Cached users go through the same active and revoked-token checks as
+    freshly loaded ones.
+    """
+
+    def get_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        user = cache.get_user(user_id)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set_user(user_id, user)
+            return user
+        return self.check_user(user, validated_token)
+
+    async def aget_user(self, validated_token):
+        """`get_user` through the async cache and ORM."""
+        user_id = self.get_user_id(validated_token)
+        user = await cache.aget_user(user_id)
+        if user is None:
+            try:
+                user = await self.user_model.objects.aget(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            self.check_user(user, validated_token)
+            await cache.aset_user(user_id, user)
+            return user
+        return self.check_user(user, validated_token)
+
+    @staticmethod
+    def get_user_id(validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    @staticmethod
+    def check_user(user, validated_token):
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+        return user
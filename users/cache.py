@@ -0,0 +1,76 @@
+"""
+Per-user caches: authenticated users and `me` dashboards.
+
+`CachedJWTAuthentication` stores the user a token resolves to under its
+id, so authenticated requests don't load the user row every time.
+Entries expire after `USER_CACHE_TIMEOUT` seconds and are dropped
+whenever the user is saved or deleted (see `users.signals`), which
+covers profile updates through `/api/users/me/` and `is_active` /
+`is_staff` changes in the admin. Bulk `User.objects...update()` calls
+send no signal; `UserQuerySet.update` drops the users it updates. Raw
+SQL and `QuerySet._update` bypass both, and their changes only show
+once the entries expire. Permissions and groups aren't cached
+with the user, they are loaded on the first `has_perm` of a request.
+
+The borrowing summary of `/api/users/me/?expand=borrowings` is cached
+per user and day (its overdue count depends on the date). It's dropped
+on every checkout and return of the user's borrowings and whenever the
+user is saved.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+
+
+def get_cache():
+    return caches[settings.USER_CACHE_ALIAS]
+
+
+def user_key(user_id) -> str:
+    return f"users:auth:{user_id}"
+
+
+def get_user(user_id):
+    return get_cache().get(user_key(user_id))
+
+
+def set_user(user_id, user) -> None:
+    get_cache().set(user_key(user_id), user, settings.USER_CACHE_TIMEOUT)
+
+
+async def aget_user(user_id):
+    return await get_cache().aget(user_key(user_id))
+
+
+async def aset_user(user_id, user) -> None:
+    await get_cache().aset(user_key(user_id), user, settings.USER_CACHE_TIMEOUT)
+
+
+def invalidate_user(*user_ids) -> None:
+    """
+    Drop the cached users now and again once the surrounding transaction
+    commits, so a concurrent request can't re-cache the old row.
+    """
+    keys = [user_key(user_id) for user_id in user_ids]
+    get_cache().delete_many(keys)
+    transaction.on_commit(lambda: get_cache().delete_many(keys))
+
+
+def dashboard_key(user_id) -> str:
+    return f"users:dashboard:{user_id}:{timezone.localdate().isoformat()}"
+
+
+def get_dashboard(user_id):
+    return get_cache().get(dashboard_key(user_id))
+
+
+def set_dashboard(user_id, data: dict) -> None:
+    get_cache().set(dashboard_key(user_id), data, settings.USER_CACHE_TIMEOUT)
+
+
+def invalidate_dashboards(*user_ids) -> None:
+    """Drop the users' dashboards, now and once the transaction commits."""
+    keys = [dashboard_key(user_id) for user_id in user_ids]
+    get_cache().delete_many(keys)
+    transaction.on_commit(lambda: get_cache().delete_many(keys))
@@ -0,0 +1,167 @@
+"""
+Bulk provisioning of users from a CSV file.
+
+Password hashing (PBKDF2 by default) is deliberately slow and dominates
+the cost of creating a user, so rows are validated in the importing
+process and their passwords hashed across a process pool, a batch at a
+time. Each batch is then written with one `bulk_create`. Emails that
+are already taken, or repeated in the file, are reported and skipped
+before any hashing is spent on them; one taken by a concurrent insert
+meanwhile is found by reading the batch back and reported too.
+"""
+import csv
+import io
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Optional
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+
+DEFAULT_BATCH_SIZE = 1000
+MIN_PASSWORD_LENGTH = 8
+TAKEN = "User with this email address already exists."
+
+
+@dataclass
+class RowError:
+    line: int
+    errors: dict
+
+
+@dataclass
+class ImportResult:
+    imported: int = 0
+    failed: int = 0
+
+
+def read_rows(stream: io.TextIOBase) -> Iterator[tuple]:
+    """Yield `(line_number, row)` pairs of a CSV with an `email` header."""
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def clean_row(row: dict) -> dict:
+    """Validate a raw row, return the user's fields with the raw password."""
+    user_model = get_user_model()
+    errors = {}
+    values = {}
+
+    for name in ("email", "first_name", "last_name"):
+        raw = (row.get(name) or "").strip()
+        try:
+            values[name] = user_model._meta.get_field(name).clean(raw, None)
+        except ValidationError as error:
+            errors[name] = error.messages
+    if "email" in values:
+        values["email"] = user_model.objects.normalize_email(values["email"])
+
+    password = row.get("password") or ""
+    if len(password) < MIN_PASSWORD_LENGTH:
+        errors["password"] = [
+            f"Ensure this field has at least {MIN_PASSWORD_LENGTH} characters."
+        ]
+    values["password"] = password
+
+    if errors:
+        raise ValidationError(errors)
+    return values
+
+
+def import_users(
+    rows: Iterable[tuple],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: Optional[int] = None,
+    on_error: Optional[Callable[[RowError], None]] = None,
+) -> ImportResult:
+    """
+    Validate `(line_number, row)` pairs and create users in batches.
+
+    Passwords are hashed by `workers` processes (all cores by default,
+    in-process with one worker). Invalid rows and taken emails are
+    skipped and reported through `on_error`.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return _import(rows, batch_size, None, on_error)
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+        return _import(rows, batch_size, pool, on_error)
+
+
+def _import(rows, batch_size, pool: Optional[Executor], on_error) -> ImportResult:
+    result = ImportResult()
+    seen = set()
+    batch = []
+
+    def fail(line_number, errors):
+        result.failed += 1
+        if on_error is not None:
+            on_error(RowError(line_number, errors))
+
+    for line_number, row in rows:
+        try:
+            values = clean_row(row)
+        except ValidationError as error:
+            fail(line_number, error.message_dict)
+            continue
+        if values["email"] in seen:
+            fail(line_number, {"email": ["Repeated in this file."]})
+            continue
+        seen.add(values["email"])
+        batch.append((line_number, values))
+
+        if len(batch) >= batch_size:
+            result.imported += write_batch(batch, pool, fail)
+            batch = []
+
+    if batch:
+        result.imported += write_batch(batch, pool, fail)
+    return result
+
+
+def write_batch(batch: list, pool: Optional[Executor], fail) -> int:
+    user_model = get_user_model()
+    taken = set(
+        user_model.objects.filter(
+            email__in=[values["email"] for _, values in batch]
+        ).values_list("email", flat=True)
+    )
+    new = []
+    for line_number, values in batch:
+        if values["email"] in taken:
+            fail(line_number, {"email": [TAKEN]})
+        else:
+            new.append((line_number, values))
+    if not new:
+        return 0
+
+    passwords = [values.pop("password") for _, values in new]
+    if pool is None:
+        hashes = map(make_password, passwords)
+    else:
+        hashes = pool.map(make_password, passwords, chunksize=16)
+
+    users = [
+        user_model(password=hashed, **values)
+        for (_, values), hashed in zip(new, hashes)
+    ]
+    user_model.objects.bulk_create(users, ignore_conflicts=True)
+
+    # An email taken since the check above was skipped by the insert:
+    # its row holds another password hash (they are salted) than ours.
+    stored = dict(
+        user_model.objects.filter(
+            email__in=[user.email for user in users]
+        ).values_list("email", "password")
+    )
+    imported = 0
+    for (line_number, _), user in zip(new, users):
+        if stored.get(user.email) == user.password:
+            imported += 1
+        else:
+            fail(line_number, {"email": [TAKEN]})
+    return imported
@@ -0,0 +1,138 @@
+import multiprocessing
+import os
+import tempfile
+import time
+import uuid
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from rest_framework import throttling as drf_throttling
+
+from library_service_project import throttling
+
+VARIANTS = (
+    ("DRF UserRateThrottle", None),
+    ("sliding window, cache", "cache"),
+    ("sliding window, SQLite", "sqlite"),
+)
+STORES = {
+    "cache": "library_service_project.throttling.CacheThrottleStore",
+    "sqlite": "library_service_project.throttling.SQLiteThrottleStore",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the per-request cost of user rate throttling: DRF's "
+        "UserRateThrottle against the sliding-window throttle on the cache "
+        "and SQLite stores. Then checks how many requests N worker "
+        "processes let through for one user under each of them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--checks", type=int, default=20000)
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=100,
+            help="Users the checks are spread over.",
+        )
+        parser.add_argument(
+            "--rate",
+            default="1000/minute",
+            help="Throttle rate of the overhead benchmark.",
+        )
+        parser.add_argument("--processes", type=int, default=4)
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=60,
+            help="Requests per minute allowed in the multi-process check.",
+        )
+
+    def handle(self, *args, **options):
+        if min(options["checks"], options["users"], options["processes"],
+               options["limit"]) < 1:
+            raise CommandError(
+                "--checks, --users, --processes and --limit must be positive."
+            )
+
+        with tempfile.TemporaryDirectory() as directory:
+            location = os.path.join(directory, "throttle.sqlite3")
+            for label, store in VARIANTS:
+                with store_settings(store, location):
+                    self.bench(label, store, options)
+
+            self.stdout.write("")
+            for label, store in VARIANTS:
+                with store_settings(store, location):
+                    allowed = self.workers(store, options)
+                self.stdout.write(
+                    f"{label:<24} {options['processes']} processes allowed "
+                    f"{allowed} of {options['limit']}/minute"
+                )
+
+    def bench(self, label: str, store, options) -> None:
+        throttle_class = throttle_for(store, options["rate"])
+        run = uuid.uuid4().hex
+        requests = [bench_request(f"{run}-{i}") for i in range(options["users"])]
+        checks = options["checks"]
+        allowed = 0
+
+        began = time.perf_counter()
+        for i in range(checks):
+            allowed += throttle_class().allow_request(
+                requests[i % len(requests)], None
+            )
+        elapsed = time.perf_counter() - began
+
+        self.stdout.write(
+            f"{label:<24} {elapsed / checks * 1e6:8.1f} us/check   "
+            f"{checks / elapsed:9.0f} checks/s   {allowed} allowed"
+        )
+
+    def workers(self, store, options) -> int:
+        context = multiprocessing.get_context("fork")
+        args = (
+            store,
+            f"{options['limit']}/minute",
+            uuid.uuid4().hex,
+            options["limit"] * 2,
+        )
+        with context.Pool(options["processes"]) as pool:
+            return sum(pool.starmap(hammer, [args] * options["processes"]))
+
+
+def throttle_for(store, rate: str):
+    base = (
+        drf_throttling.UserRateThrottle if store is None
+        else throttling.UserRateThrottle
+    )
+    return type("BenchThrottle", (base,), {"rate": rate})
+
+
+def bench_request(user_id: str):
+    # Benchmark users get ids no real user has.
+    return SimpleNamespace(
+        user=SimpleNamespace(pk=f"bench-{user_id}", is_authenticated=True),
+        META={},
+    )
+
+
+def store_settings(store, location: str):
+    if store is None:
+        return override_settings()
+    return override_settings(THROTTLE_STORE={
+        "BACKEND": STORES[store],
+        "LOCATION": location if store == "sqlite" else "default",
+    })
+
+
+def hammer(store, rate: str, user_id: str, attempts: int) -> int:
+    """Worker process: check one user `attempts` times, count the allowed."""
+    throttle_class = throttle_for(store, rate)
+    request = bench_request(user_id)
+    return sum(
+        throttle_class().allow_request(request, None) for _ in range(attempts)
+    )
@@ -0,0 +1,57 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from users.importers import DEFAULT_BATCH_SIZE, import_users, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Create users from a CSV file with `email` and `password` columns "
+        "(and optional `first_name`, `last_name`). Passwords are hashed "
+        "across a process pool; taken emails are reported and skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file to import.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Users hashed and written per batch.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Password hashing processes, all cores by default.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+        if options["workers"] < 1:
+            raise CommandError("--workers must be positive.")
+
+        def report(error):
+            for field, messages in error.errors.items():
+                self.stderr.write(
+                    f"line {error.line}: {field}: {' '.join(messages)}"
+                )
+
+        try:
+            with open(options["path"], encoding="utf-8-sig", newline="") as stream:
+                result = import_users(
+                    read_rows(stream),
+                    batch_size=options["batch_size"],
+                    workers=options["workers"],
+                    on_error=report,
+                )
+        except OSError as error:
+            raise CommandError(error)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result.imported} users, {result.failed} rows failed."
+            )
+        )
@@ -5,8 +5,25 @@ from django.contrib.auth.models import (
 from django.db import models
 from django.utils.translation import gettext as _
 
+from users import cache
 
-class UserManager(DjangoUserManager):
+
+class UserQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        """
+        Update the users and drop them from the per-user caches: unlike
+        `save()`, a bulk update sends no signal `users.signals` sees.
+        Costs one more query, for the ids of the updated users.
+        """
+        user_ids = list(self.values_list("pk", flat=True))
+        updated = super().update(**kwargs)
+        if user_ids:
+            cache.invalidate_user(*user_ids)
+            cache.invalidate_dashboards(*user_ids)
+        return updated
+
+
+class UserManager(DjangoUserManager.from_queryset(UserQuerySet)):
     """Define a model manager for User model with no username field."""
     use_in_migrations = True
 
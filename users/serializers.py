@@ -27,3 +27,25 @@ class UserSerializer(serializers.ModelSerializer):
             user.save()
 
         return user
+
+
+class UserDashboardSerializer(UserSerializer):
+    """
+    Schema of `/api/users/me/?expand=borrowings`: the user and a
+    summary of their borrowings.
+    """
+
+    active_borrowings = serializers.IntegerField(read_only=True)
+    overdue_borrowings = serializers.IntegerField(read_only=True)
+    next_due_date = serializers.DateField(read_only=True, allow_null=True)
+    recent_borrowings = serializers.ListField(
+        child=serializers.DictField(), read_only=True
+    )
+
+    class Meta(UserSerializer.Meta):
+        fields = UserSerializer.Meta.fields + (
+            "active_borrowings",
+            "overdue_borrowings",
+            "next_due_date",
+            "recent_borrowings",
+        )
@@ -0,0 +1,7 @@
+from users import cache
+
+
+def invalidate_user(sender, instance, **kwargs) -> None:
+    """Drop a saved or deleted user from the per-user caches."""
+    cache.invalidate_user(instance.pk)
+    cache.invalidate_dashboards(instance.pk)
@@ -0,0 +1,127 @@
+import os
+import subprocess
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+ME_URL = reverse("user:manage")
+EXPORT_URL = reverse("borrowings:borrowings-export")
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    """Tests for resolving JWT users through the user cache."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com", password="password_user"
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def test_user_is_loaded_once(self):
+        with self.assertNumQueries(1):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.data["email"], "user@example.com")
+
+    def test_profile_update_invalidates(self):
+        self.client.get(ME_URL)
+
+        res = self.client.patch(ME_URL, {"email": "new@example.com"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.data["email"], "new@example.com")
+
+    def test_staff_change_invalidates(self):
+        res = self.client.get(EXPORT_URL)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        res = self.client.get(EXPORT_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.user.is_staff = False
+        self.user.save(update_fields=["is_staff"])
+        res = self.client.get(EXPORT_URL)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_bulk_update_invalidates(self):
+        self.client.get(ME_URL)
+
+        get_user_model().objects.filter(pk=self.user.pk).update(is_active=False)
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get(ME_URL)
+
+        self.user.is_active = False
+        self.user.save()
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(
+        CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+            "users": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        },
+        USER_CACHE_ALIAS="users",
+    )
+    def test_uncached_users_follow_changes_made_elsewhere(self):
+        self.client.get(ME_URL)
+
+        # Like another worker's save: no invalidation reaches this one.
+        get_user_model().objects.filter(pk=self.user.pk).update(is_active=False)
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user_is_rejected(self):
+        self.client.get(ME_URL)
+
+        self.user.delete()
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class ProcessLocalCacheTests(SimpleTestCase):
+
+    def test_production_skips_the_user_cache_without_a_shared_cache(self):
+        for backend, expected in (
+            (None, "django.core.cache.backends.dummy.DummyCache"),
+            (
+                "django.core.cache.backends.memcached.PyMemcacheCache",
+                "django.core.cache.backends.memcached.PyMemcacheCache",
+            ),
+        ):
+            env = {**os.environ, "DJANGO_ENV": "prod", "SECRET_KEY": "test"}
+            env.pop("CACHE_BACKEND", None)
+            if backend is not None:
+                env["CACHE_BACKEND"] = backend
+            with self.subTest(backend=backend):
+                result = subprocess.run(
+                    [
+                        sys.executable,
+                        "-c",
+                        "from library_service_project import settings; "
+                        "print(settings.CACHES[settings.USER_CACHE_ALIAS]['BACKEND'])",
+                    ],
+                    env=env,
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                )
+                self.assertEqual(result.stdout.strip(), expected)
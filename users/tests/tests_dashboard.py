@@ -0,0 +1,106 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.models import Borrowing
+
+ME_URL = reverse("user:manage")
+BORROWINGS_URL = reverse("borrowings:borrowings-list")
+RETURN_URL = reverse("borrowings:borrowings-bulk-return")
+
+
+class DashboardTests(TestCase):
+    """Tests for `/api/users/me/?expand=borrowings`."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com", password="password_user"
+        )
+        self.admin = get_user_model().objects.create_superuser(
+            email="admin@example.com", password="password_admin"
+        )
+        self.book = Book.objects.create(
+            title="Dune", author="Frank Herbert", inventory=5, daily_fee=Decimal("1.00")
+        )
+        self.today = timezone.localdate()
+        self.late = self.borrow(due_in=-3)
+        self.due_soon = self.borrow(due_in=2)
+        self.borrow(due_in=9)
+        self.returned = self.borrow(due_in=5)
+        Borrowing.objects.filter(pk=self.returned.pk).update(
+            actual_return_date=self.today
+        )
+        self.client.force_authenticate(self.user)
+
+    def borrow(self, due_in: int) -> Borrowing:
+        borrowing = Borrowing.objects.create(
+            book=self.book,
+            user=self.user,
+            expected_return_date=self.today + timedelta(days=30),
+        )
+        Borrowing.objects.filter(pk=borrowing.pk).update(
+            borrow_date=self.today - timedelta(days=10),
+            expected_return_date=self.today + timedelta(days=due_in),
+        )
+        return borrowing
+
+    def test_summary_in_two_queries_then_cached(self):
+        with self.assertNumQueries(2):
+            res = self.client.get(ME_URL, {"expand": "borrowings"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(res.data["email"], "user@example.com")
+        self.assertEqual(res.data["active_borrowings"], 3)
+        self.assertEqual(res.data["overdue_borrowings"], 1)
+        self.assertEqual(
+            res.data["next_due_date"], (self.today - timedelta(days=3)).isoformat()
+        )
+        recent = res.data["recent_borrowings"]
+        self.assertEqual(len(recent), 4)
+        self.assertEqual(recent[0]["id"], self.returned.pk)
+        self.assertEqual(recent[0]["book"], "Dune")
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(ME_URL, {"expand": "borrowings"})
+        self.assertEqual(cached.data, res.data)
+
+    def test_not_expanded_by_default(self):
+        res = self.client.get(ME_URL)
+        self.assertNotIn("active_borrowings", res.data)
+
+    def test_checkout_and_return_invalidate(self):
+        self.client.get(ME_URL, {"expand": "borrowings"})
+
+        res = self.client.post(BORROWINGS_URL, {
+            "book": self.book.pk,
+            "expected_return_date": self.today + timedelta(days=1),
+        })
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        res = self.client.get(ME_URL, {"expand": "borrowings"})
+        self.assertEqual(res.data["active_borrowings"], 4)
+        self.assertEqual(res.data["recent_borrowings"][0]["borrow_date"], str(self.today))
+
+        self.client.force_authenticate(self.admin)
+        self.client.post(RETURN_URL, {"borrowings": [self.late.pk]}, format="json")
+        self.client.force_authenticate(self.user)
+        res = self.client.get(ME_URL, {"expand": "borrowings"})
+        self.assertEqual(res.data["active_borrowings"], 3)
+        self.assertEqual(res.data["overdue_borrowings"], 0)
+
+        self.client.force_authenticate(self.admin)
+        self.client.post(
+            reverse("borrowings:borrowings-return-borrowing", args=[self.due_soon.pk])
+        )
+        self.client.force_authenticate(self.user)
+        res = self.client.get(ME_URL, {"expand": "borrowings"})
+        self.assertEqual(res.data["active_borrowings"], 2)
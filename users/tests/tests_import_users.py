@@ -0,0 +1,93 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from users.importers import write_batch
+
+CSV_CONTENT = (
+    "email,password,first_name,last_name\n"
+    "ann@example.com,password_ann,Ann,Lee\n"
+    "taken@example.com,password_taken,,\n"
+    "not-an-email,password_bad,,\n"
+    "short@example.com,short,,\n"
+    "bob@EXAMPLE.com,password_bob,,\n"
+    "ann@example.com,password_again,,\n"
+)
+
+
+@override_settings(
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]
+)
+class ImportUsersCommandTests(TestCase):
+    """Tests for the `import_users` management command."""
+
+    def setUp(self):
+        get_user_model().objects.create_user(
+            email="taken@example.com", password="password_old"
+        )
+
+    def run_import(self, *args) -> tuple:
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".csv", delete=False, encoding="utf-8"
+        ) as file:
+            file.write(CSV_CONTENT)
+        self.addCleanup(os.remove, file.name)
+
+        out, err = StringIO(), StringIO()
+        call_command("import_users", file.name, *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_import_reports_invalid_and_taken_emails(self):
+        out, err = self.run_import("--workers", "1", "--batch-size", "2")
+
+        self.assertIn("Imported 2 users, 4 rows failed.", out)
+        self.assertIn("line 3: email: User with this email address already exists.", err)
+        self.assertIn("line 4: email:", err)
+        self.assertIn("line 5: password:", err)
+        self.assertIn("line 7: email: Repeated in this file.", err)
+
+        ann = get_user_model().objects.get(email="ann@example.com")
+        self.assertTrue(ann.check_password("password_ann"))
+        self.assertEqual((ann.first_name, ann.last_name), ("Ann", "Lee"))
+        self.assertFalse(ann.is_staff)
+        self.assertTrue(
+            get_user_model().objects.filter(email="bob@example.com").exists()
+        )
+        taken = get_user_model().objects.get(email="taken@example.com")
+        self.assertTrue(taken.check_password("password_old"))
+
+    def test_import_hashes_in_worker_processes(self):
+        out, _ = self.run_import("--workers", "2")
+
+        self.assertIn("Imported 2 users, 4 rows failed.", out)
+        bob = get_user_model().objects.get(email="bob@example.com")
+        self.assertTrue(bob.check_password("password_bob"))
+
+    def test_email_taken_during_the_import_is_reported(self):
+        class ConcurrentPool:
+            """Hashes in-process after another request created cy@."""
+
+            def map(self, function, items, chunksize=1):
+                get_user_model().objects.create_user(
+                    email="cy@example.com", password="password_other"
+                )
+                return map(function, items)
+
+        failures = []
+        batch = [
+            (2, {"email": "cy@example.com", "password": "password_cy"}),
+            (3, {"email": "dee@example.com", "password": "password_dee"}),
+        ]
+
+        imported = write_batch(
+            batch, ConcurrentPool(), lambda line, errors: failures.append(line)
+        )
+
+        self.assertEqual(imported, 1)
+        self.assertEqual(failures, [2])
+        cy = get_user_model().objects.get(email="cy@example.com")
+        self.assertTrue(cy.check_password("password_other"))
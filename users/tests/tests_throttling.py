@@ -0,0 +1,98 @@
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from library_service_project.throttling import (
+    CacheThrottleStore,
+    SQLiteThrottleStore,
+)
+
+
+class ThrottleStoreTestsMixin:
+    """Sliding-window behaviour shared by every store."""
+
+    def make_store(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        cache.clear()
+        self.store = self.make_store()
+
+    def hits(self, count: int, now: float, key: str = "user_1") -> list:
+        return [self.store.hit(key, 3, 60, now).allowed for _ in range(count)]
+
+    def test_limit_per_window(self):
+        self.assertEqual(self.hits(4, now=600), [True, True, True, False])
+        # Other keys have their own limit.
+        self.assertEqual(self.hits(1, now=600, key="user_2"), [True])
+
+    def test_denied_requests_are_not_counted(self):
+        self.hits(10, now=600)
+        # Two windows later nothing of the first one counts any more.
+        self.assertEqual(self.hits(4, now=720), [True, True, True, False])
+
+    def test_previous_window_is_weighted(self):
+        self.hits(3, now=659)
+        # A third into the next window, the 3 previous requests weigh 2.
+        self.assertEqual(self.hits(2, now=680), [True, False])
+
+    def test_wait(self):
+        self.hits(3, now=610)
+        hit = self.store.hit("user_1", 3, 60, 610)
+        self.assertFalse(hit.allowed)
+        # Until the next window, where the 3 requests weigh less than 3.
+        self.assertAlmostEqual(hit.wait, 50)
+
+        self.assertEqual(self.hits(1, now=670), [True])
+        hit = self.store.hit("user_1", 3, 60, 670)
+        self.assertFalse(hit.allowed)
+        # 3 * 5/6 + 1 requests: until the previous 3 weigh under 2, 20
+        # seconds into the window.
+        self.assertAlmostEqual(hit.wait, 10)
+
+
+class CacheThrottleStoreTests(ThrottleStoreTestsMixin, SimpleTestCase):
+
+    def make_store(self):
+        return CacheThrottleStore("default")
+
+
+class SQLiteThrottleStoreTests(ThrottleStoreTestsMixin, SimpleTestCase):
+
+    def make_store(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        return SQLiteThrottleStore(os.path.join(directory.name, "throttle.sqlite3"))
+
+    def test_stores_on_one_file_share_limits(self):
+        other = SQLiteThrottleStore(self.store.location)
+        self.hits(2, now=600)
+        self.assertTrue(other.hit("user_1", 3, 60, 600).allowed)
+        self.assertFalse(self.store.hit("user_1", 3, 60, 600).allowed)
+
+
+class ThrottledViewTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="user@example.com", password="password_user"
+            )
+        )
+
+    def test_user_rate(self):
+        url = reverse("user:manage")
+        for _ in range(60):
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", res)
@@ -1,9 +1,12 @@
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import generics
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.settings import api_settings
 
-from users.serializers import UserSerializer
+from borrowings.summary import borrowing_summary
+from users import cache
+from users.serializers import UserDashboardSerializer, UserSerializer
 
 
 class CreateUserView(generics.CreateAPIView):
@@ -16,8 +19,39 @@ class LoginUserView(ObtainAuthToken):
 
 
 class ManageUserView(generics.RetrieveUpdateAPIView):
+    """
+    The current user. With `?expand=borrowings` the representation
+    includes a summary of the user's borrowings, cached per user.
+    """
+
     serializer_class = UserSerializer
     permission_classes = (IsAuthenticated,)
+    recent_borrowings = 5
 
     def get_object(self):
         return self.request.user
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "expand",
+                description="`borrowings` adds the active, overdue and "
+                            "most recent borrowings of the user.",
+                enum=["borrowings"],
+            ),
+        ],
+        responses=UserDashboardSerializer,
+    )
+    def get(self, request, *args, **kwargs):
+        response = self.retrieve(request, *args, **kwargs)
+        if "borrowings" in request.query_params.get("expand", "").split(","):
+            response.data.update(self.get_borrowing_summary())
+        return response
+
+    def get_borrowing_summary(self) -> dict:
+        user = self.request.user
+        summary = cache.get_dashboard(user.pk)
+        if summary is None:
+            summary = borrowing_summary(user, self.recent_borrowings)
+            cache.set_dashboard(user.pk, summary)
+        return summary